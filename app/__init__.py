@@ -165,4 +165,9 @@ def create_app(config_class=Config, pda_class=ProviderDataApi):
     app.register_blueprint(main_bp)
     app.register_blueprint(example_form_bp)
 
+    # Register CLI commands
+    from app.pda.commands import pda_cli
+
+    app.cli.add_command(pda_cli)
+
     return app
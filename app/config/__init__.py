@@ -46,6 +46,54 @@ class Config(object):
     PDA_URL = os.environ.get("PDA_URL")
     PDA_ENVIRONMENT = os.environ.get("PDA_ENVIRONMENT")
     PDA_API_KEY = os.environ.get("PDA_API_KEY")
+    # Directory of fixtures for the mock to load instead of the checked-in ones, e.g. from `flask pda generate-fixtures`
+    PDA_MOCK_FIXTURES_DIR = os.environ.get("PDA_MOCK_FIXTURES_DIR")
+    # SQLite file for the mock to keep its data in, shared by every worker process and kept across restarts
+    PDA_MOCK_DATABASE = os.environ.get("PDA_MOCK_DATABASE")
+    # Seconds to cache the provider firm list in Redis, 0 disables the cache
+    PDA_FIRMS_CACHE_TTL = int(os.environ.get("PDA_FIRMS_CACHE_TTL", "60"))
+    PDA_FIRMS_CACHE_MAX_BYTES = int(os.environ.get("PDA_FIRMS_CACHE_MAX_BYTES", str(10 * 1024 * 1024)))
+    # Maximum concurrent PDA requests per worker when a page fans out its reads
+    PDA_MAX_CONCURRENCY = int(os.environ.get("PDA_MAX_CONCURRENCY", "8"))
+    # Decode the provider firm list incrementally when assigning chambers, instead of caching the whole list
+    PDA_STREAM_PROVIDER_FIRMS = os.environ.get("PDA_STREAM_PROVIDER_FIRMS", "False").lower() == "true"
+    # Search and page provider firms and bank accounts with the PDA's search, firmType, cursor and limit parameters,
+    # only for a PDA known to support them, otherwise the whole lists are fetched and searched in the app
+    PDA_SERVER_SIDE_SEARCH = os.environ.get("PDA_SERVER_SIDE_SEARCH", "False").lower() == "true"
+    # JSON library to decode PDA responses with: orjson, msgspec or json, "auto" uses the fastest one installed
+    PDA_JSON_DECODER = os.environ.get("PDA_JSON_DECODER", "auto")
+    # Reuse the models validated from a PDA response when the same body is received again, instead of re-validating
+    PDA_TRUST_UNCHANGED_RESPONSES = os.environ.get("PDA_TRUST_UNCHANGED_RESPONSES", "False").lower() == "true"
+    # Open the PDA circuit when this share of requests in the window fail or take longer than the slow call time
+    PDA_CIRCUIT_FAILURE_RATE = float(os.environ.get("PDA_CIRCUIT_FAILURE_RATE", "0.5"))
+    PDA_CIRCUIT_SLOW_CALL_SECONDS = float(os.environ.get("PDA_CIRCUIT_SLOW_CALL_SECONDS", "5"))
+    PDA_CIRCUIT_MIN_CALLS = int(os.environ.get("PDA_CIRCUIT_MIN_CALLS", "10"))
+    PDA_CIRCUIT_WINDOW_SECONDS = float(os.environ.get("PDA_CIRCUIT_WINDOW_SECONDS", "60"))
+    # Seconds to refuse requests for once open, before letting a probe request through
+    PDA_CIRCUIT_OPEN_SECONDS = float(os.environ.get("PDA_CIRCUIT_OPEN_SECONDS", "30"))
+    # Timeouts in seconds for single firm/office reads, list reads and writes
+    PDA_CONNECT_TIMEOUT = float(os.environ.get("PDA_CONNECT_TIMEOUT", "3.05"))
+    PDA_READ_TIMEOUT_ENTITY = float(os.environ.get("PDA_READ_TIMEOUT_ENTITY", "5"))
+    PDA_READ_TIMEOUT_LIST = float(os.environ.get("PDA_READ_TIMEOUT_LIST", "15"))
+    PDA_READ_TIMEOUT_WRITE = float(os.environ.get("PDA_READ_TIMEOUT_WRITE", "10"))
+    # Times a failed PDA request is retried, waiting a random time up to backoff factor * 2^(retry - 1) seconds
+    PDA_RETRY_TOTAL = int(os.environ.get("PDA_RETRY_TOTAL", "3"))
+    PDA_RETRY_BACKOFF_FACTOR = float(os.environ.get("PDA_RETRY_BACKOFF_FACTOR", "0.5"))
+    # Seconds a request may spend retrying, including waiting for a Retry-After
+    PDA_RETRY_MAX_SECONDS = float(os.environ.get("PDA_RETRY_MAX_SECONDS", "10"))
+    # Share of each worker's PDA requests in the window which may be retries, with a minimum for low traffic
+    PDA_RETRY_BUDGET_RATIO = float(os.environ.get("PDA_RETRY_BUDGET_RATIO", "0.1"))
+    PDA_RETRY_BUDGET_WINDOW_SECONDS = float(os.environ.get("PDA_RETRY_BUDGET_WINDOW_SECONDS", "10"))
+    PDA_RETRY_BUDGET_MIN_RETRIES = int(os.environ.get("PDA_RETRY_BUDGET_MIN_RETRIES", "3"))
+    # Seconds each page may spend on PDA calls before further calls are refused, 0 disables the budget
+    PDA_REQUEST_BUDGET_SECONDS = float(os.environ.get("PDA_REQUEST_BUDGET_SECONDS", "20"))
+
+    # PDA calls a request may make before a warning is logged, overridden per route (endpoint name) in
+    # PDA_CALL_BUDGETS. Repeated identical calls are always logged
+    PDA_CALL_BUDGET = int(os.environ.get("PDA_CALL_BUDGET", "20"))
+    PDA_CALL_BUDGETS: dict[str, int] = {}
+    # Bearer token Prometheus must send to scrape /metrics, which is not served when this is unset
+    METRICS_TOKEN = os.environ.get("METRICS_TOKEN")
 
     RATELIMIT_ENABLED = os.environ.get("RATELIMIT_ENABLED", "false").lower() == "true"
     RATELIMIT_STORAGE_URI = os.environ.get("REDIS_URL", "redis://redis:6379/0")
@@ -1,6 +1,6 @@
 import logging
 from datetime import datetime, timedelta
-from typing import Any, List
+from typing import Any, List, Sequence, Tuple
 
 from flask import current_app, url_for
 from wtforms.fields.simple import StringField
@@ -8,8 +8,9 @@ from wtforms.validators import DataRequired, InputRequired, Length
 
 from app.components.tables import DataTable, RadioDataTable, TableStructureItem
 from app.forms import BaseForm
-from app.main.utils import get_firm_account_number, get_firm_tags
+from app.main.utils import get_firm_account_number, get_firm_tags, paginate
 from app.models import BankAccount, Firm
+from app.pda.pagination import Page, page_cursor
 from app.utils.formatting import format_sentence_case, normalize_for_search
 from app.validators import ValidateAccountNumber, ValidateSortCode
 from app.widgets import GovTextInput
@@ -63,36 +64,38 @@ class ProviderListForm(BaseForm):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
-        # Get firms data
         pda = current_app.extensions["pda"]
-        firms: list[Firm] = pda.get_all_provider_firms()
 
         self.search_term = self.data.get("search", None)
+        self.page = self.data.get("page", 1)
 
         # On initial page load we show no results
         if self.search_term is None:
-            firms = []
-        # If an empty search is submitted we show all providers
-        elif self.search_term == "":
-            pass
+            page_firms: Sequence[Firm] = []
+            self.num_results = 0
+        elif pda.server_side_search:
+            # The PDA filters and pages the firms, an empty search matches every provider
+            firms_page = pda.search_provider_firms(
+                self.search_term,
+                cursor=page_cursor(self.page, self.providers_shown_per_page),
+                limit=self.providers_shown_per_page,
+            )
+            page_firms, self.num_results = firms_page.items, firms_page.total
         else:
-            # Here we need to clean up the search terms to remove % and make sure it doesnt break responses
-            search_lower = normalize_for_search(self.search_term).lower()
-            firms = [
-                firm
-                for firm in firms
-                if (
-                    search_lower in normalize_for_search(firm.firm_name).lower()
-                    or search_lower in normalize_for_search(str(firm.firm_id)).lower()
+            # If an empty search is submitted we show all providers
+            firms = pda.get_all_provider_firms(lazy=True)
+            if self.search_term:
+                # Here we need to clean up the search terms to remove % and make sure it doesnt break responses
+                search_lower = normalize_for_search(self.search_term).lower()
+                # Filter on the raw firms, so only the firms on the page are validated
+                firms = firms.filter(
+                    lambda firm: (
+                        search_lower in normalize_for_search(firm.get("firmName")).lower()
+                        or search_lower in normalize_for_search(str(firm.get("firmId"))).lower()
+                    )
                 )
-            ]
-
-        self.page = self.data.get("page", 1)
-        self.num_results = len(firms)
-
-        # Limit results and populate choices
-        start_id = self.providers_shown_per_page * (self.page - 1)
-        end_id = self.providers_shown_per_page * (self.page - 1) + self.providers_shown_per_page
+            # Only the firms on the page are built into models
+            page_firms, self.num_results = paginate(firms, self.page, self.providers_shown_per_page)
 
         columns: list[TableStructureItem] = [
             {"text": "Provider name", "id": "firm_name", "html_renderer": firm_name_html},
@@ -101,8 +104,11 @@ class ProviderListForm(BaseForm):
             {"text": "Status", "html_renderer": get_firm_statuses},  # Add status tags here when available.
         ]
 
-        if len(firms) > 0:
-            self.table = DataTable(structure=columns, data=[firm.to_internal_dict() for firm in firms[start_id:end_id]])
+        if page_firms:
+            # Fetch every row's head office up front, the account number and status columns then read them from
+            # the request's identity map instead of each making their own requests
+            pda.get_head_offices([firm.firm_id for firm in page_firms])
+            self.table = DataTable(structure=columns, data=[firm.to_internal_dict() for firm in page_firms])
 
 
 class BaseBankAccountForm(BaseForm):
@@ -178,11 +184,7 @@ class SearchableTableForm(BaseForm):
         if search_term is None:
             return
 
-        data = self.get_searchable_data()
-        data = self.filter_searchable_data(data, search_term)
-        self.num_results = len(data)
-        # Limit results and populate choices
-        data = self.paginate_data(data, page)
+        data, self.num_results = self.search_page(search_term, page)
 
         # Create RadioDataTable for contract managers
         table_structure: list[TableStructureItem] = self.describe_data_structure()
@@ -206,6 +208,12 @@ class SearchableTableForm(BaseForm):
         """
         return []
 
+    def search_page(self, search_term: str, page: int) -> Tuple[List[dict[str, Any]], int]:
+        """Get the rows on a page of the search results, and the number of results across every page"""
+        data = self.get_searchable_data()
+        data = self.filter_searchable_data(data, search_term)
+        return self.paginate_data(data, page), len(data)
+
     def get_searchable_data(self, *args, **kwargs) -> List[dict[str, Any]]:
         """get a list of data that can be searched"""
         return []
@@ -253,6 +261,21 @@ class BaseBankAccountSearchForm(SearchableTableForm):
         pda = current_app.extensions["pda"]
         return pda.get_all_bank_accounts()
 
+    def search_bank_accounts(self, search_term: str, cursor: str | None, limit: int) -> Page[BankAccount]:
+        """
+        Get a page of the bank accounts matching the search term, newest first, searched and paged by the PDA
+
+        Args:
+        search_term: A bank account sort code or account number to search for, or "" for every bank account
+        cursor: The cursor to the page
+        limit: The number of bank accounts on each page
+
+        Returns:
+            Page[BankAccount]: The bank accounts on the page, and the number matching across every page
+        """
+        pda = current_app.extensions["pda"]
+        return pda.search_bank_accounts(search_term, cursor=cursor, limit=limit)
+
     @classmethod
     def sort_bank_accounts(
         cls,
@@ -296,3 +319,21 @@ class BaseBankAccountSearchForm(SearchableTableForm):
             if search_term in search_fields:
                 matched_bank_accounts.append(bank_account)
         return matched_bank_accounts
+
+    def search_page(self, search_term: str, page: int) -> Tuple[List[dict[str, Any]], int]:
+        """
+        Get the bank accounts on a page of the search results, searched and paged by the PDA if it supports it
+
+        Raises:
+            NoBankAccountsError: No bank accounts found
+        """
+        if not current_app.extensions["pda"].server_side_search:
+            return super().search_page(search_term, page)
+
+        bank_accounts = self.search_bank_accounts(
+            search_term, cursor=page_cursor(page, self.ITEMS_PER_PAGE), limit=self.ITEMS_PER_PAGE
+        )
+        # With no matches, check whether there are any bank accounts to search at all
+        if bank_accounts.total == 0 and (not search_term or self.search_bank_accounts("", None, 1).total == 0):
+            raise NoBankAccountsError("No bank accounts found")
+        return [bank_account.to_internal_dict() for bank_account in bank_accounts.items], bank_accounts.total
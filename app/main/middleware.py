@@ -1,4 +1,4 @@
-from flask import request, session
+from flask import g, request, session
 
 from app.main import bp
 
@@ -32,3 +32,9 @@ def user_context_processor():
             "email": current_user["preferred_username"],
         }
     return dict(current_user=current_user)
+
+
+@bp.app_context_processor
+def pda_status_context_processor():
+    """Flag pages built from stale PDA data, served while the PDA is unavailable."""
+    return dict(pda_stale_data=g.get("pda_serving_stale_data", False))
@@ -1,3 +1,5 @@
+from typing import Iterable
+
 from flask import current_app
 from wtforms.fields import RadioField
 from wtforms.fields.simple import StringField
@@ -19,8 +21,9 @@ from app.main.update_office import (
     ChangeOfficeHoldPaymentsFlagForm,
     ChangeOfficeIntervenedForm,
 )
-from app.main.utils import get_firm_account_number
+from app.main.utils import get_firm_account_number, paginate
 from app.models import Firm, Office
+from app.pda.pagination import page_cursor
 from app.utils.formatting import format_office_address_one_line, normalize_for_search
 from app.widgets import GovRadioInput, GovTextInput
 
@@ -130,37 +133,43 @@ class AssignChambersForm(NoChangesMixin, BaseForm):
 
         # Get firms data
         pda = current_app.extensions["pda"]
-        all_firms = pda.get_all_provider_firms()
-
-        # Advocates or Barristers can only have Chambers as their parent
-        chambers: list[Firm] = [firm for firm in all_firms if firm.firm_type == "Chambers"]
 
         # Set search field data
         self.search_term = search_term
         if search_term:
             self.search.data = search_term
 
-        # Filter chambers based on search term
-        if self.search_term:
-            search_lower = normalize_for_search(self.search_term)
-            chambers = [
-                chamber
-                for chamber in chambers
-                if (
-                    search_lower in normalize_for_search(chamber.firm_name)
-                    or search_lower in normalize_for_search(str(chamber.firm_id))
-                )
-            ]
-
         self.page = page
         self.providers_shown_per_page = 7
-        self.num_results = len(chambers)
 
-        # Limit results and populate choices
-        start_id = self.providers_shown_per_page * (self.page - 1)
-        end_id = self.providers_shown_per_page * (self.page - 1) + self.providers_shown_per_page
+        if pda.server_side_search:
+            # Advocates or Barristers can only have Chambers as their parent, the PDA filters and pages the chambers
+            chambers_page = pda.search_provider_firms(
+                self.search_term or "",
+                firm_type="Chambers",
+                cursor=page_cursor(self.page, self.providers_shown_per_page),
+                limit=self.providers_shown_per_page,
+            )
+            chambers, self.num_results = chambers_page.items, chambers_page.total
+        else:
+            # Advocates or Barristers can only have Chambers as their parent
+            all_chambers: Iterable[Firm] = (firm for firm in pda.iter_provider_firms() if firm.firm_type == "Chambers")
+
+            # Filter chambers based on search term
+            if self.search_term:
+                search_lower = normalize_for_search(self.search_term)
+                all_chambers = (
+                    chamber
+                    for chamber in all_chambers
+                    if (
+                        search_lower in normalize_for_search(chamber.firm_name)
+                        or search_lower in normalize_for_search(str(chamber.firm_id))
+                    )
+                )
+
+            # Limit results while counting them, so only one page of chambers is kept
+            chambers, self.num_results = paginate(all_chambers, self.page, self.providers_shown_per_page)
 
-        chambers = chambers[start_id:end_id]
         choices = []
         for chamber in chambers:
             choices.append(
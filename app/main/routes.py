@@ -1,4 +1,6 @@
-from flask import current_app, render_template
+import hmac
+
+from flask import Response, abort, current_app, render_template, request
 
 from app import auth
 from app.components.tables import DataTable, SummaryList, TableStructureItem
@@ -19,6 +21,22 @@ def status():
     return "OK"
 
 
+@bp.get("/metrics")
+def metrics():
+    """
+    PDA client metrics in the Prometheus text format.
+
+    Only served to requests with the METRICS_TOKEN bearer token, and not at all if METRICS_TOKEN is unset.
+    """
+    token = current_app.config.get("METRICS_TOKEN")
+    pda_metrics = current_app.extensions.get("pda_metrics")
+    if not token or pda_metrics is None:
+        abort(404)
+    if not hmac.compare_digest(request.headers.get("Authorization", "").encode(), f"Bearer {token}".encode()):
+        abort(401)
+    return Response(pda_metrics.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+
 @bp.get("/provider/<int:firm_id>/office/<string:office_code>/contracts")
 @auth.login_required
 def contracts(firm_id: int, office_code: str, context):
@@ -12,6 +12,7 @@ from app.main.add_a_new_provider import AssignContractManagerForm
 from app.main.forms import BaseBankAccountForm, BaseBankAccountSearchForm
 from app.main.utils import get_office_tags
 from app.models import BankAccount, Firm, Office
+from app.pda.pagination import Page
 from app.utils.formatting import format_office_address_one_line
 from app.validators import (
     ValidateGovDateField,
@@ -119,6 +120,27 @@ class BankAccountSearchForm(BaseBankAccountSearchForm, UpdateOfficeBaseForm):
 
         return pda.get_provider_firm_bank_details(self.firm.firm_id)
 
+    def search_bank_accounts(self, search_term: str, cursor: str | None, limit: int) -> Page[BankAccount]:
+        """
+        Get a page of the bank accounts belonging to the firm that match the search term, newest first, searched
+        and paged by the PDA
+
+        Advocates and barristers can use any bank account, so every bank account is searched for them.
+
+        Args:
+        search_term: A bank account sort code or account number to search for, or "" for every bank account
+        cursor: The cursor to the page
+        limit: The number of bank accounts on each page
+
+        Returns:
+            Page[BankAccount]: The bank accounts on the page, and the number matching across every page
+        """
+        pda = current_app.extensions["pda"]
+        if self.firm.is_advocate or self.firm.is_barrister:
+            return pda.search_bank_accounts(search_term, cursor=cursor, limit=limit)
+
+        return pda.search_bank_accounts(search_term, firm_id=self.firm.firm_id, cursor=cursor, limit=limit)
+
 
 class ChangeOfficeContactDetailsForm(OfficeContactDetailsForm):
     url = "provider/<firm:firm>/office/<office:office>/change-office-contact-details"
@@ -38,6 +38,27 @@ def build_hold_payments_payload(form):
     return data
 
 
+def patch_selected_offices(pda, firm: Firm, office_codes: list[str], data: dict) -> list[str]:
+    """
+    Makes the same change to each of the selected offices, flashing an error for each office which failed,
+    including offices the PDA did not update.
+
+    Returns the codes of the offices which were updated.
+    """
+    results = pda.patch_offices(firm_id=firm.firm_id, fields_by_office={code: data for code in office_codes})
+    updated = []
+    for office_code, result in results.items():
+        if isinstance(result, ProviderDataApiError):
+            logger.error(f"{result.__class__.__name__} whilst updating office {office_code}: {result}")
+        elif result is None:
+            logger.error(f"Office {office_code} was not updated as the PDA did not find it")
+        else:
+            updated.append(office_code)
+            continue
+        flash(f"<b>Failed to update office {office_code}</b>", "error")
+    return updated
+
+
 class UpdateVATRegistrationNumberFormView(AdvocateBarristerOfficeMixin, FullWidthBaseFormView):
     template = "update_office/form.html"
     provider_success_url = "main.view_provider_bank_accounts_payment"
@@ -583,12 +604,11 @@ class ApplyHeadOfficeInterventionFormView(BaseFormView):
 
     def form_valid(self, form: BaseForm, **kwargs) -> Response:
         office_codes = form.data.get("offices", [])
-        for office_code in office_codes:
-            data = {
-                "intervenedDate": form.office.intervened_date,
-            }
-            self.get_api().update_office_intervened_date(firm_id=form.firm.firm_id, office_code=office_code, data=data)
-        flash(self.get_success_message(form), category="success")
+        data = {
+            "intervenedDate": form.office.intervened_date,
+        }
+        if patch_selected_offices(self.get_api(), form.firm, office_codes, data) or not office_codes:
+            flash(self.get_success_message(form), category="success")
         return redirect(self.get_success_url(form))
 
 
@@ -665,8 +685,8 @@ class ApplyHeadOfficeHoldPaymentsFormView(BaseFormView):
     def get_success_url(self, form):
         return url_for("main.view_office", firm=form.firm, office=form.office)
 
-    def get_success_message(self, form):
-        offices = form.data.get("offices", [])
+    def get_success_message(self, form, office_codes=None):
+        offices = form.data.get("offices", []) if office_codes is None else office_codes
         return f"<b>Payments put on hold successfully for the following offices: {','.join(offices)}.</b>"
 
     def get_form_instance(self, firm: Firm, office: Office, **kwargs) -> BaseForm:
@@ -699,25 +719,15 @@ class ApplyHeadOfficeHoldPaymentsFormView(BaseFormView):
 
     def form_valid(self, form: BaseForm, **kwargs) -> Response:
         office_codes = form.data.get("offices", [])
-
-        for office_code in office_codes:
-            data = build_hold_payments_payload(form)
-            print("The data: ", data)
-            self.get_api().update_office_hold_payments(firm_id=form.firm.firm_id, office_code=office_code, data=data)
-        flash(self.get_success_message(form), category="success")
+        data = build_hold_payments_payload(form)
+        updated = patch_selected_offices(self.get_api(), form.firm, office_codes, data)
+        if updated or not office_codes:
+            flash(self.get_success_message(form, updated), category="success")
         return redirect(self.get_success_url(form))
 
 
 class RemoveHeadOfficeHoldPaymentsFormView(ApplyHeadOfficeHoldPaymentsFormView):
-    def get_success_message(self, form):
-        office_codes = form.data.get("offices", [])
+    def get_success_message(self, form, office_codes=None):
+        if office_codes is None:
+            office_codes = form.data.get("offices", [])
         return f"<b>The following offices payements are no longer on hold: {', '.join(office_codes)}."
-
-    def form_valid(self, form: BaseForm, **kwargs) -> Response:
-        office_codes = form.data.get("offices", [])
-
-        for office_code in office_codes:
-            data = build_hold_payments_payload(form)
-            self.get_api().update_office_hold_payments(firm_id=form.firm.firm_id, office_code=office_code, data=data)
-        flash(self.get_success_message(form), category="success")
-        return redirect(self.get_success_url(form))
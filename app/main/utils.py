@@ -2,6 +2,8 @@ import html
 import json
 import logging
 from datetime import date
+from functools import partial
+from typing import Iterable, List, Sequence, Tuple, TypeVar
 
 from flask import current_app, flash, session, url_for
 
@@ -13,12 +15,16 @@ from app.constants import (
     STATUS_CONTRACT_MANAGER_NAMES,
 )
 from app.models import BankAccount, Contact, Firm, Office
+from app.pda import identity_map
+from app.pda.concurrency import run_concurrently
 from app.pda.errors import ProviderDataApiError
 from app.pda.mock_api import MockProviderDataApi
 from app.utils.formatting import format_date
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 
 def get_full_info_html(data):
     formatted_json = html.escape(json.dumps(data, indent=2))
@@ -170,42 +176,64 @@ def change_liaison_manager(
     # Use head office for return value (or first office as fallback)
     return_office = head_office or firm_offices[0]
 
+    # Read every office's contacts together
+    contacts_by_office_code = run_concurrently(
+        {
+            office.firm_office_code: partial(pda.get_office_contacts, firm_id, office.firm_office_code)
+            for office in firm_offices
+        }
+    )
+
     # Set all existing liaison managers to non-primary across all offices
-    for office in firm_offices:
-        contacts = pda.get_office_contacts(firm_id, office.firm_office_code)
-        for existing_contact in contacts:
+    demotions = {}
+    for office_code, contacts in contacts_by_office_code.items():
+        # Keyed by each contact's position in its office, as contacts are not guaranteed to have an ID
+        for position, existing_contact in enumerate(contacts):
             if existing_contact.job_title == "Liaison manager" and existing_contact.primary == "Y":
                 # Set this contact to non-primary and add inactive_date
                 updated_contact = existing_contact.model_copy(
                     update={"primary": "N", "inactive_date": date.today().isoformat()}
                 )
-                try:
-                    pda.update_contact(firm_id, office.firm_office_code, updated_contact)
-                except ProviderDataApiError:
-                    error_message = (
-                        f"Failed to update {existing_contact.job_title} for office {office.firm_office_code}"
-                    )
-                    logger.error(error_message)
-                    flash(error_message, "error")
+                demotions[(office_code, position)] = partial(pda.update_contact, firm_id, office_code, updated_contact)
+
+    for (office_code, _), result in run_concurrently(demotions, return_exceptions=True).items():
+        if isinstance(result, ProviderDataApiError):
+            error_message = f"Failed to update Liaison manager for office {office_code}"
+            logger.error(error_message)
+            flash(error_message, "error")
+        elif isinstance(result, Exception):
+            raise result
 
     # Create new primary liaison manager contact for each office
-    contacts_by_office_id = {}
-    for office in firm_offices:
-        contact_updates = {
-            "vendor_site_id": office.firm_office_id,
-            "job_title": "Liaison manager",
-            "primary": "Y",
-            "creation_date": date.today().isoformat(),
-        }
+    contact_updates = {
+        "job_title": "Liaison manager",
+        "primary": "Y",
+        "creation_date": date.today().isoformat(),
+    }
+    creations = {
+        office.firm_office_id: partial(
+            pda.create_office_contact,
+            firm_id,
+            office.firm_office_code,
+            contact.model_copy(update={"vendor_site_id": office.firm_office_id, **contact_updates}),
+        )
+        for office in firm_offices
+    }
 
-        office_contact = contact.model_copy(update=contact_updates)
-        try:
-            created_contact = pda.create_office_contact(firm_id, office.firm_office_code, office_contact)
-            contacts_by_office_id[office.firm_office_id] = created_contact
-        except ProviderDataApiError:
-            error_message = f"Failed to create {office_contact.job_title} for office {office.firm_office_code}"
+    contacts_by_office_id = {}
+    office_codes_by_id = {office.firm_office_id: office.firm_office_code for office in firm_offices}
+    for office_id, result in run_concurrently(creations, return_exceptions=True).items():
+        if isinstance(result, ProviderDataApiError):
+            error_message = f"Failed to create Liaison manager for office {office_codes_by_id[office_id]}"
             logger.error(error_message)
             flash(error_message, "error")
+        elif isinstance(result, Exception):
+            raise result
+        else:
+            contacts_by_office_id[office_id] = result
+
+    # Evict once every write is done, as concurrent evictions from the worker threads can race
+    identity_map.evict(firm_id=firm_id)
 
     # Return the contact for the head office (or first office)
     return_contact = contacts_by_office_id[return_office.firm_office_id]
@@ -525,8 +553,7 @@ def assign_firm_to_a_new_chambers(firm: Firm | int, chambers: Firm | int) -> Fir
     if chambers.firm_type != "Chambers":
         raise ValueError(f"chambers must be a Chambers, got firm_type: {chambers.firm_type}")
 
-    new_provider_dict: dict = pda.patch_provider(firm.firm_id, {"parentFirmId": chambers.firm_id})
-    new_provider = Firm(**new_provider_dict)
+    new_provider = pda.patch_provider(firm.firm_id, {"parentFirmId": chambers.firm_id})
 
     flash(f"<b>{new_provider.firm_name} assigned to {chambers.firm_name}</b>", category="success")
 
@@ -581,22 +608,28 @@ def reassign_head_office(firm: Firm | int, new_head_office: Office | str) -> Off
         Office.model_fields["head_office"].alias: new_head_office.firm_office_code,
     }
 
-    # Iterate through all of the provider's offices, updating them as head or sub offices
+    # Update all of the provider's offices together, as head or sub offices
     offices = pda.get_provider_offices(firm.firm_id)
-    for office in offices:
-        if office.firm_office_code == new_head_office.firm_office_code:
-            fields_to_update = make_head_office_data
-        else:
-            fields_to_update = reassign_head_office_data
-        try:
-            pda.patch_office(
-                firm_id=firm.firm_id, office_code=office.firm_office_code, fields_to_update=fields_to_update
-            )
-        except ProviderDataApiError as e:
-            logger.error(f"{e.__class__.__name__} whilst updating office {office.firm_office_code}: {e}")
-            flash(f"Failed to update office {office.firm_office_code}", category="error")
-
-    return pda.get_head_office(firm.firm_id)
+    fields_by_office = {
+        office.firm_office_code: make_head_office_data
+        if office.firm_office_code == new_head_office.firm_office_code
+        else reassign_head_office_data
+        for office in offices
+    }
+    results = pda.patch_offices(firm_id=firm.firm_id, fields_by_office=fields_by_office)
+    failed = False
+    for office_code, result in results.items():
+        if isinstance(result, ProviderDataApiError):
+            failed = True
+            logger.error(f"{result.__class__.__name__} whilst updating office {office_code}: {result}")
+            flash(f"Failed to update office {office_code}", category="error")
+
+    # Use the updated head office the PDA responded with, unless a failure leaves the head office in doubt
+    head_office = results.get(new_head_office.firm_office_code)
+    if failed or not isinstance(head_office, Office):
+        return pda.get_head_office(firm.firm_id)
+    identity_map.remember(pda.get_head_office, head_office, firm.firm_id)
+    return head_office
 
 
 def contract_manager_nonstatus_name(value: str | dict | Office) -> str | None:
@@ -729,3 +762,30 @@ def _get_firm_head_office(firm_id: int) -> Office | None:
         raise ValueError(f"Expected Firm or firm_id (int), got {type(firm_id)}")
 
     return pda.get_head_office(firm_id)
+
+
+def paginate(items: Iterable[T], page: int, per_page: int) -> Tuple[List[T], int]:
+    """
+    Gets one page of items in a single pass, without holding the other pages in memory.
+
+    Sequences, such as a lazy list of firms from the PDA, are sliced instead so only the page's items are read.
+
+    Args:
+        items: The items to page through, can be a generator or a sequence
+        page: The page number, starting at 1
+        per_page: The number of items on each page
+
+    Returns:
+        The items on the page and the total number of items
+    """
+    start = per_page * (page - 1)
+    end = start + per_page
+    if isinstance(items, Sequence):
+        return (list(items[start:end]) if start >= 0 else []), len(items)
+
+    page_items, total = [], 0
+    for item in items:
+        if start <= total < end:
+            page_items.append(item)
+        total += 1
+    return page_items, total
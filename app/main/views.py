@@ -1,4 +1,5 @@
 import logging
+from functools import partial
 from typing import Dict, List, Literal, NoReturn
 
 from flask import abort, current_app, redirect, render_template, request, url_for
@@ -18,6 +19,7 @@ from app.main.table_builders import (
 )
 from app.main.utils import create_provider_from_session, firm_office_url_for, get_firm_tags, get_office_tags
 from app.models import Firm, Office
+from app.pda.concurrency import run_concurrently
 from app.utils.formatting import (
     format_office_address_multi_line_html,
     format_office_address_one_line,
@@ -164,12 +166,15 @@ class ViewProvider(MethodView):
             child_firms: List of Firms to show in the table
         """
         pda = current_app.extensions["pda"]
+        child_head_offices = run_concurrently(
+            {child.firm_id: partial(pda.get_head_office, child.firm_id) for child in child_firms}
+        )
 
         # Aggregate the child firm with its office
         aggregated_data = []
         for child in child_firms:
             child_data = child.to_internal_dict()
-            child_head_office = pda.get_head_office(child.firm_id)
+            child_head_office = child_head_offices[child.firm_id]
             if child_head_office:
                 child_data["account_number"] = child_head_office.firm_office_code
                 child_data["_account_number_firm_id"] = child.firm_id
@@ -182,9 +187,10 @@ class ViewProvider(MethodView):
 
         return aggregated_data
 
-    def get_barristers_table(self, firm: Firm) -> DataTable | None:
-        pda = current_app.extensions["pda"]
-        child_barristers = pda.get_provider_children(firm_id=firm.firm_id, only_firm_type="Barrister")
+    def get_barristers_table(self, firm: Firm, child_barristers: List[Firm] | None = None) -> DataTable | None:
+        if child_barristers is None:
+            pda = current_app.extensions["pda"]
+            child_barristers = pda.get_provider_children(firm_id=firm.firm_id, only_firm_type="Barrister")
 
         if len(child_barristers) == 0:
             return None
@@ -200,9 +206,10 @@ class ViewProvider(MethodView):
 
         return table
 
-    def get_advocates_table(self, firm: Firm) -> DataTable | None:
-        pda = current_app.extensions["pda"]
-        child_advocates = pda.get_provider_children(firm_id=firm.firm_id, only_firm_type="Advocate")
+    def get_advocates_table(self, firm: Firm, child_advocates: List[Firm] | None = None) -> DataTable | None:
+        if child_advocates is None:
+            pda = current_app.extensions["pda"]
+            child_advocates = pda.get_provider_children(firm_id=firm.firm_id, only_firm_type="Advocate")
 
         if len(child_advocates) == 0:
             return None
@@ -222,27 +229,35 @@ class ViewProvider(MethodView):
     def get_context(self, firm):
         pda = current_app.extensions["pda"]
 
-        head_office, parent_provider = None, None
+        # The head office, parent provider and chambers head office are independent, so fetch them together
+        reads = {}
+        if firm.firm_id:
+            # Get head office for account number
+            reads["head_office"] = partial(pda.get_head_office, firm.firm_id)
+        if firm.parent_firm_id:
+            # Get parent provider
+            reads["parent_provider"] = partial(pda.get_provider_firm, firm.parent_firm_id)
+            if firm.is_advocate:
+                reads["chambers_head_office"] = partial(pda.get_head_office, firm.parent_firm_id)
+        results = run_concurrently(reads)
+
+        head_office: Office | None = results.get("head_office")
+        parent_provider: Firm | None = results.get("parent_provider")
 
         context = {"firm": firm, "firm_tags": get_firm_tags(firm)}
 
-        if firm.firm_id:
-            # Get head office for account number
-            head_office: Office = pda.get_head_office(firm.firm_id)
+        if "head_office" in results:
             context.update({"head_office": head_office})
 
-        if firm.parent_firm_id:
-            # Get parent provider
-            parent_provider: Firm = pda.get_provider_firm(firm.parent_firm_id)
+        if "parent_provider" in results:
             context.update({"parent_provider": parent_provider})
 
         if firm.is_advocate and parent_provider:
-            chambers_head_office = pda.get_head_office(parent_provider.firm_id)
             context.update(
                 {
                     "chambers_contact_details_table": self.get_chambers_contact_details_table(
                         parent_provider,
-                        chambers_head_office,
+                        results["chambers_head_office"],
                         include_change_links=False,
                     )
                 }
@@ -271,8 +286,14 @@ class ViewProvider(MethodView):
             context.update({"contact_tables": get_contact_tables(firm, head_office)})
 
         if self.subpage == "barristers-advocates":
-            context.update({"barristers_table": self.get_barristers_table(firm)})
-            context.update({"advocates_table": self.get_advocates_table(firm)})
+            children = run_concurrently(
+                {
+                    "barristers": partial(pda.get_provider_children, firm.firm_id, only_firm_type="Barrister"),
+                    "advocates": partial(pda.get_provider_children, firm.firm_id, only_firm_type="Advocate"),
+                }
+            )
+            context.update({"barristers_table": self.get_barristers_table(firm, children["barristers"])})
+            context.update({"advocates_table": self.get_advocates_table(firm, children["advocates"])})
 
         if self.subpage == "bank-accounts-payment":
             if head_office:
@@ -1,14 +1,35 @@
 import logging
-from typing import Any, Dict, List, Optional, Union
+import re
+import time
+from functools import partial
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Union
+from urllib.parse import urlencode
 
 import requests
-from pydantic import ValidationError
+from flask import g, has_request_context
+from pydantic import TypeAdapter, ValidationError
 from requests.adapters import HTTPAdapter
-from urllib3 import Retry
 
 from app.constants import YesNo
 from app.models import BankAccount, Contact, Firm, Office
+from app.pda import (
+    call_budget,
+    circuit_breaker,
+    concurrency,
+    deadline,
+    decoding,
+    firms_cache,
+    identity_map,
+    metrics,
+    retry,
+)
+from app.pda.concurrency import run_concurrently
 from app.pda.errors import ProviderDataApiError
+from app.pda.lazy import LazyModels
+from app.pda.pagination import Page
+from app.pda.response_cache import ResponseCache
+from app.pda.single_flight import SingleFlight
+from app.pda.streaming import iter_json_array
 
 
 class PDAError(ProviderDataApiError):
@@ -23,6 +44,18 @@ class PDAConnectionError(PDAError):
     pass
 
 
+class PDACircuitOpenError(PDAError):
+    """Raised when a request is refused because the Provider Data API circuit breaker is open."""
+
+    pass
+
+
+class PDADeadlineExceededError(PDAError):
+    """Raised when a request is refused because the page has used up its Provider Data API time budget."""
+
+    pass
+
+
 class ProviderDataApi:
     """
     Client for interacting with the Provider Data API.
@@ -30,15 +63,11 @@ class ProviderDataApi:
     Provides methods to read provider firms, offices, users,
     and related data through a REST API.
 
-    Will retry on unsuccessful requests.
+    Will retry on unsuccessful requests, see retry.AdaptiveRetry.
     """
 
-    RETRY_STRATEGY = Retry(
-        total=3,
-        backoff_factor=0.5,
-        status_forcelist=[429, 500, 502, 503, 504],
-        raise_on_status=False,  # We'll handle status codes ourselves
-    )
+    # Endpoints which return a single firm or office, other GETs return lists
+    ENTITY_ENDPOINT = re.compile(r"/?provider-(firms|offices)/[^/]+/?")
 
     def __init__(self):
         self.app = None
@@ -47,6 +76,20 @@ class ProviderDataApi:
         self.logger = logging.getLogger(__name__)
         self._initialized = False
         self._mock_fallback = None
+        self.firms_cache: Optional[firms_cache.FirmListCache] = None
+        self.response_cache = ResponseCache()
+        self.circuit_breaker = circuit_breaker.CircuitBreaker()
+        self.single_flight = SingleFlight()
+        self.max_concurrency = 8
+        self.stream_provider_firms = False
+        self.server_side_search = False
+        self.decode_json = decoding.get_decoder()
+        self.metrics = metrics.PDAMetrics()
+        self.retry = retry.AdaptiveRetry(
+            total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504], raise_on_status=False
+        )
+        # (connect, read) timeouts in seconds for each endpoint class
+        self.timeouts: Dict[str, tuple[float, float]] = {"entity": (3.05, 5), "list": (3.05, 15), "write": (3.05, 10)}
 
     def init_app(self, app, base_url: str = None, api_key: str = None) -> None:
         """
@@ -76,18 +119,37 @@ class ProviderDataApi:
             }
         )
 
-        self._setup_session_adapter()
+        identity_map.init_app(app)
+        call_budget.init_app(app)
 
         if not hasattr(app, "extensions"):
             app.extensions = {}
         app.extensions["pda"] = self
+        concurrency.init_app(app)
+        self.firms_cache = firms_cache.init_app(app)
+        self.circuit_breaker = circuit_breaker.init_app(app)
+        self.metrics = metrics.init_app(app)
+        self.retry = retry.init_app(app, on_refused=self.metrics.record_retry_refused)
+        self._setup_session_adapter()
+        self.max_concurrency = app.config.get("PDA_MAX_CONCURRENCY", self.max_concurrency)
+        self.stream_provider_firms = app.config.get("PDA_STREAM_PROVIDER_FIRMS", self.stream_provider_firms)
+        self.server_side_search = app.config.get("PDA_SERVER_SIDE_SEARCH", self.server_side_search)
+        self.decode_json = decoding.get_decoder(app.config.get("PDA_JSON_DECODER", "auto"))
+        self.response_cache.trusted = app.config.get("PDA_TRUST_UNCHANGED_RESPONSES", self.response_cache.trusted)
+        connect_timeout = app.config.get("PDA_CONNECT_TIMEOUT", self.timeouts["entity"][0])
+        self.timeouts = {
+            "entity": (connect_timeout, app.config.get("PDA_READ_TIMEOUT_ENTITY", self.timeouts["entity"][1])),
+            "list": (connect_timeout, app.config.get("PDA_READ_TIMEOUT_LIST", self.timeouts["list"][1])),
+            "write": (connect_timeout, app.config.get("PDA_READ_TIMEOUT_WRITE", self.timeouts["write"][1])),
+        }
+        deadline.init_app(app)
 
         self._initialized = True
         self.logger.info(f"Provider Data API initialized with base URL: {self.base_url}")
 
     def _setup_session_adapter(self) -> None:
         """Setup HTTP adapter with retry strategy for the session."""
-        adapter = HTTPAdapter(max_retries=self.RETRY_STRATEGY)
+        adapter = HTTPAdapter(max_retries=self.retry)
         self.session.mount("http://", adapter)
         self.session.mount("https://", adapter)
 
@@ -136,19 +198,129 @@ class ProviderDataApi:
         else:
             self.logger.debug(f"{method} request to {url}")
 
-        try:
-            response = self.session.request(method, url, **kwargs)
-            self.logger.debug(f"Response: {response.status_code} from {url}")
-            return response
+        cache_key, cached = None, None
+        if method == "GET":
+            cache_key = f"{url}?{urlencode(sorted(params.items()))}" if params else url
+            if cached := self.response_cache.lookup(cache_key):
+                kwargs["headers"] = {**(kwargs.get("headers") or {}), **cached.conditional_headers()}
+
+        endpoint_class = self._endpoint_class(method, endpoint)
+        connect_timeout, read_timeout = self.timeouts[endpoint_class]
+        request_deadline = deadline.get_deadline()
+        if request_deadline:
+            if request_deadline.expired:
+                self.logger.error(
+                    f"PDA budget of {request_deadline.budget}s exceeded after {request_deadline.elapsed:.2f}s, "
+                    f"not making {method} request to {endpoint}"
+                )
+                raise PDADeadlineExceededError("Provider Data API time budget exceeded")
+            # Never wait on the PDA for longer than the page has left
+            connect_timeout = min(connect_timeout, request_deadline.remaining)
+            read_timeout = min(read_timeout, request_deadline.remaining)
+        kwargs.setdefault("timeout", (connect_timeout, read_timeout))
+
+        if not self.circuit_breaker.allow_request():
+            if cached is not None:
+                self.logger.warning(f"PDA circuit open, serving last known good response for {method} {url}")
+                return self._stale_response(url, cache_key, cached)
+            self.logger.error(f"PDA circuit open, refusing {method} {url}")
+            raise PDACircuitOpenError("Provider Data API is unavailable")
 
-        except requests.RequestException as e:
-            self.logger.error(f"Request failed for {method} {url}: {e}")
-            raise PDAError(f"Request failed: {e}")
+        try:
+            endpoint_template = metrics.endpoint_template(endpoint)
+            call_budget.record_call(method, endpoint_template, cache_key or url)
+            if self.retry.budget is not None:
+                self.retry.budget.record_request()
+            start = time.monotonic()
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except requests.RequestException as e:
+                self.circuit_breaker.record_failure()
+                self.metrics.record_request(method, endpoint_template, "error", time.monotonic() - start, 0)
+                self.logger.error(f"Request failed for {method} {url}: {e}")
+                if isinstance(e, requests.Timeout) and request_deadline and request_deadline.expired:
+                    # The timeout was cut short by this request's budget, so it says nothing of other requests
+                    raise PDADeadlineExceededError(f"Provider Data API time budget exceeded: {e}")
+                raise PDAError(f"Request failed: {e}")
+
+            elapsed = time.monotonic() - start
+            self.metrics.record_request(
+                method, endpoint_template, str(response.status_code), elapsed, self._response_size(response, kwargs)
+            )
+            if retries := self._retry_count(response):
+                self.metrics.record_retries(method, endpoint_template, retries)
+            if response.status_code >= 500:
+                self.circuit_breaker.record_failure()
+            else:
+                self.circuit_breaker.record_success(elapsed)
+        finally:
+            # Give the probe up if the request failed for a reason other than the PDA's health, which is neither
+            # a success nor a failure, so the next request probes instead of the circuit staying half-open
+            self.circuit_breaker.release_probe()
+
+        if request_deadline and request_deadline.expired:
+            self.logger.warning(
+                f"PDA budget of {request_deadline.budget}s exceeded by {method} {endpoint}, "
+                f"which took {elapsed:.2f}s ({request_deadline.elapsed:.2f}s elapsed in total)"
+            )
+
+        self.logger.debug(f"Response: {response.status_code} from {url}")
+        response.pda_cache_key = cache_key
+        response.pda_cached_entry = cached
+        response.pda_endpoint = (method, endpoint_template)
+        return response
+
+    @staticmethod
+    def _retry_count(response: requests.Response) -> int:
+        """Get the number of times urllib3 retried a request before getting its response."""
+        history = getattr(getattr(response.raw, "retries", None), "history", None)
+        return len(history) if isinstance(history, tuple) else 0
+
+    @staticmethod
+    def _response_size(response: requests.Response, kwargs: Dict[str, Any]) -> int:
+        """Get the size of a response body, without reading the body of a streamed response."""
+        if not kwargs.get("stream"):
+            return len(response.content) if isinstance(response.content, bytes) else 0
+        content_length = response.headers.get("Content-Length")
+        return int(content_length) if isinstance(content_length, str) and content_length.isdigit() else 0
+
+    def _record_timing(self, response: requests.Response, record, start: float) -> None:
+        """Record the time since `start` against the endpoint a response came from, with a metrics method."""
+        endpoint = getattr(response, "pda_endpoint", None)
+        if isinstance(endpoint, tuple):
+            record(*endpoint, time.monotonic() - start)
+
+    def _endpoint_class(self, method: str, endpoint: str) -> str:
+        """Classify a request as a single `entity` read, a `list` read, or a `write`, to choose its timeouts."""
+        if method != "GET":
+            return "write"
+        if self.ENTITY_ENDPOINT.fullmatch(endpoint):
+            return "entity"
+        return "list"
+
+    @staticmethod
+    def _stale_response(url: str, cache_key: str, cached) -> requests.Response:
+        """
+        Build a 304 Not Modified response for the last known good response to a GET, used while the circuit is
+        open. Pages built from it show a banner saying the data may be out of date.
+        """
+        response = requests.Response()
+        response.status_code = 304
+        response._content = b""
+        response._content_consumed = True
+        response.url = url
+        response.pda_cache_key = cache_key
+        response.pda_cached_entry = cached
+        response.pda_stale = True
+        return response
 
     def get(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> requests.Response:
         """
         Make a GET request to the specified endpoint.
 
+        Identical GETs made concurrently by other threads share a single request, and its response. A request
+        which runs out of its caller's time budget is not shared, the threads waiting on it make their own.
+
         Args:
             endpoint: API endpoint path
             params: Query parameters
@@ -156,7 +328,16 @@ class ProviderDataApi:
         Returns:
             requests.Response: The response object
         """
-        return self._make_request("GET", endpoint, params=params)
+        key = ("GET", f"{self.base_url}/{endpoint.lstrip('/')}", tuple(sorted((params or {}).items())))
+        response = self.single_flight.do(
+            key,
+            lambda: self._make_request("GET", endpoint, params=params),
+            unshared_errors=(PDADeadlineExceededError,),
+        )
+
+        if getattr(response, "pda_stale", False) and has_request_context():
+            g.pda_serving_stale_data = True
+        return response
 
     def patch(self, endpoint: str, json: Dict[str, Any] = None) -> requests.Response:
         """
@@ -187,12 +368,21 @@ class ProviderDataApi:
         Raises:
             ProviderDataApiError: For HTTP errors
         """
+        if response.status_code == 304 and (cached := self.response_cache.get(response)):
+            # 304: Not Modified since the response we already decoded
+            self.logger.debug(f"Not modified (304) from {response.url}")
+            return cached.payload
+
         if response.status_code == 200:
+            start = time.monotonic()
             try:
-                return response.json()
-            except ValueError as e:
+                data = self.decode_json(response.content)
+            except decoding.DECODE_ERRORS as e:
                 self.logger.error(f"Failed to parse JSON response: {e}")
                 raise PDAError(f"Invalid JSON response: {e}")
+            self._record_timing(response, self.metrics.record_decode, start)
+            self.response_cache.store(response, data)
+            return data
 
         elif response.status_code in [204, 404]:
             # 204: No Content (successful but empty)
@@ -208,6 +398,117 @@ class ProviderDataApi:
             except requests.HTTPError as e:
                 raise PDAError(f"HTTP error: {e}")
 
+    def _handle_model_response(
+        self, response: requests.Response, adapter: TypeAdapter, empty_return: Union[List, None], key: str | None = None
+    ) -> Any:
+        """
+        Handle a response whose body holds models, validating it straight from the JSON bytes.
+
+        Pydantic validates the body as it parses it, so no intermediate dicts are built. A 304 Not Modified
+        reuses the models validated from the response it revalidated, as does a 200 with an identical body
+        in trusted mode.
+
+        Args:
+            response: The HTTP response
+            adapter: Validates the response body
+            empty_return: What to return for 204/404 responses, or when the body has no `key`
+            key: The member of the body holding the models, if they are wrapped in an object
+
+        Returns:
+            The validated models, lists are copied so callers cannot change the cached entry
+
+        Raises:
+            ValidationError: If the body is invalid JSON or the models are invalid
+            ProviderDataApiError: For HTTP errors
+        """
+        if response.status_code == 304 and (cached := self.response_cache.get(response)):
+            self.logger.debug(f"Not modified (304) from {response.url}")
+            models = cached.models
+            if models is None:
+                # Cached by a request which only decoded the payload
+                start = time.monotonic()
+                models = self._unwrap(adapter.validate_python(cached.payload), key, empty_return)
+                self._record_timing(response, self.metrics.record_validation, start)
+                cached.models = models
+        elif response.status_code == 200:
+            digest = self.response_cache.digest(response)
+            models = self.response_cache.trusted_models(response, digest)
+            if models is None:
+                # Pydantic decodes and validates in one pass, so both are recorded as validation time
+                start = time.monotonic()
+                models = self._unwrap(adapter.validate_json(response.content), key, empty_return)
+                self._record_timing(response, self.metrics.record_validation, start)
+            else:
+                self.logger.debug(f"Body unchanged from {response.url}, reusing its validated models")
+            self.response_cache.store(response, None, models=models, digest=digest)
+        else:
+            return self._handle_response(response, empty_return)
+
+        return list(models) if isinstance(models, list) else models
+
+    def _patched_entity(
+        self, response: requests.Response, adapter: TypeAdapter, key: str, is_patched: Callable[[Any], bool]
+    ) -> Any:
+        """
+        Get the updated entity a PATCH responded with, if it responded with the entity it patched.
+
+        Only a body holding the patched entity is trusted. An empty body would validate as an entity with no
+        fields, and an acknowledgement such as `{"status": "updated"}` would fail validation after the PDA had
+        made the change.
+
+        Args:
+            response: The HTTP response to the PATCH
+            adapter: Validates the response body
+            key: The member of the body holding the entity, if it is wrapped in an object
+            is_patched: Whether a validated entity is the one which was patched
+
+        Returns:
+            The updated entity, or None if the PDA responded without it
+
+        Raises:
+            ProviderDataApiError: For HTTP errors
+        """
+        if response.status_code != 200:
+            return self._handle_response(response, None)
+        start = time.monotonic()
+        try:
+            entity = self._unwrap(adapter.validate_json(response.content), key, None)
+        except ValidationError as e:
+            self.logger.warning(f"Response to PATCH {response.url} is not the updated entity: {e}")
+            return None
+        self._record_timing(response, self.metrics.record_validation, start)
+        if entity is None or not is_patched(entity):
+            self.logger.warning(f"Response to PATCH {response.url} is not the updated entity")
+            return None
+        return entity
+
+    @staticmethod
+    def _unwrap(models: Any, key: str | None, empty_return: Union[List, None]) -> Any:
+        """Get the models from the object wrapping them, if they are wrapped."""
+        if key is not None and isinstance(models, dict):
+            return models.get(key, empty_return)
+        return models
+
+    def _handle_page_response(self, response: requests.Response, adapter: TypeAdapter, key: str) -> Page:
+        """Handle a response holding one page of a list, along with its total count and next cursor."""
+        body = self._handle_model_response(response, adapter, None)
+        if not body:
+            return Page([], 0)
+        items = list(body.get(key, []))
+        return Page(items, body.get("totalCount", len(items)), body.get("nextCursor"))
+
+    @staticmethod
+    def _page_params(cursor: Optional[str], limit: int, **filters: Any) -> Dict[str, Any]:
+        """Get the query parameters for a page of a list, leaving out unset filters."""
+        if not isinstance(limit, int) or limit <= 0:
+            raise ValueError("limit must be a positive integer")
+        params = {name: value for name, value in filters.items() if value}
+        if cursor:
+            params["cursor"] = cursor
+        params["limit"] = limit
+        return params
+
+    @identity_map.identity_mapped
     def get_provider_firm(self, firm_id: int) -> Firm | None:
         """
         Get details for a specific provider firm.
@@ -222,37 +523,118 @@ class ProviderDataApi:
             raise ValueError("firm_id must be a positive integer")
 
         response = self.get(f"/provider-firms/{firm_id}")
-        raw_data = self._handle_response(response, None)
-
-        if raw_data is None:
-            return None
 
         try:
-            firm = raw_data.get("firm")
-            return Firm(**firm)
+            return self._handle_model_response(response, decoding.FIRM_RESPONSE, None, key="firm")
         except ValidationError as e:
             self.logger.error(f"Invalid firm data from API for firm {firm_id}: {e}")
             raise PDAError(f"Invalid firm data: {e}")
 
-    def get_all_provider_firms(self) -> List[Firm]:
+    def get_all_provider_firms(self, lazy: bool = False) -> List[Firm] | LazyModels[Firm]:
         """
         Get all provider firms.
 
+        Args:
+            lazy: Return a LazyModels over the raw firms, which only validates the firms that are read.
+                Lazy lists bypass the firms cache.
+
         Returns:
             List of Firm model instances
         """
+        if lazy:
+            return self._get_lazy_provider_firms()
+
+        if self.firms_cache and (firms := self.firms_cache.get()) is not None:
+            return firms
+
         response = self.get("/provider-firms")
+
+        try:
+            firms = self._handle_model_response(response, decoding.FIRMS_RESPONSE, [], key="firms")
+        except ValidationError as e:
+            self.logger.error(f"Invalid firms data from API: {e}")
+            raise PDAError(f"Invalid firms data: {e}")
+
+        if self.firms_cache:
+            self.firms_cache.set(firms)
+        return firms
+
+    def _get_lazy_provider_firms(self) -> LazyModels[Firm]:
+        """Get all provider firms as a LazyModels over the decoded response."""
+        response = self.get("/provider-firms")
+
+        cached = self.response_cache.get(response)
+        if cached is not None and cached.payload is None and cached.models is not None:
+            # Revalidated a response which was validated straight into models, so there are no raw firms
+            cached.payload = {"firms": [firm.model_dump(by_alias=True) for firm in cached.models]}
+
         raw_data = self._handle_response(response, [])
+        return LazyModels(raw_data.get("firms", []) if raw_data else [], Firm)
 
-        if not raw_data:
-            return []
+    def iter_provider_firms(self) -> Iterator[Firm]:
+        """
+        Iterate over all provider firms, for callers which filter, count or page through them in a single pass.
+
+        When PDA_STREAM_PROVIDER_FIRMS is set the response is decoded incrementally and each firm is validated
+        as it is reached, so the whole list is never held in memory. Streamed lists bypass the firms caches.
+        Otherwise this iterates over get_all_provider_firms().
+
+        Yields:
+            Firm model instances
+        """
+        if not self.stream_provider_firms:
+            yield from self.get_all_provider_firms()
+            return
+
+        with self._make_request("GET", "/provider-firms", stream=True) as response:
+            if response.status_code != 200:
+                # Not modified, not found or an error, none of which have a body to stream
+                try:
+                    yield from self._handle_model_response(response, decoding.FIRMS_RESPONSE, [], key="firms")
+                except ValidationError as e:
+                    self.logger.error(f"Invalid firms data from API: {e}")
+                    raise PDAError(f"Invalid firms data: {e}")
+                return
+
+            try:
+                for firm_data in iter_json_array(response.iter_content(chunk_size=64 * 1024), "firms"):
+                    yield Firm(**firm_data)
+            except ValidationError as e:
+                self.logger.error(f"Invalid firms data from API: {e}")
+                raise PDAError(f"Invalid firms data: {e}")
+            except ValueError as e:
+                self.logger.error(f"Failed to parse JSON response: {e}")
+                raise PDAError(f"Invalid JSON response: {e}")
+
+    def search_provider_firms(
+        self, term: str = "", firm_type: Optional[str] = None, cursor: Optional[str] = None, limit: int = 20
+    ) -> Page[Firm]:
+        """
+        Search provider firms by name or firm ID, one page at a time.
+
+        Only used when PDA_SERVER_SIDE_SEARCH is set, as the PDA's /provider-firms is only known to return every
+        firm. This assumes a PDA which filters by the `search` and `firmType` parameters and pages by `cursor` and
+        `limit`, responding with `{firms, totalCount, nextCursor}`, so only the firms on the page are sent.
+
+        Args:
+            term: Text to find in the firm name or firm ID, every firm matches an empty term
+            firm_type: Only include firms of this type
+            cursor: The next_cursor of the previous page, or None for the first page
+            limit: The most firms to return
+
+        Returns:
+            Page of Firm model instances, with the number of firms matching across every page
+        """
+        params = self._page_params(cursor, limit, search=term, firmType=firm_type)
+        response = self.get("/provider-firms", params=params)
 
         try:
-            return [Firm(**firm_data) for firm_data in raw_data["firms"]]
+            return self._handle_page_response(response, decoding.FIRMS_PAGE, "firms")
         except ValidationError as e:
             self.logger.error(f"Invalid firms data from API: {e}")
             raise PDAError(f"Invalid firms data: {e}")
 
+    @identity_map.identity_mapped
     def get_provider_office(self, office_code: str) -> Office | None:
         """
         Get details for a specific provider office.
@@ -267,18 +649,14 @@ class ProviderDataApi:
             raise ValueError("office_code must be a non-empty string")
 
         response = self.get(f"/provider-offices/{office_code}")
-        raw_data = self._handle_response(response, None)
-
-        if raw_data is None:
-            return None
 
         try:
-            office = raw_data.get("office", raw_data)  # Handle both wrapped and direct responses
-            return Office(**office)
+            return self._handle_model_response(response, decoding.OFFICE_RESPONSE, None, key="office")
         except ValidationError as e:
             self.logger.error(f"Invalid office data from API for office {office_code}: {e}")
             raise PDAError(f"Invalid office data: {e}")
 
+    @identity_map.identity_mapped
     def get_provider_offices(self, firm_id: int) -> List[Office]:
         """
         Get all offices for a specific firm.
@@ -293,18 +671,39 @@ class ProviderDataApi:
             raise ValueError("firm_id must be a positive integer")
 
         response = self.get(f"/provider-firms/{firm_id}/provider-offices")
-        raw_data = self._handle_response(response, [])
 
-        if not raw_data:
-            return []
+        try:
+            return self._handle_model_response(response, decoding.OFFICES_RESPONSE, [], key="offices")
+        except ValidationError as e:
+            self.logger.error(f"Invalid offices data from API for firm {firm_id}: {e}")
+            raise PDAError(f"Invalid offices data: {e}")
+
+    def get_provider_offices_page(self, firm_id: int, cursor: Optional[str] = None, limit: int = 20) -> Page[Office]:
+        """
+        Get one page of the offices for a specific firm.
+
+        Only for a PDA which pages offices by the `cursor` and `limit` parameters, see search_provider_firms.
+
+        Args:
+            firm_id: The firm ID
+            cursor: The next_cursor of the previous page, or None for the first page
+            limit: The most offices to return
+
+        Returns:
+            Page of Office model instances, with the number of offices the firm has
+        """
+        if not isinstance(firm_id, int) or firm_id <= 0:
+            raise ValueError("firm_id must be a positive integer")
+
+        response = self.get(f"/provider-firms/{firm_id}/provider-offices", params=self._page_params(cursor, limit))
 
         try:
-            offices_data = raw_data.get("offices", raw_data)  # Handle both wrapped and direct responses
-            return [Office(**office_data) for office_data in offices_data]
+            return self._handle_page_response(response, decoding.OFFICES_PAGE, "offices")
         except ValidationError as e:
             self.logger.error(f"Invalid offices data from API for firm {firm_id}: {e}")
             raise PDAError(f"Invalid offices data: {e}")
 
+    @identity_map.identity_mapped
     def get_head_office(self, firm_id: int) -> Office | None:
         """
         Gets the head office for a specific firm.
@@ -327,6 +726,28 @@ class ProviderDataApi:
                 return office
         return None
 
+    def get_head_offices(self, firm_ids: Iterable[int]) -> Dict[int, Office | None]:
+        """
+        Gets the head offices for many firms.
+
+        The PDA has no bulk endpoint, so each firm's offices are requested with up to `max_concurrency`
+        requests in flight. Every head office is also stored in the request's identity map, so later calls
+        to get_head_office for these firms do not make a request.
+
+        Args:
+            firm_ids: The firm IDs, duplicates are only requested once
+
+        Returns:
+            Dict of firm ID to its head office, or None if the firm has no head office
+        """
+        firm_ids = list(dict.fromkeys(firm_ids))
+        if len(firm_ids) <= 1:
+            return {firm_id: self.get_head_office(firm_id) for firm_id in firm_ids}
+
+        return run_concurrently(
+            {firm_id: partial(self.get_head_office, firm_id) for firm_id in firm_ids}, self.max_concurrency
+        )
+
     def get_provider_users(self, firm_id: int) -> List[Dict[str, Any]]:
         """
         Get all users for a specific firm.
@@ -381,6 +802,7 @@ class ProviderDataApi:
         response = self.get(f"/provider-firms/{firm_id}/provider-offices/{office_code}/schedules")
         return self._handle_response(response, {})
 
+    @identity_map.identity_mapped
     def get_office_bank_accounts(self, firm_id: int, office_code: str) -> List[BankAccount]:
         """
         Get bank details for a specific office.
@@ -398,19 +820,87 @@ class ProviderDataApi:
             raise ValueError("office_code must be a non-empty string")
 
         response = self.get(f"/provider-firms/{firm_id}/provider-offices/{office_code}/bank-account-details")
-        data = self._handle_response(response, [])
-        bank_accounts = []
-        if response:
-            for bank_account in data:
-                bank_accounts.append(BankAccount(**bank_account))
-        return bank_accounts
-
-    def patch_office(self, firm_id: int, office_code: str, fields_to_update: dict):
+
+        try:
+            return self._handle_model_response(response, decoding.BANK_ACCOUNTS_RESPONSE, [])
+        except ValidationError as e:
+            self.logger.error(f"Invalid bank account data from API for office {office_code}: {e}")
+            raise PDAError(f"Invalid bank account data: {e}")
+
+    def patch_office(self, firm_id: int, office_code: str, fields_to_update: dict) -> Office | None:
+        """
+        Update fields of an office.
+
+        The updated office the PDA responds with replaces the cached office, so it is not read again.
+
+        Args:
+            firm_id: The firm ID
+            office_code: The office code
+            fields_to_update: The office fields to update, by their API names
+
+        Returns:
+            The updated Office, or None if the PDA did not find the office
+        """
         response = self.patch(
             f"/provider-firms/{firm_id}/offices/{office_code}",
             json=fields_to_update,
         )
-        return self._handle_response(response, {})
+        identity_map.evict_office(firm_id, office_code)
+        office = self._patched_entity(
+            response, decoding.OFFICE_RESPONSE, "office", lambda office: office.firm_office_code == office_code
+        )
+        self._cache_office(office_code, office)
+        if office is None and response.status_code != 404:
+            # The PDA made the change but did not respond with the updated office, so read it
+            return self.get_provider_office(office_code)
+        return office
+
+    def _cache_office(self, office_code: str, office: Office | None) -> None:
+        """Replace the cached office with the office a write responded with, or drop it if there was none."""
+        cache_key = f"{self.base_url}/provider-offices/{office_code}"
+        if office is None:
+            self.response_cache.invalidate(cache_key)
+            return
+        self.response_cache.replace(cache_key, office)
+        identity_map.remember(self.get_provider_office, office, office_code)
+
+    def patch_offices(
+        self, firm_id: int, fields_by_office: Dict[str, dict]
+    ) -> Dict[str, Office | None | ProviderDataApiError]:
+        """
+        Updates many offices of a firm.
+
+        The PDA has no bulk endpoint, so each office is patched with up to `max_concurrency` requests in
+        flight. A failed update does not stop the others, its error is returned in place of its result.
+
+        Args:
+            firm_id: The firm ID
+            fields_by_office: Dict of office code to the fields to update on that office
+
+        Returns:
+            Dict of office code to the updated Office, or the ProviderDataApiError raised updating it
+        """
+        office_codes = list(fields_by_office)
+
+        def patch(office_code: str) -> Office | None | ProviderDataApiError:
+            try:
+                return self.patch_office(firm_id, office_code, fields_by_office[office_code])
+            except ProviderDataApiError as e:
+                return e
+
+        if len(office_codes) <= 1:
+            return {office_code: patch(office_code) for office_code in office_codes}
+
+        results = run_concurrently(
+            {office_code: partial(patch, office_code) for office_code in office_codes}, self.max_concurrency
+        )
+
+        # Evict again once every request is done, as concurrent evictions from the worker threads can race
+        for office_code, result in results.items():
+            identity_map.evict_office(firm_id, office_code)
+            if isinstance(result, Office):
+                identity_map.remember(self.get_provider_office, result, office_code)
+        return results
 
     def get_office_contacts(self, firm_id: int, office_code: str) -> List[Contact]:
         """
@@ -462,13 +952,44 @@ class ProviderDataApi:
         """
         raise NotImplementedError("Updating contacts is not yet supported by the real Provider Data API")
 
-    def patch_provider(self, firm_id: int, fields_to_update: dict):
+    def patch_provider(self, firm_id: int, fields_to_update: dict) -> Firm | None:
+        """
+        Update fields of a provider firm.
+
+        The updated firm the PDA responds with replaces the cached firm, so it is not read again. The firm list
+        is invalidated, and so are the other firms' children if the firm moved to another parent.
+
+        Args:
+            firm_id: The firm ID
+            fields_to_update: The firm fields to update, by their API names
+
+        Returns:
+            The updated Firm, or None if the PDA did not find the firm
+        """
         response = self.patch(
             f"/provider-firms/{firm_id}",
             json=fields_to_update,
         )
-        self._handle_response(response, {})
-        return self.get_provider_firm(firm_id)
+        if "parentFirmId" in fields_to_update:
+            # Moving a firm between parents changes other firms' children
+            identity_map.clear()
+        else:
+            identity_map.evict(firm_id=firm_id)
+        if self.firms_cache:
+            self.firms_cache.invalidate()
+
+        firm = self._patched_entity(response, decoding.FIRM_RESPONSE, "firm", lambda firm: firm.firm_id == firm_id)
+
+        cache_key = f"{self.base_url}/provider-firms/{firm_id}"
+        if firm is None:
+            self.response_cache.invalidate(cache_key)
+            if response.status_code == 404:
+                return None
+            # The PDA made the change but did not respond with the updated firm, so read it
+            return self.get_provider_firm(firm_id)
+        self.response_cache.replace(cache_key, firm)
+        identity_map.remember(self.get_provider_firm, firm, firm_id)
+        return firm
 
     def assign_bank_account_to_office(self, firm_id: int, office_code: str, bank_account_id: int) -> BankAccount:
         """
@@ -484,10 +1005,25 @@ class ProviderDataApi:
         raise NotImplementedError("Assigning bank account is not yet supported by the real Provider Data API")
 
     def get_bank_details(self, firm_id, bank_account_id: str) -> Optional[BankAccount]:
+        """
+        Get a bank account of a provider firm.
+
+        Args:
+            firm_id: The firm ID
+            bank_account_id: The bank account ID
+
+        Returns:
+            BankAccount model instance, or None if not found
+        """
         response = self.get(f"/provider-firms/{firm_id}/bank-details/{bank_account_id}")
-        data = self._handle_response(response, {})
-        return BankAccount(**data)
 
+        try:
+            return self._handle_model_response(response, decoding.BANK_ACCOUNT_RESPONSE, None)
+        except ValidationError as e:
+            self.logger.error(f"Invalid bank account data from API for bank account {bank_account_id}: {e}")
+            raise PDAError(f"Invalid bank account data: {e}")
+
+    @identity_map.identity_mapped
     def get_provider_firm_bank_details(self, firm_id: int) -> List[BankAccount]:
         """
         Get all bank details for a specific provider.
@@ -499,11 +1035,12 @@ class ProviderDataApi:
             List[BankAccount]: List of bank accounts that belong to the given firm.
         """
         response = self.get(f"/provider-firms/{firm_id}/bank-account-details")
-        items = self._handle_response(response, [])
-        accounts = []
-        for item in items:
-            accounts.append(BankAccount(**item))
-        return accounts
+
+        try:
+            return self._handle_model_response(response, decoding.BANK_ACCOUNTS_RESPONSE, [])
+        except ValidationError as e:
+            self.logger.error(f"Invalid bank account data from API for firm {firm_id}: {e}")
+            raise PDAError(f"Invalid bank account data: {e}")
 
     def update_office_contact_details(self, firm_id, firm_office_code, payload):
         raise NotImplementedError("Update contact details has not been implemented yet")
@@ -529,6 +1066,38 @@ class ProviderDataApi:
         """
         raise NotImplementedError("Getting all bank accounts is currently not supported by the real Provider Data API")
 
+    def search_bank_accounts(
+        self, term: str = "", firm_id: Optional[int] = None, cursor: Optional[str] = None, limit: int = 20
+    ) -> Page[BankAccount]:
+        """
+        Search bank accounts by sort code or account number, one page at a time, newest first.
+
+        Only used when PDA_SERVER_SIDE_SEARCH is set, as the PDA's /bank-account-details is only known to return
+        a plain list of every bank account. See search_provider_firms for the parameters this assumes.
+
+        Args:
+            term: A sort code or account number to match exactly, every bank account matches an empty term
+            firm_id: Only include the bank accounts of this firm's offices
+            cursor: The next_cursor of the previous page, or None for the first page
+            limit: The most bank accounts to return
+
+        Returns:
+            Page of BankAccount model instances, with the number of bank accounts matching across every page
+        """
+        if firm_id is None:
+            raise NotImplementedError(
+                "Getting all bank accounts is currently not supported by the real Provider Data API"
+            )
+
+        params = self._page_params(cursor, limit, search=term)
+        response = self.get(f"/provider-firms/{firm_id}/bank-account-details", params=params)
+
+        try:
+            return self._handle_page_response(response, decoding.BANK_ACCOUNTS_PAGE, "bankAccounts")
+        except ValidationError as e:
+            self.logger.error(f"Invalid bank account data from API for firm {firm_id}: {e}")
+            raise PDAError(f"Invalid bank account data: {e}")
+
     def update_provider_firm_name(self, firm_id: int, new_firm_name: str) -> Firm:
         """
         Update an existing firm name.
@@ -0,0 +1,153 @@
+import contextvars
+import functools
+import inspect
+import os
+import sys
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from typing import Callable, Iterator, List, NamedTuple, Optional
+
+import structlog
+from flask import current_app, g, has_request_context, request
+
+from app.pda import identity_map
+
+_APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_PDA_DIR = os.path.join(_APP_DIR, "pda")
+
+# Set while a counted mock PDA call is in progress, so the calls it makes itself are not counted
+_in_counted_call: contextvars.ContextVar[bool] = contextvars.ContextVar("pda_in_counted_call", default=False)
+# The application code which started a concurrent fan-out, for calls made in its worker threads
+_fan_out_site: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("pda_fan_out_site", default=None)
+
+
+class PDACall(NamedTuple):
+    """A call made to the Provider Data API while handling a request."""
+
+    method: str  # HTTP method, or the client method for the mock PDA
+    endpoint: str  # Endpoint template, or the client method for the mock PDA
+    target: str  # The path and query, or the client method's arguments for the mock PDA
+    call_site: str  # The application code which made the call
+
+
+def _call_site(frame) -> str:
+    """Find the innermost application frame outside app/pda, i.e. the code which called the PDA client."""
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(_APP_DIR) and not filename.startswith(_PDA_DIR):
+            return f"{os.path.relpath(filename, os.path.dirname(_APP_DIR))}:{frame.f_lineno} in {frame.f_code.co_name}"
+        frame = frame.f_back
+    # Calls made in a worker thread have no application frames, use the code which fanned out instead
+    return _fan_out_site.get() or "unknown"
+
+
+def record_call(method: str, endpoint: str, target: str) -> None:
+    """
+    Record a PDA call against the current request, if there is one.
+
+    The request's list of calls is started by its first call, as URL converters make calls before any
+    before_request hook runs.
+    """
+    if has_request_context():
+        g.setdefault("pda_calls", []).append(PDACall(method, endpoint, target, _call_site(sys._getframe(1))))
+
+
+@contextmanager
+def not_counted() -> Iterator[None]:
+    """Do not record the mock PDA calls made inside the block, as they serve a request which was recorded already."""
+    token = _in_counted_call.set(True)
+    try:
+        yield
+    finally:
+        _in_counted_call.reset(token)
+
+
+def fan_out_context() -> contextvars.Context:
+    """Copy the current context to run a PDA call in a worker thread, remembering the code which made the call."""
+    context = contextvars.copy_context()
+    context.run(_fan_out_site.set, _call_site(sys._getframe(1)))
+    return context
+
+
+# Methods of the mock PDA which manage the mock itself, rather than standing in for a PDA request
+UNCOUNTED_METHODS = ("init_app", "test_connection", "snapshot", "restore")
+
+
+def counted_calls(cls):
+    """
+    Class decorator for the mock PDA, recording each public method call as a PDA call, like the real client
+    records each HTTP request. Calls made by another counted call, or served from the identity map, are not
+    recorded as they would not reach the PDA.
+    """
+    for name, attr in list(vars(cls).items()):
+        if name.startswith("_") or name in UNCOUNTED_METHODS or not inspect.isfunction(attr):
+            continue
+        setattr(cls, name, _counted(attr))
+    return cls
+
+
+def _counted(func: Callable) -> Callable:
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        if _in_counted_call.get() or _served_from_identity_map(func, self, *args, **kwargs):
+            return func(self, *args, **kwargs)
+
+        arguments = ", ".join([repr(arg) for arg in args] + [f"{key}={value!r}" for key, value in kwargs.items()])
+        record_call("CALL", func.__name__, f"{func.__name__}({arguments})")
+        with not_counted():
+            return func(self, *args, **kwargs)
+
+    return wrapper
+
+
+def _served_from_identity_map(func: Callable, self, *args, **kwargs) -> bool:
+    identity_key = getattr(func, "identity_key", None)
+    if identity_key is None or (mapped := identity_map.get_identity_map()) is None:
+        return False
+    try:
+        return identity_key(self, *args, **kwargs) in mapped
+    except TypeError:
+        return False
+
+
+def check_call_budget(response):
+    """Log a warning if the request made more PDA calls than its route's budget, or repeated a call."""
+    calls: List[PDACall] = g.get("pda_calls", [])
+    if not calls:
+        return response
+
+    # Looked up on each call, as structlog caches a logger's processors on first use, ignoring later configuration
+    logger = structlog.get_logger("pda")
+    route = request.endpoint or request.path
+    budgets = current_app.config.get("PDA_CALL_BUDGETS") or {}
+    budget = budgets.get(route, current_app.config.get("PDA_CALL_BUDGET"))
+    if budget is not None and len(calls) > budget:
+        logger.warning(
+            "PDA call budget exceeded",
+            route=route,
+            calls=len(calls),
+            budget=budget,
+            by_endpoint=dict(Counter(f"{call.method} {call.endpoint}" for call in calls)),
+            call_sites=dict(Counter(call.call_site for call in calls)),
+        )
+
+    repeats = defaultdict(list)
+    for call in calls:
+        repeats[(call.method, call.target)].append(call.call_site)
+    for (method, target), call_sites in repeats.items():
+        if len(call_sites) > 1:
+            logger.warning(
+                "Repeated PDA call",
+                route=route,
+                method=method,
+                target=target,
+                calls=len(call_sites),
+                call_sites=call_sites,
+            )
+
+    return response
+
+
+def init_app(app) -> None:
+    """Register the hook which checks each request's PDA calls against its budget."""
+    app.after_request(check_call_budget)
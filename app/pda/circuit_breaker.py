@@ -0,0 +1,140 @@
+import logging
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for requests to the Provider Data API.
+
+    The outcome of every request in the last `window_seconds` is recorded. Requests which raise, get a 5xx
+    response, or take longer than `slow_call_seconds` count as failures. Once at least `min_calls` have been
+    made in the window and the failure rate reaches `failure_rate_threshold` the circuit opens, and requests
+    are refused for `open_seconds` so workers are not tied up waiting on an unhealthy PDA.
+
+    After that a single probe request is let through (half-open). If it succeeds the circuit closes again,
+    otherwise it re-opens for another `open_seconds`. A probe which ends with neither, e.g. raising an error of
+    its own, is released for the next request to probe.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(
+        self,
+        failure_rate_threshold: float = 0.5,
+        slow_call_seconds: float = 5.0,
+        min_calls: int = 10,
+        window_seconds: float = 60.0,
+        open_seconds: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.min_calls = min_calls
+        self.window_seconds = window_seconds
+        self.open_seconds = open_seconds
+        self.clock = clock
+
+        self.state = self.CLOSED
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._probe_thread = None
+        self._outcomes: Deque[Tuple[float, bool]] = deque()
+        self._lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        """Check whether a request may be made, claiming the probe if the circuit is ready to half-open."""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+
+            if self.state == self.OPEN and self.clock() - self._opened_at >= self.open_seconds:
+                self.state = self.HALF_OPEN
+                self._probe_in_flight = False
+                logger.info("PDA circuit half-open, probing the PDA")
+
+            if self.state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                self._probe_thread = threading.get_ident()
+                return True
+
+            return False
+
+    def release_probe(self) -> None:
+        """
+        Give up the probe, if the calling thread holds it and has not recorded its outcome, so the next request
+        probes instead. For requests which ended without a response or a transport error, which says nothing
+        about the PDA's health.
+        """
+        with self._lock:
+            if self.state == self.HALF_OPEN and self._probe_in_flight and self._probe_thread == threading.get_ident():
+                self._probe_in_flight = False
+
+    def record_success(self, elapsed: float) -> None:
+        """Record a request which got a response, counting it as a failure if it was too slow."""
+        if elapsed > self.slow_call_seconds:
+            logger.warning(f"Slow PDA response: {elapsed:.2f}s exceeds {self.slow_call_seconds}s")
+            self._record(failed=True)
+        else:
+            self._record(failed=False)
+
+    def record_failure(self) -> None:
+        """Record a request which raised or got a server error."""
+        self._record(failed=True)
+
+    def _record(self, failed: bool) -> None:
+        with self._lock:
+            now = self.clock()
+
+            if self.state == self.HALF_OPEN:
+                self._probe_in_flight = False
+                if failed:
+                    logger.error("PDA circuit re-opened, the probe request failed")
+                    self._open(now)
+                else:
+                    self.state = self.CLOSED
+                    self._outcomes.clear()
+                    logger.info("PDA circuit closed, the PDA has recovered")
+                return
+
+            if self.state == self.OPEN:
+                # A request started before the circuit opened, it has no bearing on the open period
+                return
+
+            self._outcomes.append((now, failed))
+            while self._outcomes and now - self._outcomes[0][0] > self.window_seconds:
+                self._outcomes.popleft()
+
+            if len(self._outcomes) < self.min_calls:
+                return
+
+            failures = sum(1 for _, outcome_failed in self._outcomes if outcome_failed)
+            failure_rate = failures / len(self._outcomes)
+            if failure_rate >= self.failure_rate_threshold:
+                logger.error(
+                    f"PDA circuit opened: {failures} of the last {len(self._outcomes)} requests failed or were slow"
+                )
+                self._open(now)
+
+    def _open(self, now: float) -> None:
+        self.state = self.OPEN
+        self._opened_at = now
+        self._outcomes.clear()
+
+
+def init_app(app) -> CircuitBreaker:
+    """Create the circuit breaker using the PDA_CIRCUIT_* app config."""
+    defaults = CircuitBreaker()
+    return CircuitBreaker(
+        failure_rate_threshold=app.config.get("PDA_CIRCUIT_FAILURE_RATE", defaults.failure_rate_threshold),
+        slow_call_seconds=app.config.get("PDA_CIRCUIT_SLOW_CALL_SECONDS", defaults.slow_call_seconds),
+        min_calls=app.config.get("PDA_CIRCUIT_MIN_CALLS", defaults.min_calls),
+        window_seconds=app.config.get("PDA_CIRCUIT_WINDOW_SECONDS", defaults.window_seconds),
+        open_seconds=app.config.get("PDA_CIRCUIT_OPEN_SECONDS", defaults.open_seconds),
+    )
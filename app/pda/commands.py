@@ -0,0 +1,30 @@
+import os
+
+import click
+from flask.cli import AppGroup
+
+from app.pda.fixture_generator import FIXTURE_FILES, generate_fixtures, write_fixtures
+
+pda_cli = AppGroup("pda", help="Provider Data API commands.")
+
+
+@pda_cli.command("generate-fixtures")
+@click.option("--firms", type=click.IntRange(min=1), default=1000, show_default=True, help="Number of firms.")
+@click.option("--seed", type=int, default=0, show_default=True, help="Seed, the same seed generates the same fixtures.")
+@click.option(
+    "--output-dir",
+    type=click.Path(file_okay=False),
+    default="generated-fixtures",
+    show_default=True,
+    help="Directory to write the fixture files to.",
+)
+def generate_fixtures_command(firms: int, seed: int, output_dir: str) -> None:
+    """
+    Generate mock PDA fixtures with as many firms as needed.
+
+    Load them into the mock by setting PDA_MOCK_FIXTURES_DIR to the output directory.
+    """
+    data = generate_fixtures(firms, seed)
+    write_fixtures(data, output_dir)
+    for name, filename in FIXTURE_FILES.items():
+        click.echo(f"{len(data[name])} {name.replace('_', ' ')} written to {os.path.join(output_dir, filename)}")
@@ -0,0 +1,115 @@
+import threading
+import weakref
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Hashable, Optional, TypeVar
+
+from flask import current_app, has_app_context
+
+from app.pda import call_budget, identity_map
+
+K = TypeVar("K", bound=Hashable)
+
+# Maximum calls in flight when there is no app to read PDA_MAX_CONCURRENCY from
+DEFAULT_MAX_CONCURRENCY = 8
+
+# Marks the threads of a PDA executor, whose own fan-outs run inline so they cannot wait on their own pool
+_worker = threading.local()
+
+
+def _mark_worker() -> None:
+    _worker.active = True
+
+
+def init_app(app) -> ThreadPoolExecutor:
+    """
+    Create the app's PDA executor, whose worker threads are shared by every fan-out the app makes.
+
+    The executor has up to PDA_MAX_CONCURRENCY workers, started as they are needed, and is shut down when the app
+    is garbage collected or the interpreter exits.
+    """
+    executor = ThreadPoolExecutor(
+        max_workers=app.config.get("PDA_MAX_CONCURRENCY", DEFAULT_MAX_CONCURRENCY),
+        thread_name_prefix="pda",
+        initializer=_mark_worker,
+    )
+    app.extensions["pda_executor"] = executor
+    weakref.finalize(app, executor.shutdown, wait=False)
+    return executor
+
+
+def run_concurrently(
+    calls: Dict[K, Callable[[], Any]], max_concurrency: Optional[int] = None, return_exceptions: bool = False
+) -> Dict[K, Any]:
+    """
+    Make independent PDA calls concurrently and wait for them all to finish.
+
+    Each call runs on a thread of the app's PDA executor with up to `max_concurrency` in flight, so the calls
+    share the client's pooled HTTP session, retries and caches. Outside an app a short-lived executor is used, and
+    calls fanned out by a call which is already on an executor thread run one after another on that thread. Calls run in a copy of the caller's context, so the Flask request
+    context, its identity map, call budget and deadline are available to them, and their PDA calls are recorded
+    against the code which called this.
+
+    Usage:
+        pda = current_app.extensions["pda"]
+        results = run_concurrently(
+            {
+                "head_office": partial(pda.get_head_office, firm.firm_id),
+                "parent_provider": partial(pda.get_provider_firm, firm.parent_firm_id),
+            }
+        )
+
+    Args:
+        calls: Functions taking no arguments, keyed by the name to return each result under
+        max_concurrency: Maximum calls in flight, defaults to the app's PDA_MAX_CONCURRENCY
+        return_exceptions: Return the exception raised by a call as its result, so one failed call does not
+            hide the results of the others
+
+    Returns:
+        The result of each call under the same key as its function
+
+    Raises:
+        The first exception raised by any of the calls, unless return_exceptions is set
+    """
+    if not calls:
+        return {}
+
+    if max_concurrency is None:
+        max_concurrency = (
+            current_app.config.get("PDA_MAX_CONCURRENCY", DEFAULT_MAX_CONCURRENCY)
+            if has_app_context()
+            else DEFAULT_MAX_CONCURRENCY
+        )
+
+    def run(call: Callable[[], Any]) -> Any:
+        if not return_exceptions:
+            return call()
+        try:
+            return call()
+        except Exception as e:
+            return e
+
+    if getattr(_worker, "active", False):
+        return {key: run(call) for key, call in calls.items()}
+
+    # Create the identity map before fanning out, so every call shares the same one
+    identity_map.get_identity_map()
+    contexts = [call_budget.fan_out_context() for _ in calls]
+    executor = current_app.extensions.get("pda_executor") if has_app_context() else None
+    if executor is None:
+        with ThreadPoolExecutor(max_workers=min(max_concurrency, len(calls)), thread_name_prefix="pda") as executor:
+            return _submit(executor, calls, contexts, run, max_concurrency)
+    return _submit(executor, calls, contexts, run, max_concurrency)
+
+
+def _submit(executor, calls, contexts, run, max_concurrency) -> Dict[K, Any]:
+    """Submit the calls to the executor, keeping up to max_concurrency in flight, and wait for them all."""
+    futures: Dict[K, Future] = {}
+    in_flight = set()
+    for (key, call), context in zip(calls.items(), contexts):
+        if len(in_flight) >= max_concurrency:
+            _, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+        futures[key] = executor.submit(context.run, run, call)
+        in_flight.add(futures[key])
+    # Wait for every call before raising any exception, so none outlives the request which made it
+    wait(futures.values())
+    return {key: future.result() for key, future in futures.items()}
@@ -0,0 +1,48 @@
+import logging
+import time
+from typing import Optional
+
+from flask import current_app, g, has_request_context
+
+logger = logging.getLogger(__name__)
+
+
+class RequestDeadline:
+    """The time by which a page must have finished its Provider Data API calls."""
+
+    def __init__(self, budget: float, clock=time.monotonic):
+        self.budget = budget
+        self.clock = clock
+        self.started = clock()
+
+    @property
+    def elapsed(self) -> float:
+        return self.clock() - self.started
+
+    @property
+    def remaining(self) -> float:
+        return self.budget - self.elapsed
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining <= 0
+
+
+def get_deadline() -> Optional[RequestDeadline]:
+    """Get the PDA deadline for the current request, or None if there is no request or no budget."""
+    if not has_request_context():
+        return None
+    if "pda_deadline" not in g:
+        budget = current_app.config.get("PDA_REQUEST_BUDGET_SECONDS")
+        g.pda_deadline = RequestDeadline(budget) if budget else None
+    return g.pda_deadline
+
+
+def start_deadline() -> None:
+    """Start the current request's PDA deadline when the request begins, rather than at its first PDA call."""
+    get_deadline()
+
+
+def init_app(app) -> None:
+    """Register the hook which starts each request's PDA deadline."""
+    app.before_request(start_deadline)
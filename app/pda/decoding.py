@@ -0,0 +1,113 @@
+import json
+import logging
+from typing import Any, Callable, Dict, List, Optional, TypedDict, Union
+
+from pydantic import TypeAdapter
+
+from app.models import BankAccount, Firm, Office
+
+try:
+    import orjson
+except ImportError:  # Optional, faster than json
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # Optional, faster than json
+    msgspec = None
+
+logger = logging.getLogger(__name__)
+
+JSONDecoder = Callable[[bytes], Any]
+
+# Decoders available in this environment, fastest first
+DECODERS: Dict[str, JSONDecoder] = {}
+if orjson is not None:
+    DECODERS["orjson"] = orjson.loads
+if msgspec is not None:
+    DECODERS["msgspec"] = msgspec.json.decode
+DECODERS["json"] = json.loads
+
+# Errors raised by any of the decoders for invalid JSON
+DECODE_ERRORS = (ValueError,) + ((msgspec.DecodeError,) if msgspec is not None else ())
+
+
+def get_decoder(name: str = "auto") -> JSONDecoder:
+    """
+    Get a JSON decoder by name.
+
+    Args:
+        name: "orjson", "msgspec" or "json", or "auto" for the fastest one installed
+
+    Returns:
+        Callable which decodes JSON bytes
+
+    Raises:
+        ValueError: If the decoder is unknown or its library is not installed
+    """
+    if name == "auto":
+        name = next(iter(DECODERS))
+    if name not in DECODERS:
+        raise ValueError(f"JSON decoder {name!r} is not available, choose from: auto, {', '.join(DECODERS)}")
+    logger.debug(f"Decoding PDA responses with {name}")
+    return DECODERS[name]
+
+
+# Lists of models, validated in a single call rather than building each model with Model(**item)
+FIRMS = TypeAdapter(List[Firm])
+OFFICES = TypeAdapter(List[Office])
+BANK_ACCOUNTS = TypeAdapter(List[BankAccount])
+
+
+# Response bodies, validated straight from JSON bytes by pydantic without decoding them into dicts first
+
+
+class _FirmResponse(TypedDict):
+    firm: Firm
+
+
+class _FirmsResponse(TypedDict, total=False):
+    firms: List[Firm]
+
+
+class _OfficeResponse(TypedDict):
+    office: Office
+
+
+class _OfficesResponse(TypedDict, total=False):
+    offices: List[Office]
+
+
+# Pages of a list, requested with a `cursor` and `limit`, carry the number of items across every page and the
+# cursor to the next page alongside the items
+
+
+class _FirmsPage(TypedDict, total=False):
+    firms: List[Firm]
+    totalCount: int
+    nextCursor: Optional[str]
+
+
+class _OfficesPage(TypedDict, total=False):
+    offices: List[Office]
+    totalCount: int
+    nextCursor: Optional[str]
+
+
+class _BankAccountsPage(TypedDict, total=False):
+    bankAccounts: List[BankAccount]
+    totalCount: int
+    nextCursor: Optional[str]
+
+
+# The firm endpoint wraps the firm in an object, PATCHing a firm responds with the updated firm directly
+FIRM_RESPONSE = TypeAdapter(Union[_FirmResponse, Firm])
+FIRMS_RESPONSE = TypeAdapter(_FirmsResponse)
+# The office endpoints may respond with the office(s) wrapped in an object or directly
+OFFICE_RESPONSE = TypeAdapter(Union[_OfficeResponse, Office])
+OFFICES_RESPONSE = TypeAdapter(Union[_OfficesResponse, List[Office]])
+BANK_ACCOUNT_RESPONSE = TypeAdapter(BankAccount)
+BANK_ACCOUNTS_RESPONSE = BANK_ACCOUNTS
+FIRMS_PAGE = TypeAdapter(_FirmsPage)
+OFFICES_PAGE = TypeAdapter(_OfficesPage)
+BANK_ACCOUNTS_PAGE = TypeAdapter(_BankAccountsPage)
@@ -0,0 +1,90 @@
+import logging
+from typing import List, Optional
+
+import redis
+from pydantic import ValidationError
+
+from app.models import Firm
+from app.pda.decoding import FIRMS
+
+logger = logging.getLogger(__name__)
+
+
+class FirmListCache:
+    """
+    Cache of the validated provider firm list, shared by every worker through Redis.
+
+    The list is stored as JSON and validated in a single call when read back, rather than pickled, as anyone who
+    can write to the Redis shared with sessions could otherwise run code in the app. Lists whose JSON is more than
+    `max_bytes` are not cached, and invalid cached lists and Redis errors are treated as a cache miss so the cache
+    can never stop a page from loading.
+    """
+
+    KEY = "mapd:pda:provider-firms"
+
+    def __init__(self, redis_client: redis.Redis, ttl: int, max_bytes: int):
+        self.redis = redis_client
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def get(self) -> Optional[List[Firm]]:
+        """Get the cached firm list, or None if it is not cached."""
+        try:
+            payload = self.redis.get(self.KEY)
+        except redis.RedisError as e:
+            logger.warning(f"Failed to read provider firms from cache: {e}")
+            payload = None
+
+        firms = None
+        if payload is not None:
+            try:
+                firms = FIRMS.validate_json(payload)
+            except ValidationError as e:
+                logger.warning(f"Ignoring invalid provider firms in cache: {e}")
+
+        if firms is None:
+            self.misses += 1
+            logger.debug(f"Provider firms cache miss (hits: {self.hits}, misses: {self.misses})")
+            return None
+
+        self.hits += 1
+        logger.debug(f"Provider firms cache hit (hits: {self.hits}, misses: {self.misses})")
+        return firms
+
+    def set(self, firms: List[Firm]) -> None:
+        """Cache the firm list, unless it is larger than the byte-size limit."""
+        payload = FIRMS.dump_json(firms, by_alias=True, exclude_none=True)
+        if len(payload) > self.max_bytes:
+            logger.warning(f"Not caching provider firms: {len(payload)} bytes exceeds limit of {self.max_bytes}")
+            return
+
+        try:
+            self.redis.set(self.KEY, payload, ex=self.ttl)
+        except redis.RedisError as e:
+            logger.warning(f"Failed to write provider firms to cache: {e}")
+
+    def invalidate(self) -> None:
+        """Remove the cached firm list, used after any write which changes a firm."""
+        try:
+            self.redis.delete(self.KEY)
+        except redis.RedisError as e:
+            logger.warning(f"Failed to invalidate provider firms cache: {e}")
+
+
+def init_app(app) -> FirmListCache | None:
+    """
+    Create the provider firms cache using the Redis connection configured for Flask-Session.
+
+    Returns:
+        FirmListCache, or None if sessions are not stored in Redis or PDA_FIRMS_CACHE_TTL is 0
+    """
+    if app.config.get("SESSION_TYPE") != "redis" or not app.config.get("PDA_FIRMS_CACHE_TTL"):
+        return None
+
+    return FirmListCache(
+        redis_client=app.config["SESSION_REDIS"],
+        ttl=app.config["PDA_FIRMS_CACHE_TTL"],
+        max_bytes=app.config["PDA_FIRMS_CACHE_MAX_BYTES"],
+    )
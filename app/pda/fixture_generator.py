@@ -0,0 +1,405 @@
+"""
+Seeded generator for mock PDA fixtures at production scale.
+
+The checked-in fixtures have a few dozen firms, the generated ones have the same shape with as many firms as asked
+for, so the mock can be loaded with them and the app measured at the scale it runs at. The same seed always
+generates the same fixtures.
+"""
+
+import json
+import os
+import random
+import string
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional
+
+from app.constants import STATUS_CONTRACT_MANAGER_DEFAULT, STATUS_CONTRACT_MANAGER_NAMES
+
+Record = Dict[str, Any]
+
+# The file each list of records is written to, and the key it is written under, as read by _load_mock_data
+FIXTURE_FILES = {
+    "firms": "providers.json",
+    "offices": "offices.json",
+    "contracts": "contracts.json",
+    "schedules": "schedules.json",
+    "bank_accounts": "bank_accounts.json",
+    "contacts": "contacts.json",
+}
+
+# Share of parent firms which are chambers, the rest are legal services providers
+CHAMBERS_RATE = 0.08
+# Weights for the number of offices of a legal services provider, most have one and a few have many
+OFFICE_COUNTS = {1: 60, 2: 20, 3: 9, 4: 5, 5: 3, 8: 2, 15: 1}
+# Range of the number of members of a chambers
+CHAMBERS_MEMBERS = (2, 15)
+# Share of chambers members which are advocates, the rest are barristers
+ADVOCATE_RATE = 0.3
+INACTIVE_RATE = 0.05
+
+FIRST_NAMES = (
+    "Alice Amir Chloe Daniel David Emma Fatima Finn Grace Hannah Harry Isla James Karen Leo Maya Michael Noah Olivia "
+    "Priya Rachel Robert Sarah Sophie Thomas Zara"
+).split()
+LAST_NAMES = (
+    "Ahmed Brown Clarke Davies Evans Green Hughes Johnson Jones Khan MacLeod Morgan O'Connor Patel Roberts Singh "
+    "Smith Taylor Thompson Walker White Williams Wilson Wright"
+).split()
+STREETS = [
+    "Castle Street",
+    "Church Lane",
+    "High Street",
+    "King Street",
+    "Market Square",
+    "Mill Road",
+    "Park Road",
+    "Queen Street",
+    "Station Road",
+    "Victoria Terrace",
+]
+# City, county, postcode area, telephone area code and LSC region
+PLACES = [
+    ("Birmingham", "West Midlands", "B", "0121", "Midlands"),
+    ("Bristol", "Bristol", "BS", "0117", "South West"),
+    ("Cardiff", "South Glamorgan", "CF", "029", "Wales"),
+    ("Leeds", "West Yorkshire", "LS", "0113", "North East"),
+    ("Leicester", "Leicestershire", "LE", "0116", "Midlands"),
+    ("Liverpool", "Merseyside", "L", "0151", "North West"),
+    ("London", "Greater London", "EC", "020", "London"),
+    ("Manchester", "Greater Manchester", "M", "0161", "North West"),
+    ("Newcastle upon Tyne", "Tyne and Wear", "NE", "0191", "North East"),
+    ("Nottingham", "Nottinghamshire", "NG", "0115", "Midlands"),
+]
+LSP_NAME_PATTERNS = [
+    "{last} & Partners Solicitors",
+    "{last} {other} LLP",
+    "{last} Legal Services",
+    "{city} Law Centre",
+    "{city} Legal Aid Centre",
+    "{last} & Co Solicitors",
+]
+CONSTITUTIONAL_STATUSES = {
+    "Partnership": 40,
+    "Limited Company": 25,
+    "LLP": 15,
+    "Sole Practitioner": 12,
+    "Charity": 6,
+    "Government Funded Organisation": 2,
+}
+OFFICE_TYPES = [
+    "Legal Services Supplier (Civil/Crime/Both/Mediator)",
+    "Legal Services Supplier (Crime/Crime)",
+    "Legal Services Supplier (Mediator/Civil)",
+]
+BANKS = ["Meridian Bank PLC", "Northern Counties Bank", "Albion Savings Bank", "Crown Street Bank"]
+# Category of law codes with the descriptions of their Legal Help schedule lines
+CATEGORIES_OF_LAW = {
+    "AAP": "Claims Against Public Authorities",
+    "COM": "Community Care",
+    "DEB": "Debt",
+    "DISC": "Discrimination",
+    "EDU": "Education",
+    "EMP": "Employment",
+    "HOU": "Housing",
+    "IMMAS": "Immigration - Asylum",
+    "MAT": "Family",
+    "MED": "Clinical Negligence",
+    "MHE": "Mental Health",
+    "MSC": "Residual(Miscellaneous)",
+    "PUB": "Public Law",
+    "WB": "Welfare Benefits",
+}
+
+START_DATE = date(2015, 1, 1)
+END_DATE = date(2025, 9, 30)
+
+
+class FixtureGenerator:
+    """Generates the records of each fixture file, allocating IDs in order as the real PDA does."""
+
+    def __init__(self, seed: int = 0):
+        self.rng = random.Random(seed)
+        self.data: Dict[str, List[Record]] = {name: [] for name in FIXTURE_FILES}
+
+    def _choice(self, weights: Dict[Any, int]) -> Any:
+        return self.rng.choices(list(weights), weights=list(weights.values()))[0]
+
+    def _date(self, start: date = START_DATE) -> str:
+        return (start + timedelta(days=self.rng.randrange((END_DATE - start).days + 1))).isoformat()
+
+    def _flag(self, rate: float) -> str:
+        return "Y" if self.rng.random() < rate else "N"
+
+    def _person(self) -> tuple[str, str]:
+        return self.rng.choice(FIRST_NAMES), self.rng.choice(LAST_NAMES)
+
+    def _domain(self, name: str) -> str:
+        return "".join(c for c in name.lower() if c in string.ascii_lowercase)[:24] + ".co.uk"
+
+    def generate(self, firm_count: int) -> Dict[str, List[Record]]:
+        """Generate `firm_count` firms, counting the members of chambers, with their offices and everything else."""
+        while len(self.data["firms"]) < firm_count:
+            remaining = firm_count - len(self.data["firms"])
+            if remaining > 1 and self.rng.random() < CHAMBERS_RATE:
+                self._add_chambers(min(remaining - 1, self.rng.randint(*CHAMBERS_MEMBERS)))
+            else:
+                self._add_legal_services_provider()
+        return self.data
+
+    def _add_firm(self, firm_type: str, name: str, parent_firm_id: int = 0, **fields: Any) -> Record:
+        firm_id = len(self.data["firms"]) + 1
+        firm = {
+            "firmNumber": str(firm_id),
+            "firmId": firm_id,
+            "ccmsFirmId": firm_id,
+            "parentFirmId": parent_firm_id,
+            "firmName": name,
+            "firmType": firm_type,
+            "constitutionalStatus": "Partnership",
+            "solicitorAdvocateYN": None,
+            "advocateLevel": None,
+            "barCouncilRoll": None,
+            "companyHouseNumber": None,
+            "indemnityReceivedDate": None,
+            "highRiskSupplier": None,
+            "holdAllPaymentsFlag": self._flag(0.02),
+            "holdReason": None,
+            "nonProfitOrganisation": "N",
+            "smallBusinessFlag": self._flag(0.4),
+            "womenOwnedFlag": self._flag(0.3),
+            "websiteUrl": None,
+        }
+        firm.update(fields)
+        if self.rng.random() < INACTIVE_RATE:
+            firm["inactiveDate"] = self._date()
+        self.data["firms"].append(firm)
+        return firm
+
+    def _add_legal_services_provider(self) -> None:
+        last, other = self.rng.choice(LAST_NAMES), self.rng.choice(LAST_NAMES)
+        city = self.rng.choice(PLACES)[0]
+        name = self.rng.choice(LSP_NAME_PATTERNS).format(last=last, other=other, city=city)
+        status = self._choice(CONSTITUTIONAL_STATUSES)
+        firm = self._add_firm(
+            "Legal Services Provider",
+            name,
+            constitutionalStatus=status,
+            companyHouseNumber=f"{self.rng.randrange(10**8):08d}" if status in ("Limited Company", "LLP") else None,
+            nonProfitOrganisation="Y" if status == "Charity" else "N",
+            websiteUrl=f"https://www.{self._domain(name)}" if self.rng.random() < 0.6 else None,
+        )
+        offices = [self._add_office(firm)]
+        for sequence in range(2, self._choice(OFFICE_COUNTS) + 1):
+            offices.append(self._add_office(firm, sequence, head_office=offices[0]))
+        for office in offices:
+            self._add_contracts(office)
+
+    def _add_chambers(self, member_count: int) -> None:
+        street = self.rng.choice(STREETS)
+        chambers = self._add_firm("Chambers", f"{self.rng.randint(1, 99)} {street} Chambers")
+        self._add_office(chambers)
+        for _ in range(member_count):
+            first, last = self._person()
+            if self.rng.random() < ADVOCATE_RATE:
+                firm_type, solicitor_advocate = "Advocate", "Yes"
+            else:
+                firm_type, solicitor_advocate = "Barrister", "No"
+            member = self._add_firm(
+                firm_type,
+                f"{first} {last}",
+                parent_firm_id=chambers["firmId"],
+                solicitorAdvocateYN=solicitor_advocate,
+                advocateLevel="KC" if self.rng.random() < 0.1 else "Junior",
+                barCouncilRoll=str(self.rng.randrange(10**6, 10**7)),
+            )
+            self._add_office(member, contract_manager=STATUS_CONTRACT_MANAGER_DEFAULT)
+
+    def _add_office(
+        self,
+        firm: Record,
+        sequence: int = 1,
+        head_office: Optional[Record] = None,
+        contract_manager: Optional[str] = None,
+    ) -> Record:
+        office_id = len(self.data["offices"]) + 1
+        # Codes start with the firm number, which makes them unique without checking them against every other code
+        code = f"{firm['firmNumber']}{self.rng.choice(string.ascii_uppercase)}{sequence:03d}L"
+        city, county, postcode_area, area_code, region = self.rng.choice(PLACES)
+        address = f"{self.rng.randint(1, 400)} {self.rng.choice(STREETS)}"
+        if contract_manager is None and self.rng.random() < 0.1:
+            contract_manager = self.rng.choice(STATUS_CONTRACT_MANAGER_NAMES)
+        office = {
+            "_firmId": firm["firmId"],
+            "firmOfficeId": office_id,
+            "ccmsFirmOfficeId": 60000000 + office_id,
+            "firmOfficeCode": code,
+            "officeName": f"{code},{address}",
+            "officeCodeAlt": f"Provider {firm['firmNumber']} {'Branch' if head_office else 'Head'} Office",
+            "type": self.rng.choice(OFFICE_TYPES),
+            "addressLine1": address,
+            "addressLine2": None,
+            "addressLine3": None,
+            "addressLine4": None,
+            "city": city,
+            "county": county,
+            "postCode": f"{postcode_area}{self.rng.randint(1, 20)} {self.rng.randint(1, 9)}"
+            f"{self.rng.choice('ABDEFGHJLNPQRSTUWXYZ')}{self.rng.choice('ABDEFGHJLNPQRSTUWXYZ')}",
+            "dxCentre": None,
+            "dxNumber": None,
+            "telephoneAreaCode": area_code,
+            "telephoneNumber": f"{self.rng.randrange(10**6):06d}",
+            "faxAreaCode": None,
+            "faxNumber": None,
+            "emailAddress": f"office{office_id}@{self._domain(firm['firmName'])}",
+            "vatRegistrationNumber": f"GB{self.rng.randrange(10**9):09d}" if self.rng.random() < 0.7 else None,
+            "headOffice": str(head_office["firmOfficeId"]) if head_office else "N/A",
+            "creationDate": self._date(),
+            "lscRegion": region,
+            "lscBidZone": city,
+            "lscAreaOffice": city,
+            "cjsForceName": county,
+            "localAuthority": city,
+            "policeStationAreaName": city,
+            "dutySolicitorAreaName": city,
+            "contractManager": contract_manager,
+        }
+        if firm.get("inactiveDate"):
+            office["inactiveDate"] = firm["inactiveDate"]
+        self.data["offices"].append(office)
+        self._add_contacts(office)
+        if self.rng.random() < 0.9:
+            self._add_bank_accounts(firm, office)
+        return office
+
+    def _add_contacts(self, office: Record) -> None:
+        for n in range(self.rng.choices([1, 2, 3], weights=[60, 30, 10])[0]):
+            first, last = self._person()
+            contact = {
+                "contactId": len(self.data["contacts"]) + 1,
+                "vendorSiteId": office["firmOfficeId"],
+                "firstName": first,
+                "lastName": last,
+                "emailAddress": f"{first}.{last}@example.com".lower().replace("'", ""),
+                "telephoneNumber": f"{office['telephoneAreaCode']} {self.rng.randrange(10**6):06d}",
+                "website": None,
+                "jobTitle": "Liaison manager",
+                # Only the current liaison manager is primary, earlier ones have been made inactive
+                "primary": "Y" if n == 0 else "N",
+                "creationDate": self._date(),
+            }
+            if n:
+                contact["inactiveDate"] = self._date(date.fromisoformat(contact["creationDate"]))
+            self.data["contacts"].append(contact)
+
+    def _add_bank_accounts(self, firm: Record, office: Record) -> None:
+        for n in range(self.rng.choices([1, 2], weights=[85, 15])[0]):
+            city, county, postcode_area, _, _ = self.rng.choice(PLACES)
+            self.data["bank_accounts"].append(
+                {
+                    "bankAccountId": len(self.data["bank_accounts"]) + 1,
+                    "vendorSiteId": office["firmOfficeId"],
+                    "bankName": self.rng.choice(BANKS),
+                    "bankBranchName": f"{city} {self.rng.choice(STREETS)}",
+                    "sortCode": f"{self.rng.randrange(10**6):06d}",
+                    "accountNumber": f"{self.rng.randrange(10**8):08d}",
+                    "bankAccountName": f"{firm['firmName']} {'Client' if n == 0 else 'Office'} Account",
+                    "currencyCode": "GBP",
+                    "accountType": "Current Account",
+                    "primaryFlag": "Y" if n == 0 else "N",
+                    "addressLine1": f"{self.rng.randint(1, 200)} {self.rng.choice(STREETS)}",
+                    "addressLine2": None,
+                    "addressLine3": None,
+                    "city": city,
+                    "county": county,
+                    "country": "GB",
+                    "zip": f"{postcode_area}{self.rng.randint(1, 20)} {self.rng.randint(1, 9)}AA",
+                    "startDate": self._date(),
+                }
+            )
+
+    def _add_contracts(self, office: Record) -> None:
+        categories = self.rng.sample(sorted(CATEGORIES_OF_LAW), self.rng.randint(1, 5))
+        for category in categories:
+            self.data["contracts"].append(
+                {
+                    "_firmOfficeId": office["firmOfficeId"],
+                    "categoryOfLaw": category,
+                    "subCategoryLaw": "Not Applicable",
+                    "authorisationType": "Schedule",
+                    "newMatters": "Yes",
+                    "contractualDevolvedPowers": self.rng.choice(["Yes - Excluding JR Proceedings", "No"]),
+                    "remainderAuthorisation": self.rng.choice(["Yes", "No"]),
+                }
+            )
+        self._add_schedule(office, categories)
+
+    def _add_schedule(self, office: Record, categories: List[str]) -> None:
+        start = date(self.rng.randint(2018, 2024), 9, 1)
+        code = office["firmOfficeCode"]
+        contract_number = str(self.rng.randrange(10**6, 10**7))
+        contract_reference = f"01/{code}/{start.year}/{self.rng.randint(1, 99):02d}"
+        self.data["schedules"].append(
+            {
+                "_firmOfficeId": office["firmOfficeId"],
+                "contractType": "Standard",
+                "contractDescription": f"{start.year} Standard Civil Contract",
+                "contractNumber": contract_number,
+                "contractReference": contract_reference,
+                "contractStatus": "Open",
+                "contractAuthorizationStatus": "APPROVED",
+                "contractStartDate": start.isoformat(),
+                "contractEndDate": date(start.year + 2, 6, 30).isoformat(),
+                "areaOfLaw": "LEGAL HELP",
+                "scheduleType": "Standard",
+                "scheduleNumber": f"{code}/{start.year}/01",
+                "scheduleContractNumber": contract_number,
+                "scheduleContractReference": contract_reference,
+                "scheduleAuthorizationStatus": "APPROVED",
+                "scheduleStatus": "Open",
+                "scheduleStartDate": start.isoformat(),
+                "scheduleEndDate": date(start.year + 1, 8, 31).isoformat(),
+                "scheduleLines": [self._schedule_line(category) for category in categories],
+            }
+        )
+
+    def _schedule_line(self, category: str) -> Record:
+        maximum_cases = self.rng.choice([0, 50, 100, 250, 500])
+        return {
+            "areaOfLaw": "LEGAL HELP",
+            "categoryOfLaw": category,
+            "description": f"Legal Help (Civil).{CATEGORIES_OF_LAW[category]}",
+            "devolvedPowersStatus": "No",
+            "dpTypeOfChange": None,
+            "dpReasonForChange": None,
+            "dpDateOfChange": None,
+            "remainderWorkFlag": "No",
+            "minimumCasesAllowedCount": "0",
+            "maximumCasesAllowedCount": str(maximum_cases),
+            "minimumToleranceCount": "0",
+            "maximumToleranceCount": "0",
+            "minimumLicenseCount": "0",
+            "maximumLicenseCount": "0",
+            "workInProgressCount": str(self.rng.randint(0, maximum_cases)),
+            "outreach": None,
+            "cancelFlag": "N",
+            "cancelReason": None,
+            "cancelDate": None,
+            "closedDate": None,
+            "closedReason": None,
+        }
+
+
+def generate_fixtures(firm_count: int, seed: int = 0) -> Dict[str, List[Record]]:
+    """Generate the records of each fixture file, keyed as returned by _load_mock_data."""
+    if firm_count <= 0:
+        raise ValueError("firm_count must be a positive integer")
+    return FixtureGenerator(seed).generate(firm_count)
+
+
+def write_fixtures(data: Dict[str, List[Record]], output_dir: str) -> None:
+    """Write generated records to fixture files in `output_dir`, creating it if needed."""
+    os.makedirs(output_dir, exist_ok=True)
+    for name, filename in FIXTURE_FILES.items():
+        with open(os.path.join(output_dir, filename), "w") as f:
+            # Compact, as generated fixtures are too large to be read by hand
+            json.dump({name: data[name]}, f, separators=(",", ":"))
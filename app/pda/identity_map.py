@@ -0,0 +1,158 @@
+import functools
+import inspect
+import logging
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from flask import g, has_request_context
+
+logger = logging.getLogger(__name__)
+
+IdentityKey = Tuple[str, Optional[int], Optional[str], Tuple[Hashable, ...]]
+
+_MISSING = object()
+
+# Reads of a firm which list or pick its offices, so change when any of its offices does
+FIRM_OFFICE_READS = frozenset({"get_provider_offices", "get_head_office"})
+
+
+class IdentityMap:
+    """
+    Request-scoped store of entities already read from the Provider Data API.
+
+    Entries are keyed by the read method name, the firm ID and/or office code the read was made for, and
+    any remaining arguments. This lets writes evict everything that relates to a firm, an office, or a
+    (firm, office) pair without needing to know which read methods were used.
+    """
+
+    def __init__(self):
+        self._entries: Dict[IdentityKey, Any] = {}
+        self.saved_calls = 0
+
+    def get(self, key: IdentityKey) -> Any:
+        value = self._entries.get(key, _MISSING)
+        if value is not _MISSING:
+            self.saved_calls += 1
+        return value
+
+    def __contains__(self, key: IdentityKey) -> bool:
+        return key in self._entries
+
+    def set(self, key: IdentityKey, value: Any) -> None:
+        self._entries[key] = value
+
+    def evict(self, firm_id: Optional[int] = None, office_code: Optional[str] = None) -> None:
+        """Remove every entry read for the given firm ID or office code."""
+        self._entries = {
+            key: value
+            for key, value in self._entries.items()
+            if not ((firm_id is not None and key[1] == firm_id) or (office_code is not None and key[2] == office_code))
+        }
+
+    def evict_office(self, firm_id: int, office_code: str) -> None:
+        """Remove every entry read for an office and the lists of its firm's offices, keeping the firm itself."""
+        self._entries = {
+            key: value
+            for key, value in self._entries.items()
+            if not (key[2] == office_code or (key[1] == firm_id and key[0] in FIRM_OFFICE_READS))
+        }
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+def get_identity_map() -> IdentityMap | None:
+    """Get the identity map for the current request, or None if there is no request in progress."""
+    if not has_request_context():
+        return None
+    if "pda_identity_map" not in g:
+        g.pda_identity_map = IdentityMap()
+    return g.pda_identity_map
+
+
+def evict(firm_id: Optional[int] = None, office_code: Optional[str] = None) -> None:
+    """Evict entries affected by a write to the given firm and/or office."""
+    if identity_map := get_identity_map():
+        identity_map.evict(firm_id=firm_id, office_code=office_code)
+
+
+def evict_office(firm_id: int, office_code: str) -> None:
+    """Evict entries affected by a write to an office, which does not change its firm."""
+    if identity_map := get_identity_map():
+        identity_map.evict_office(firm_id, office_code)
+
+
+def clear() -> None:
+    """Evict all entries, used by writes which change relationships between firms."""
+    if identity_map := get_identity_map():
+        identity_map.clear()
+
+
+def identity_mapped(func: Callable) -> Callable:
+    """
+    Decorator for Provider Data API read methods, returning the entity from the request's identity map
+    when the same read has already been made during this request.
+
+    The decorated method's `firm_id` and `office_code` arguments (if any) are used to key the entry so that
+    writes can evict it. Lists are copied on the way out so callers cannot change the stored entry.
+    """
+    signature = inspect.signature(func)
+
+    def identity_key(self, *args, **kwargs) -> IdentityKey:
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        arguments = dict(bound.arguments)
+        arguments.pop("self", None)
+        firm_id = arguments.pop("firm_id", None)
+        office_code = arguments.pop("office_code", None)
+        return func.__name__, firm_id, office_code, tuple(arguments.items())
+
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        identity_map = get_identity_map()
+        if identity_map is None:
+            return func(self, *args, **kwargs)
+
+        try:
+            key = identity_key(self, *args, **kwargs)
+        except TypeError:
+            return func(self, *args, **kwargs)
+
+        try:
+            value = identity_map.get(key)
+        except TypeError:  # Unhashable arguments cannot be mapped
+            return func(self, *args, **kwargs)
+
+        if value is _MISSING:
+            value = func(self, *args, **kwargs)
+            identity_map.set(key, value)
+
+        return list(value) if isinstance(value, list) else value
+
+    wrapper.identity_key = identity_key
+    return wrapper
+
+
+def remember(method: Callable, value: Any, *args, **kwargs) -> None:
+    """
+    Store a result in the identity map as if it had been returned by the bound read `method(*args, **kwargs)`.
+
+    Used by bulk reads so that later single reads for the same entity are served from the identity map.
+    """
+    identity_map = get_identity_map()
+    if identity_map is None:
+        return
+
+    identity_key = method.__func__.identity_key
+    identity_map.set(identity_key(method.__self__, *args, **kwargs), value)
+
+
+def log_saved_calls(exception=None) -> None:
+    """Log how many Provider Data API calls were saved by the identity map during this request."""
+    identity_map = g.pop("pda_identity_map", None)
+    if identity_map and identity_map.saved_calls:
+        logger.debug(f"PDA identity map saved {identity_map.saved_calls} call(s)")
+
+
+def init_app(app) -> None:
+    """Register the teardown which discards the identity map at the end of each request."""
+    app.teardown_request(log_saved_calls)
@@ -0,0 +1,55 @@
+from typing import Any, Callable, Dict, List, Sequence, Type, TypeVar, overload
+
+from pydantic import BaseModel, ValidationError
+
+from app.pda.errors import ProviderDataApiError
+
+M = TypeVar("M", bound=BaseModel)
+
+
+class LazyModels(Sequence[M]):
+    """
+    Sequence of models over the raw rows of a PDA list response, which only validates the rows that are read.
+
+    Supports `len()`, indexing, slicing and filtering on the raw (camelCase) fields without building any
+    models, so a page can filter and count every firm but only validate the twenty it renders. Each row is
+    validated at most once per sequence, slices and filtered sequences share the rows but not the models.
+    """
+
+    def __init__(self, rows: List[Dict[str, Any]], model: Type[M]):
+        self._rows = rows
+        self._model = model
+        self._models: Dict[int, M] = {}
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    @overload
+    def __getitem__(self, index: int) -> M: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "LazyModels[M]": ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return LazyModels(self._rows[index], self._model)
+
+        if index < 0:
+            index += len(self._rows)
+        if not 0 <= index < len(self._rows):
+            raise IndexError("LazyModels index out of range")
+
+        if (model := self._models.get(index)) is None:
+            try:
+                model = self._model.model_validate(self._rows[index])
+            except ValidationError as e:
+                raise ProviderDataApiError(f"Invalid {self._model.__name__.lower()} data: {e}")
+            self._models[index] = model
+        return model
+
+    def filter(self, predicate: Callable[[Dict[str, Any]], bool]) -> "LazyModels[M]":
+        """Get the rows matching a predicate, which is given each raw row rather than its model."""
+        return LazyModels([row for row in self._rows if predicate(row)], self._model)
+
+    def __repr__(self) -> str:
+        return f"LazyModels({self._model.__name__}, {len(self._rows)} rows, {len(self._models)} validated)"
@@ -0,0 +1,180 @@
+import re
+import threading
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+# Upper bounds in seconds of the request latency histogram buckets
+LATENCY_BUCKETS = (0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Path segments which identify a resource, named after the segment before them
+_ID_SEGMENTS = {
+    "provider-firms": "{firmId}",
+    "provider-offices": "{officeCode}",
+    "offices": "{officeCode}",
+    "bank-details": "{bankAccountId}",
+}
+_HAS_DIGIT = re.compile(r"\d")
+
+
+def endpoint_template(endpoint: str) -> str:
+    """
+    Get the template of an endpoint path, so requests for different firms or offices are counted together.
+
+    e.g. `/provider-firms/123/provider-offices/1A001L/schedules` becomes
+    `/provider-firms/{firmId}/provider-offices/{officeCode}/schedules`.
+    """
+    segments = endpoint.strip("/").split("/")
+    template = []
+    for i, segment in enumerate(segments):
+        if i > 0 and segments[i - 1] in _ID_SEGMENTS:
+            template.append(_ID_SEGMENTS[segments[i - 1]])
+        elif _HAS_DIGIT.search(segment):
+            template.append("{id}")
+        else:
+            template.append(segment)
+    return "/" + "/".join(template)
+
+
+class _Histogram:
+    def __init__(self):
+        self.counts = [0] * len(LATENCY_BUCKETS)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.count += 1
+        self.sum += value
+
+
+class _Summary:
+    def __init__(self):
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.sum += value
+
+
+class PDAMetrics:
+    """
+    Counters and histograms of the requests this worker makes to the Provider Data API.
+
+    Everything is labelled by HTTP method and endpoint template, so the cost of each PDA endpoint can be
+    compared. The metrics are per process, Prometheus sums them across workers and pods.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._statuses: Dict[Tuple[str, str, str], int] = defaultdict(int)
+        self._latency: Dict[Tuple[str, str], _Histogram] = defaultdict(_Histogram)
+        self._bytes: Dict[Tuple[str, str], int] = defaultdict(int)
+        self._decode: Dict[Tuple[str, str], _Summary] = defaultdict(_Summary)
+        self._validation: Dict[Tuple[str, str], _Summary] = defaultdict(_Summary)
+        self._retries: Dict[Tuple[str, str], int] = defaultdict(int)
+        self._retries_refused: Dict[str, int] = defaultdict(int)
+
+    def record_request(self, method: str, endpoint: str, status: str, elapsed: float, size: int) -> None:
+        """Record a request which got a response, or raised in which case `status` is "error"."""
+        with self._lock:
+            self._statuses[(method, endpoint, status)] += 1
+            self._latency[(method, endpoint)].observe(elapsed)
+            self._bytes[(method, endpoint)] += size
+
+    def record_retries(self, method: str, endpoint: str, count: int) -> None:
+        """Record the retries made before a request got its response."""
+        with self._lock:
+            self._retries[(method, endpoint)] += count
+
+    def record_retry_refused(self, reason: str) -> None:
+        """Record a retry which was not made, because of the retry time limit or the retry budget."""
+        with self._lock:
+            self._retries_refused[reason] += 1
+
+    def record_decode(self, method: str, endpoint: str, elapsed: float) -> None:
+        """Record the time taken to decode a response body from JSON."""
+        with self._lock:
+            self._decode[(method, endpoint)].observe(elapsed)
+
+    def record_validation(self, method: str, endpoint: str, elapsed: float) -> None:
+        """Record the time taken to validate a response body into models."""
+        with self._lock:
+            self._validation[(method, endpoint)].observe(elapsed)
+
+    def render(self) -> str:
+        """Render the metrics in the Prometheus text exposition format."""
+        lines: List[str] = []
+        with self._lock:
+            lines += [
+                "# HELP pda_requests_total Requests made to the Provider Data API.",
+                "# TYPE pda_requests_total counter",
+            ]
+            for (method, endpoint, status), count in sorted(self._statuses.items()):
+                lines.append(f"pda_requests_total{_labels(method, endpoint, status=status)} {count}")
+
+            lines += [
+                "# HELP pda_request_duration_seconds Time taken to get a response from the Provider Data API.",
+                "# TYPE pda_request_duration_seconds histogram",
+            ]
+            for (method, endpoint), histogram in sorted(self._latency.items()):
+                cumulative = 0
+                for bound, count in zip(LATENCY_BUCKETS, histogram.counts):
+                    cumulative += count
+                    labels = _labels(method, endpoint, le=str(bound))
+                    lines.append(f"pda_request_duration_seconds_bucket{labels} {cumulative}")
+                labels = _labels(method, endpoint, le="+Inf")
+                lines.append(f"pda_request_duration_seconds_bucket{labels} {histogram.count}")
+                lines.append(f"pda_request_duration_seconds_sum{_labels(method, endpoint)} {histogram.sum}")
+                lines.append(f"pda_request_duration_seconds_count{_labels(method, endpoint)} {histogram.count}")
+
+            lines += [
+                "# HELP pda_response_bytes_total Bytes received in Provider Data API response bodies.",
+                "# TYPE pda_response_bytes_total counter",
+            ]
+            for (method, endpoint), size in sorted(self._bytes.items()):
+                lines.append(f"pda_response_bytes_total{_labels(method, endpoint)} {size}")
+
+            lines += [
+                "# HELP pda_retries_total Retries made before Provider Data API requests got a response.",
+                "# TYPE pda_retries_total counter",
+            ]
+            for (method, endpoint), count in sorted(self._retries.items()):
+                lines.append(f"pda_retries_total{_labels(method, endpoint)} {count}")
+
+            lines += [
+                "# HELP pda_retries_refused_total Retries not made because of the time limit or retry budget.",
+                "# TYPE pda_retries_refused_total counter",
+            ]
+            for reason, count in sorted(self._retries_refused.items()):
+                lines.append(f'pda_retries_refused_total{{reason="{_escape(reason)}"}} {count}')
+
+            for name, description, summaries in (
+                ("pda_json_decode_seconds", "Time taken to decode Provider Data API responses.", self._decode),
+                ("pda_model_validation_seconds", "Time taken to validate responses into models.", self._validation),
+            ):
+                lines += [f"# HELP {name} {description}", f"# TYPE {name} summary"]
+                for (method, endpoint), summary in sorted(summaries.items()):
+                    lines.append(f"{name}_sum{_labels(method, endpoint)} {summary.sum}")
+                    lines.append(f"{name}_count{_labels(method, endpoint)} {summary.count}")
+
+        return "\n".join(lines) + "\n"
+
+
+def _labels(method: str, endpoint: str, **extra: str) -> str:
+    labels = {"method": method, "endpoint": endpoint, **extra}
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def init_app(app) -> PDAMetrics:
+    """Create the PDA metrics, shared by the PDA client and the /metrics endpoint."""
+    metrics = PDAMetrics()
+    app.extensions["pda_metrics"] = metrics
+    return metrics
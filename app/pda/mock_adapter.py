@@ -0,0 +1,235 @@
+import hashlib
+import json
+import re
+from typing import Any, Callable, Dict, List, Mapping, NamedTuple, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+import requests
+from pydantic import BaseModel
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+from app.pda import call_budget
+from app.pda.mock_api import MockProviderDataApi
+from app.pda.pagination import Page
+
+
+def _to_json(value: Any) -> Any:
+    """Convert models (or lists of models) to the JSON shape the PDA responds with."""
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json", by_alias=True, exclude_none=True)
+    if isinstance(value, list):
+        return [_to_json(item) for item in value]
+    return value
+
+
+class MockRequest(NamedTuple):
+    """The parts of a request the mock PDA's route handlers read."""
+
+    params: Dict[str, str]
+    body: Optional[bytes]
+
+
+def _page_to_json(page: Page, key: str) -> dict:
+    return {key: _to_json(page.items), "totalCount": page.total, "nextCursor": page.next_cursor}
+
+
+def _limit(params: Dict[str, str]) -> int:
+    return int(params.get("limit", 20))
+
+
+# Offset added to the IDs of each copy of a scaled list item, so copies do not collide with the store's own IDs
+SCALED_ID_OFFSET = 1_000_000
+_SCALED_ID_FIELDS = ("firmId", "ccmsFirmId", "firmOfficeId", "ccmsFirmOfficeId", "bankAccountId", "contactId")
+_SCALED_CODE_FIELDS = ("firmNumber", "firmOfficeCode")
+
+
+def _scale_items(items: List[dict], factor: int) -> List[dict]:
+    """Repeat list items `factor` times, giving each copy its own IDs and codes."""
+    scaled = list(items)
+    for copy in range(1, factor):
+        for item in items:
+            item = dict(item)
+            for field in _SCALED_ID_FIELDS:
+                if isinstance(item.get(field), int):
+                    item[field] += copy * SCALED_ID_OFFSET
+            for field in _SCALED_CODE_FIELDS:
+                if isinstance(item.get(field), str):
+                    item[field] = f"{item[field]}-{copy}"
+            scaled.append(item)
+    return scaled
+
+
+def _scale_payload(payload: Any, factor: int) -> Any:
+    """Scale the list in a list response, whether it is the whole body or wrapped as `{"firms": [...]}`."""
+    if factor <= 1:
+        return payload
+    if isinstance(payload, list):
+        return _scale_items(payload, factor)
+    if isinstance(payload, dict) and len(payload) == 1:
+        key, items = next(iter(payload.items()))
+        if isinstance(items, list):
+            return {key: _scale_items(items, factor)}
+    return payload
+
+
+class MockPDAAdapter(BaseAdapter):
+    """
+    Transport adapter which serves the Provider Data API REST surface from a MockProviderDataApi.
+
+    Mounting this on a ProviderDataApi session lets the real client be exercised offline, including its
+    HTTP handling. Like the PDA, GET responses carry an `ETag` and a matching `If-None-Match` gets a
+    304 Not Modified with no body.
+
+    With a `payload_scale` above 1, every list response repeats its items that many times, each copy with IDs
+    offset by SCALED_ID_OFFSET, to reproduce production-sized payloads from the fixtures. Copies are only
+    served in lists, not from the routes for a single firm or office.
+
+    Usage:
+        pda.session.mount(pda.base_url, MockPDAAdapter(MockProviderDataApi()))
+    """
+
+    def __init__(self, mock_api: MockProviderDataApi, payload_scale: int = 1):
+        super().__init__()
+        self.mock_api = mock_api
+        self.payload_scale = payload_scale
+        self.routes: List[Tuple[str, re.Pattern, Callable[..., Any]]] = [
+            ("GET", re.compile(r"/provider-firms"), self._get_firms),
+            ("GET", re.compile(r"/provider-firms/(\d+)"), self._get_firm),
+            ("GET", re.compile(r"/provider-firms/(\d+)/provider-offices"), self._get_offices),
+            ("GET", re.compile(r"/provider-firms/(\d+)/provider-users"), self._get_users),
+            ("GET", re.compile(r"/provider-firms/(\d+)/bank-account-details"), self._get_firm_bank_accounts),
+            (
+                "GET",
+                re.compile(r"/provider-firms/(\d+)/provider-offices/([^/]+)/bank-account-details"),
+                self._get_office_bank_accounts,
+            ),
+            (
+                "GET",
+                re.compile(r"/provider-firms/(\d+)/provider-offices/([^/]+)/office-contract-details"),
+                self._get_contracts,
+            ),
+            ("GET", re.compile(r"/provider-firms/(\d+)/provider-offices/([^/]+)/schedules"), self._get_schedules),
+            ("GET", re.compile(r"/provider-offices/([^/]+)"), self._get_office),
+            ("PATCH", re.compile(r"/provider-firms/(\d+)"), self._patch_firm),
+            ("PATCH", re.compile(r"/provider-firms/(\d+)/offices/([^/]+)"), self._patch_office),
+        ]
+
+    def _get_firms(self, request):
+        if {"search", "firmType", "cursor", "limit"} & request.params.keys():
+            page = self.mock_api.search_provider_firms(
+                request.params.get("search", ""),
+                firm_type=request.params.get("firmType"),
+                cursor=request.params.get("cursor"),
+                limit=_limit(request.params),
+            )
+            return _page_to_json(page, "firms")
+        return {"firms": _to_json(self.mock_api.get_all_provider_firms())}
+
+    def _get_firm(self, request, firm_id):
+        firm = self.mock_api.get_provider_firm(int(firm_id))
+        return {"firm": _to_json(firm)} if firm else None
+
+    def _get_offices(self, request, firm_id):
+        if {"cursor", "limit"} & request.params.keys():
+            page = self.mock_api.get_provider_offices_page(
+                int(firm_id), cursor=request.params.get("cursor"), limit=_limit(request.params)
+            )
+            return _page_to_json(page, "offices")
+        return {"offices": _to_json(self.mock_api.get_provider_offices(int(firm_id)))}
+
+    def _get_users(self, request, firm_id):
+        return self.mock_api.get_provider_users(int(firm_id))
+
+    def _get_firm_bank_accounts(self, request, firm_id):
+        if {"search", "cursor", "limit"} & request.params.keys():
+            page = self.mock_api.search_bank_accounts(
+                request.params.get("search", ""),
+                firm_id=int(firm_id),
+                cursor=request.params.get("cursor"),
+                limit=_limit(request.params),
+            )
+            return _page_to_json(page, "bankAccounts")
+        return _to_json(self.mock_api.get_provider_firm_bank_details(int(firm_id)))
+
+    def _get_office_bank_accounts(self, request, firm_id, office_code):
+        return _to_json(self.mock_api.get_office_bank_accounts(int(firm_id), office_code))
+
+    def _get_contracts(self, request, firm_id, office_code):
+        return self.mock_api.get_office_contract_details(int(firm_id), office_code)
+
+    def _get_schedules(self, request, firm_id, office_code):
+        return self.mock_api.get_office_schedule_details(int(firm_id), office_code)
+
+    def _get_office(self, request, office_code):
+        office = self.mock_api.get_provider_office(office_code)
+        return {"office": _to_json(office)} if office else None
+
+    def _patch_firm(self, request, firm_id):
+        return _to_json(self.mock_api.patch_provider(int(firm_id), json.loads(request.body or "{}")))
+
+    def _patch_office(self, request, firm_id, office_code):
+        return _to_json(self.mock_api.patch_office(int(firm_id), office_code, json.loads(request.body or "{}")))
+
+    @staticmethod
+    def _build_response(
+        request: requests.PreparedRequest, status_code: int, body: bytes = b"", etag: Optional[str] = None
+    ) -> requests.Response:
+        response = requests.Response()
+        response.status_code = status_code
+        response._content = body
+        response._content_consumed = True
+        response.headers = CaseInsensitiveDict({"Content-Type": "application/json"})
+        if etag:
+            response.headers["ETag"] = etag
+        response.url = request.url
+        response.request = request
+        response.encoding = "utf-8"
+        return response
+
+    def dispatch(
+        self, method: str, target: str, headers: Mapping[str, str], body: Optional[bytes] = None
+    ) -> Tuple[int, bytes, Optional[str]]:
+        """
+        Serve a request to the mock PDA, returning the status code, body and ETag of the response.
+
+        Args:
+            method: The HTTP method
+            target: The path requested, with its query string if it has one
+            headers: The request headers
+            body: The request body
+        """
+        url = urlsplit(target)
+        request = MockRequest(dict(parse_qsl(url.query)), body)
+        for route_method, pattern, handler in self.routes:
+            if method == route_method and (match := pattern.fullmatch(url.path)):
+                try:
+                    # The client recorded the HTTP request, so the mock calls serving it are not recorded again
+                    with call_budget.not_counted():
+                        payload = handler(request, *match.groups())
+                except ValueError as e:
+                    # An invalid cursor or limit, which the PDA rejects as a bad request
+                    return 400, json.dumps({"error": str(e)}).encode(), None
+                break
+        else:
+            return 404, b"", None
+
+        if payload is None:
+            return 404, b"", None
+
+        if method != "GET":
+            return 200, json.dumps(payload, default=str).encode(), None
+
+        content = json.dumps(_scale_payload(payload, self.payload_scale), default=str).encode()
+        etag = f'"{hashlib.sha256(content).hexdigest()}"'
+        if_none_match = headers.get("If-None-Match") or ""
+        if etag in [tag.strip() for tag in if_none_match.split(",")]:
+            return 304, b"", etag
+        return 200, content, etag
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        status_code, body, etag = self.dispatch(request.method, request.path_url, request.headers, request.body)
+        return self._build_response(request, status_code, body, etag=etag)
+
+    def close(self) -> None:
+        pass
@@ -1,18 +1,41 @@
+import functools
+import hashlib
+import inspect
 import json
 import logging
+import marshal
 import os
 import random
 import string
+import sys
+import tempfile
+import threading
 import time
 from datetime import date
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Container, Dict, Iterable, Iterator, List, Optional, Tuple
 from unittest.mock import Mock
 
 from pydantic import ValidationError
 
 from app.constants import FirmType
 from app.models import BankAccount, Contact, Firm, Office
+from app.pda import call_budget, concurrency, decoding, firms_cache, identity_map
 from app.pda.errors import ProviderDataApiError
+from app.pda.fixture_generator import FIXTURE_FILES
+from app.pda.lazy import LazyModels
+from app.pda.mock_sqlite_store import SQLiteMockStore
+from app.pda.mock_store import MockLookups, MockStore, ReadWriteLock, Snapshot
+from app.pda.pagination import Page, next_cursor, page_bounds
+from app.utils.formatting import normalize_for_search
+
+logger = logging.getLogger(__name__)
+
+# Where the binary caches of fixture files are kept, outside the source tree so it is never written to
+_FIXTURE_CACHE_DIR = os.path.join(tempfile.gettempdir(), "manage-a-providers-data")
+
+# The fixtures loaded by this process, by fixtures directory, for each new mock to take a copy of
+_fixture_snapshots: Dict[Optional[str], Snapshot] = {}
+_fixture_snapshots_lock = threading.Lock()
 
 
 class MockPDAError(ProviderDataApiError):
@@ -32,8 +55,13 @@ def _clean_data(data: Dict[str, Any]) -> Dict[str, Any]:
     return {k: v for k, v in data.items() if not k.startswith("_")}
 
 
-def _generate_unique_office_code(existing_codes: List[str], max_attempts: int = 100) -> str:
-    """Generate a unique office code that doesn't exist in the given list."""
+def _generate_unique_office_code(existing_codes: Container[str], max_attempts: int = 100) -> str:
+    """
+    Generate a unique office code that doesn't exist in the given codes.
+
+    Pass a set or index of the codes, each attempt is checked against them. There are millions of possible codes so
+    the first attempt almost always succeeds.
+    """
     for _ in range(max_attempts):
         code = f"{random.randint(1, 9)}{random.choice(string.ascii_uppercase)}{random.randint(1, 999):03d}{random.choice(string.ascii_uppercase)}"
         if code not in existing_codes:
@@ -41,9 +69,23 @@ def _generate_unique_office_code(existing_codes: List[str], max_attempts: int =
     raise MockPDAError(f"Could not generate unique office code after {max_attempts} attempts")
 
 
-def _load_mock_data() -> Dict[str, Any]:
-    """Load mock data from JSON fixture files."""
-    fixtures_dir = os.path.join(os.path.dirname(__file__), "fixtures")
+def _page_of(
+    items: Iterable[Dict[str, Any]], cursor: Optional[str], limit: int
+) -> Tuple[List[Dict[str, Any]], int, Optional[str]]:
+    """Get the items on the page a cursor points to in a single pass, along with the total and next cursor."""
+    start, end = page_bounds(cursor, limit)
+    page_items, total = [], 0
+    for item in items:
+        if start <= total < end:
+            page_items.append(_clean_data(item))
+        total += 1
+    return page_items, total, next_cursor(end, total)
+
+
+def _load_mock_data(fixtures_dir: Optional[str] = None) -> Dict[str, Any]:
+    """Load mock data from JSON fixture files, by default the checked-in ones."""
+    if fixtures_dir is None:
+        fixtures_dir = os.path.join(os.path.dirname(__file__), "fixtures")
 
     # Load all fixture files - keep raw data with relationships
     providers_data = _load_fixture(os.path.join(fixtures_dir, "providers.json"))
@@ -64,6 +106,86 @@ def _load_mock_data() -> Dict[str, Any]:
     }
 
 
+def _load_cached_mock_data(fixtures_dir: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Load mock data from a binary cache of the fixture files, which loads in around half the time of parsing their
+    JSON, as fixtures are plain JSON values which marshal can write in Python's own format.
+
+    The cache is kept in the temporary directory, named after the fixtures directory and the Python version, as the
+    format changes between versions. It is rebuilt from the JSON when any fixture file has changed since it was
+    written, and skipped if it cannot be written.
+    """
+    if fixtures_dir is None:
+        fixtures_dir = os.path.join(os.path.dirname(__file__), "fixtures")
+    try:
+        stats = [os.stat(os.path.join(fixtures_dir, filename)) for filename in FIXTURE_FILES.values()]
+    except OSError:
+        return _load_mock_data(fixtures_dir)
+    sources = [(stat.st_mtime_ns, stat.st_size) for stat in stats]
+    fixtures_key = hashlib.sha256(os.path.abspath(fixtures_dir).encode()).hexdigest()[:16]
+    cache_path = os.path.join(_FIXTURE_CACHE_DIR, f"mock_data.{fixtures_key}.{sys.implementation.cache_tag}.marshal")
+
+    try:
+        with open(cache_path, "rb") as f:
+            cached_sources, data = marshal.loads(f.read())
+        if cached_sources == sources:
+            return data
+    except (OSError, EOFError, ValueError, TypeError):
+        pass
+
+    data = _load_mock_data(fixtures_dir)
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        # Written to a temporary file first, so workers starting together never read a partly written cache
+        temporary_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}"
+        with open(temporary_path, "wb") as f:
+            marshal.dump((sources, data), f)
+        os.replace(temporary_path, cache_path)
+    except OSError as e:
+        logger.debug(f"Could not write the mock PDA fixture cache to {cache_path}: {e}")
+    return data
+
+
+def _fixtures_snapshot(fixtures_dir: Optional[str] = None) -> Snapshot:
+    """The fixtures in a directory, loaded once per process however many mocks are created."""
+    with _fixture_snapshots_lock:
+        if fixtures_dir not in _fixture_snapshots:
+            _fixture_snapshots[fixtures_dir] = _load_cached_mock_data(fixtures_dir)
+        return _fixture_snapshots[fixtures_dir]
+
+
+def _synchronized(cls):
+    """
+    Class decorator for the mock PDA, running each public method under its read/write lock, so it can serve
+    concurrent requests from a threaded server without corrupting its data. Methods which only read take the read
+    lock, so they run concurrently, and every other method takes the write lock and makes its writes in one store
+    transaction, so other worker processes sharing a SQLite store never see half of them.
+
+    Generators are left unlocked, as they would hold the lock for as long as their caller kept them open.
+    """
+    for name, attr in list(vars(cls).items()):
+        if name.startswith("_") or name in ("init_app", "test_connection") or not inspect.isfunction(attr):
+            continue
+        if inspect.isgeneratorfunction(attr):
+            continue
+        setattr(cls, name, _locked(attr, write=not name.startswith(("get_", "search_"))))
+    return cls
+
+
+def _locked(func: Callable, write: bool) -> Callable:
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        if not write:
+            with self._lock.read():
+                return func(self, *args, **kwargs)
+        with self._lock.write(), self._store.transaction():
+            return func(self, *args, **kwargs)
+
+    return wrapper
+
+
+@call_budget.counted_calls
+@_synchronized
 class MockProviderDataApi:
     """
     Mock implementation of the Provider Data API for local development and testing.
@@ -78,23 +200,69 @@ class MockProviderDataApi:
         self.session = Mock()
         self.logger = logging.getLogger(__name__)
         self._initialized = False
+        self.firms_cache: Optional[firms_cache.FirmListCache] = None
+        self.server_side_search = False
+        # Held by every public method, see _synchronized
+        self._lock = ReadWriteLock()
+        # Loaded on first use, so init_app() can choose other data without loading the default fixtures first
+        self._loaded_store: Optional[MockLookups] = None
+        self._store_lock = threading.Lock()
+
+    @property
+    def _store(self) -> MockLookups:
+        """The mock's data, copied from the default fixtures the first time it is used unless already set."""
+        if self._loaded_store is None:
+            with self._store_lock:
+                if self._loaded_store is None:
+                    self._loaded_store = MockStore.from_snapshot(_fixtures_snapshot())
+        return self._loaded_store
+
+    @_store.setter
+    def _store(self, store: MockLookups) -> None:
+        self._loaded_store = store
+
+    @property
+    def _mock_data(self) -> Dict[str, Any]:
+        """
+        The raw fixture records, lists of which may be read directly but must only be changed through _store.
 
-        # Load mock data from fixtures
-        self._mock_data = _load_mock_data()
+        With a SQLite store these are copies read from the database.
+        """
+        return self._store.data
+
+    @_mock_data.setter
+    def _mock_data(self, data: Dict[str, Any]) -> None:
+        self._store = MockStore(data)
+
+    def snapshot(self) -> Snapshot:
+        """
+        Capture the mock's data as it is now, to restore() it to later, e.g. to undo a test's writes without
+        loading the fixtures again.
+        """
+        return self._store.snapshot()
+
+    def restore(self, snapshot: Snapshot) -> None:
+        """Restore the mock's data to a snapshot, which can be restored again later."""
+        if isinstance(self._store, SQLiteMockStore):
+            # Restored in the database, so every worker sharing it sees the restored data
+            self._store.restore(snapshot)
+        else:
+            self._store = MockStore.from_snapshot(snapshot)
+        identity_map.clear()
+        self._invalidate_firms_cache()
 
     def _find_office_data(self, firm_id: int, office_code: str) -> Optional[Dict[str, Any]]:
         """Find office by firm_id and office_code."""
-        for office in self._mock_data["offices"]:
-            if office.get("_firmId") == firm_id and office.get("firmOfficeCode") == office_code:
-                return office
-        return None
+        return self._store.firm_office(firm_id, office_code)
 
     def _find_firm_data(self, firm_id: int) -> Optional[Dict[str, Any]]:
         """Find firm by firm_id."""
-        for firm in self._mock_data["firms"]:
-            if firm.get("firmId") == firm_id:
-                return firm
-        return None
+        return self._store.firm(firm_id)
+
+    def _invalidate_firms_cache(self) -> None:
+        """Invalidate the shared provider firms cache after a write to any firm."""
+        if self.firms_cache:
+            self.firms_cache.invalidate()
 
     def init_app(self, app, base_url: str = None, api_key: str = None, **kwargs) -> None:
         """
@@ -108,10 +276,22 @@ class MockProviderDataApi:
         """
         self.app = app
         self.base_url = base_url.rstrip("/") if base_url else None
+        self.server_side_search = app.config.get("PDA_SERVER_SIDE_SEARCH", self.server_side_search)
+        fixtures_dir = app.config.get("PDA_MOCK_FIXTURES_DIR")
+        database = app.config.get("PDA_MOCK_DATABASE")
+        if database:
+            # Fixtures are only loaded the first time the database is opened
+            self._store = SQLiteMockStore(database, lambda: _load_cached_mock_data(fixtures_dir))
+        elif fixtures_dir:
+            self._store = MockStore.from_snapshot(_fixtures_snapshot(fixtures_dir))
+        identity_map.init_app(app)
+        call_budget.init_app(app)
 
         if not hasattr(app, "extensions"):
             app.extensions = {}
         app.extensions["pda"] = self
+        self.firms_cache = firms_cache.init_app(app)
+        concurrency.init_app(app)
 
         self._initialized = True
         self.logger.info("Mock Provider Data API initialized")
@@ -127,6 +307,7 @@ class MockProviderDataApi:
             raise MockPDAError("API client not initialized. Call init_app() first.")
         return True
 
+    @identity_map.identity_mapped
     def get_provider_firm(self, firm_id: int) -> Firm | None:
         """
         Get details for a specific provider firm.
@@ -140,30 +321,97 @@ class MockProviderDataApi:
         if not isinstance(firm_id, int) or firm_id <= 0:
             raise ValueError("firm_id must be a positive integer")
 
-        for firm in self._mock_data["firms"]:
-            if firm.get("firmId") == firm_id:
-                try:
-                    cleaned_firm = _clean_data(firm)
-                    return Firm(**cleaned_firm)
-                except ValidationError as e:
-                    self.logger.error(f"Invalid firm data in mock for firm {firm_id}: {e}")
-                    raise MockPDAError(f"Invalid firm data: {e}")
-        return None
+        firm = self._store.firm(firm_id)
+        if firm is None:
+            return None
+        try:
+            cleaned_firm = _clean_data(firm)
+            return Firm(**cleaned_firm)
+        except ValidationError as e:
+            self.logger.error(f"Invalid firm data in mock for firm {firm_id}: {e}")
+            raise MockPDAError(f"Invalid firm data: {e}")
 
-    def get_all_provider_firms(self) -> List[Firm]:
+    def get_all_provider_firms(self, lazy: bool = False) -> List[Firm] | LazyModels[Firm]:
         """
         Get all provider firms.
 
+        Args:
+            lazy: Return a LazyModels over the raw firms, which only validates the firms that are read.
+                Lazy lists bypass the firms cache.
+
         Returns:
             List of Firm model instances
         """
+        if lazy:
+            return LazyModels([_clean_data(firm) for firm in self._store.records("firms")], Firm)
+
+        if self.firms_cache and (firms := self.firms_cache.get()) is not None:
+            return firms
+
+        try:
+            cleaned_firms = [_clean_data(firm) for firm in self._store.records("firms")]
+            firms = decoding.FIRMS.validate_python(cleaned_firms)
+        except ValidationError as e:
+            self.logger.error(f"Invalid firms data in mock: {e}")
+            raise MockPDAError(f"Invalid firms data: {e}")
+
+        if self.firms_cache:
+            self.firms_cache.set(firms)
+        return firms
+
+    def iter_provider_firms(self) -> Iterator[Firm]:
+        """
+        Iterate over all provider firms, validating each firm as it is reached.
+
+        Yields:
+            Firm model instances
+        """
+        if self.firms_cache and (firms := self.firms_cache.get()) is not None:
+            yield from firms
+            return
+
+        for firm_data in self._store.records("firms"):
+            try:
+                yield Firm(**_clean_data(firm_data))
+            except ValidationError as e:
+                self.logger.error(f"Invalid firms data in mock: {e}")
+                raise MockPDAError(f"Invalid firms data: {e}")
+
+    def search_provider_firms(
+        self, term: str = "", firm_type: Optional[str] = None, cursor: Optional[str] = None, limit: int = 20
+    ) -> Page[Firm]:
+        """
+        Search provider firms by name or firm ID, one page at a time.
+
+        The raw firms are filtered in a single pass and only the firms on the page are validated.
+
+        Args:
+            term: Text to find in the firm name or firm ID, every firm matches an empty term
+            firm_type: Only include firms of this type
+            cursor: The next_cursor of the previous page, or None for the first page
+            limit: The most firms to return
+
+        Returns:
+            Page of Firm model instances, with the number of firms matching across every page
+        """
+        search = normalize_for_search(term)
+        matches = (
+            firm
+            for firm in self._store.records("firms")
+            if (not firm_type or firm.get("firmType") == firm_type)
+            and (
+                search in normalize_for_search(firm.get("firmName"))
+                or search in normalize_for_search(str(firm.get("firmId")))
+            )
+        )
+        page_firms, total, cursor = _page_of(matches, cursor, limit)
         try:
-            cleaned_firms = [_clean_data(firm) for firm in self._mock_data["firms"]]
-            return [Firm(**firm_data) for firm_data in cleaned_firms]
+            return Page(decoding.FIRMS.validate_python(page_firms), total, cursor)
         except ValidationError as e:
             self.logger.error(f"Invalid firms data in mock: {e}")
             raise MockPDAError(f"Invalid firms data: {e}")
 
+    @identity_map.identity_mapped
     def get_provider_office(self, office_code: str) -> Office | None:
         """
         Get details for a specific provider office.
@@ -177,16 +425,17 @@ class MockProviderDataApi:
         if not office_code or not isinstance(office_code, str):
             raise ValueError("office_code must be a non-empty string")
 
-        for office in self._mock_data["offices"]:
-            if office.get("firmOfficeCode") == office_code:
-                try:
-                    cleaned_office = _clean_data(office)
-                    return Office(**cleaned_office)
-                except ValidationError as e:
-                    self.logger.error(f"Invalid office data in mock for office {office_code}: {e}")
-                    raise MockPDAError(f"Invalid office data: {e}")
-        return None
+        office = self._store.office(office_code)
+        if office is None:
+            return None
+        try:
+            cleaned_office = _clean_data(office)
+            return Office(**cleaned_office)
+        except ValidationError as e:
+            self.logger.error(f"Invalid office data in mock for office {office_code}: {e}")
+            raise MockPDAError(f"Invalid office data: {e}")
 
+    @identity_map.identity_mapped
     def get_provider_offices(self, firm_id: int) -> List[Office]:
         """
         Get all offices for a specific firm.
@@ -200,17 +449,13 @@ class MockProviderDataApi:
         if not isinstance(firm_id, int) or firm_id <= 0:
             raise ValueError("firm_id must be a positive integer")
 
-        filtered_offices = []
-        for office in self._mock_data["offices"]:
-            if office.get("_firmId") == firm_id:
-                cleaned_office = _clean_data(office)
-                filtered_offices.append(cleaned_office)
+        filtered_offices = [_clean_data(office) for office in self._store.firm_offices(firm_id)]
 
         if not filtered_offices:
             return []
 
         try:
-            return [Office(**office_data) for office_data in filtered_offices]
+            return decoding.OFFICES.validate_python(filtered_offices)
         except ValidationError as e:
             self.logger.error(f"Invalid offices data in mock for firm {firm_id}: {e}")
             raise MockPDAError(f"Invalid offices data: {e}")
@@ -220,8 +465,32 @@ class MockProviderDataApi:
         for office in offices:
             # When need to update the office data in memory and not the office object
             item = self._find_office_data(firm_id, office.firm_office_code)
-            item.update({"inactiveDate": date.today()})
+            self._store.update("offices", item, {"inactiveDate": date.today()})
+        identity_map.evict(firm_id=firm_id)
+
+    def get_provider_offices_page(self, firm_id: int, cursor: Optional[str] = None, limit: int = 20) -> Page[Office]:
+        """
+        Get one page of the offices for a specific firm.
+
+        Args:
+            firm_id: The firm ID
+            cursor: The next_cursor of the previous page, or None for the first page
+            limit: The most offices to return
 
+        Returns:
+            Page of Office model instances, with the number of offices the firm has
+        """
+        if not isinstance(firm_id, int) or firm_id <= 0:
+            raise ValueError("firm_id must be a positive integer")
+
+        page_offices, total, cursor = _page_of(self._store.firm_offices(firm_id), cursor, limit)
+        try:
+            return Page(decoding.OFFICES.validate_python(page_offices), total, cursor)
+        except ValidationError as e:
+            self.logger.error(f"Invalid offices data in mock for firm {firm_id}: {e}")
+            raise MockPDAError(f"Invalid offices data: {e}")
+
+    @identity_map.identity_mapped
     def get_head_office(self, firm_id: int) -> Office | None:
         """
         Gets the head office for a specific firm.
@@ -244,6 +513,32 @@ class MockProviderDataApi:
                 return office
         return None
 
+    def get_head_offices(self, firm_ids: Iterable[int]) -> Dict[int, Office | None]:
+        """
+        Gets the head offices for many firms, looking up each firm's offices in the index.
+
+        Every head office is also stored in the request's identity map, so later calls to get_head_office
+        for these firms are served from it.
+
+        Args:
+            firm_ids: The firm IDs
+
+        Returns:
+            Dict of firm ID to its head office, or None if the firm has no head office
+        """
+        head_offices: Dict[int, Office | None] = dict.fromkeys(firm_ids)
+        for firm_id in head_offices:
+            office_data = next(
+                (office for office in self._store.firm_offices(firm_id) if office.get("headOffice") == "N/A"), None
+            )
+            if office_data is not None:
+                head_offices[firm_id] = Office(**_clean_data(office_data))
+
+        for firm_id, head_office in head_offices.items():
+            identity_map.remember(self.get_head_office, head_office, firm_id)
+
+        return head_offices
+
     def get_provider_users(self, firm_id: int) -> List[Dict[str, Any]]:
         """
         Get all users for a specific firm.
@@ -258,8 +553,9 @@ class MockProviderDataApi:
             raise ValueError("firm_id must be a positive integer")
 
         # Return empty list if no users data exists for this firm
-        return self._mock_data.get("users", {}).get(firm_id, [])
+        return self._store.users(firm_id)
 
+    @identity_map.identity_mapped
     def get_provider_children(self, firm_id: int, only_firm_type: FirmType | None = None) -> List[Firm]:
         """
         Get all firms for which the specified firm_id is their parentFirmId, optionally
@@ -277,15 +573,14 @@ class MockProviderDataApi:
 
         provider_children = []
 
-        for firm in self._mock_data["firms"]:
-            if firm.get("parentFirmId") == firm_id:
-                try:
-                    cleaned_firm = _clean_data(firm)
-                    child_firm = Firm(**cleaned_firm)
-                    if only_firm_type is None or child_firm.firm_type == only_firm_type:
-                        provider_children.append(child_firm)
-                except ValidationError as e:
-                    self.logger.error(f"Invalid firm data in mock for firm {firm_id}: {e}")
+        for firm in self._store.child_firms(firm_id):
+            try:
+                cleaned_firm = _clean_data(firm)
+                child_firm = Firm(**cleaned_firm)
+                if only_firm_type is None or child_firm.firm_type == only_firm_type:
+                    provider_children.append(child_firm)
+            except ValidationError as e:
+                self.logger.error(f"Invalid firm data in mock for firm {firm_id}: {e}")
 
         return provider_children
 
@@ -317,10 +612,9 @@ class MockProviderDataApi:
 
         contracts = []
         office_id = office_data.get("firmOfficeId")
-        for contract in self._mock_data["contracts"]:
-            if contract.get("_firmOfficeId") == office_id:
-                cleaned_contract = _clean_data(contract)
-                contracts.append(cleaned_contract)
+        for contract in self._store.office_contracts(office_id):
+            cleaned_contract = _clean_data(contract)
+            contracts.append(cleaned_contract)
 
         return contracts
 
@@ -352,10 +646,9 @@ class MockProviderDataApi:
 
         schedules = []
         office_id = office_data.get("firmOfficeId")
-        for schedule in self._mock_data["schedules"]:
-            if schedule.get("_firmOfficeId") == office_id:
-                cleaned_schedule = _clean_data(schedule)
-                schedules.append(cleaned_schedule)
+        for schedule in self._store.office_schedules(office_id):
+            cleaned_schedule = _clean_data(schedule)
+            schedules.append(cleaned_schedule)
 
         return schedules
 
@@ -420,7 +713,8 @@ class MockProviderDataApi:
             raise MockPDAError(f"Office {office_code} not found for firm {firm_id}")
 
         # Update payment method using API/camelCase field name
-        office_data["paymentMethod"] = payment_method
+        self._store.update("offices", office_data, {"paymentMethod": payment_method})
+        identity_map.evict(firm_id=firm_id, office_code=office_code)
 
         # Return updated Office model
         try:
@@ -440,9 +734,7 @@ class MockProviderDataApi:
         Returns:
             Firm: The created Firm model instance with assigned ID
         """
-        # Generate a new firm ID
-        existing_ids = [firm_data.get("firmId", 0) for firm_data in self._mock_data["firms"]]
-        new_firm_id = max(existing_ids, default=0) + 1
+        new_firm_id = self._store.next_id("firms")
 
         # Create a copy with the generated ID fields
         updated_firm = firm.model_copy(
@@ -450,7 +742,9 @@ class MockProviderDataApi:
         )
 
         # Add to mock data
-        self._mock_data["firms"].append(updated_firm.to_api_dict())
+        self._store.add("firms", updated_firm.to_api_dict())
+        identity_map.evict(firm_id=updated_firm.parent_firm_id)
+        self._invalidate_firms_cache()
 
         return updated_firm
 
@@ -465,13 +759,8 @@ class MockProviderDataApi:
         Returns:
             Office: The created Office model instance with assigned ID
         """
-        # Generate a new office ID
-        existing_ids = [office_data.get("firmOfficeId", 0) for office_data in self._mock_data["offices"]]
-        new_office_id = max(existing_ids, default=0) + 1
-
-        # Generate unique office code
-        existing_codes = [o.get("firmOfficeCode") for o in self._mock_data["offices"]]
-        office_code = _generate_unique_office_code(existing_codes)
+        new_office_id = self._store.next_id("offices")
+        office_code = _generate_unique_office_code(self._store.office_codes)
 
         # Create a copy with the generated ID fields
         updated_office = office.model_copy(update={"firm_office_id": new_office_id, "firm_office_code": office_code})
@@ -480,10 +769,12 @@ class MockProviderDataApi:
         updated_office_dict.update({"_firmId": firm_id})
 
         # Add to mock data
-        self._mock_data["offices"].append(updated_office_dict)
+        self._store.add("offices", updated_office_dict)
+        identity_map.evict(firm_id=firm_id)
 
         return updated_office
 
+    @identity_map.identity_mapped
     def get_office_bank_accounts(self, firm_id: int, office_code: str) -> List[BankAccount]:
         """
         Get the bank account for a specific office (each office has only one bank account).
@@ -510,15 +801,12 @@ class MockProviderDataApi:
             return bank_accounts
 
         # Find the bank account for this office
-        for account in self._mock_data["bank_accounts"]:
-            if account.get("vendorSiteId") == office_id:
-                try:
-                    bank_accounts.append(BankAccount(**account))
-                except ValidationError as e:
-                    self.logger.error(f"Invalid bank account data in mock for office {office_code}: {e}")
-                    raise MockPDAError(f"Invalid bank account data: {e}")
-
-        return bank_accounts
+        accounts = self._store.office_bank_accounts(office_id)
+        try:
+            return decoding.BANK_ACCOUNTS.validate_python(accounts)
+        except ValidationError as e:
+            self.logger.error(f"Invalid bank account data in mock for office {office_code}: {e}")
+            raise MockPDAError(f"Invalid bank account data: {e}")
 
     def _get_firm_bank_details_raw(self, firm_id: int) -> dict:
         """
@@ -537,18 +825,20 @@ class MockProviderDataApi:
         firm_office_ids = [office.firm_office_id for office in firm_offices]
 
         # Find the bank account belonging to offices of the given firm.
-        bank_accounts = self._mock_data["bank_accounts"]
         bank_accounts = {
-            account["bankAccountId"]: account for account in bank_accounts if account["vendorSiteId"] in firm_office_ids
+            account["bankAccountId"]: account
+            for office_id in firm_office_ids
+            for account in self._store.office_bank_accounts(office_id)
         }
         return bank_accounts
 
+    @identity_map.identity_mapped
     def get_provider_firm_bank_details(self, firm_id: int) -> List[BankAccount]:
         if not isinstance(firm_id, int) or firm_id <= 0:
             raise ValueError("firm_id must be a positive integer")
 
         bank_accounts = self._get_firm_bank_details_raw(firm_id)
-        return [BankAccount(**account) for account in bank_accounts.values()]
+        return decoding.BANK_ACCOUNTS.validate_python(list(bank_accounts.values()))
 
     def create_office_bank_account(self, firm_id: int, office_code: str, bank_account: BankAccount) -> BankAccount:
         """
@@ -577,11 +867,9 @@ class MockProviderDataApi:
         office_id = office_data.get("firmOfficeId")
 
         # Deactivate all existing bank accounts currently attached to this office
-        for account in self._mock_data["bank_accounts"]:
-            if account["vendorSiteId"] == office_id:
-                account["primaryFlag"] = "N"
-                if not account.get("endDate"):
-                    account["endDate"] = date.today()
+        for account in self._store.office_bank_accounts(office_id):
+            end_date = account.get("endDate") or date.today()
+            self._store.update("bank_accounts", account, {"primaryFlag": "N", "endDate": end_date})
 
         # Set the vendor_site_id to the office ID
         updated_account = bank_account.model_copy(
@@ -593,7 +881,8 @@ class MockProviderDataApi:
         )
 
         # Add to mock data
-        self._mock_data["bank_accounts"].append(updated_account.to_api_dict())
+        self._store.add("bank_accounts", updated_account.to_api_dict())
+        identity_map.evict(firm_id=firm_id, office_code=office_code)
 
         return updated_account
 
@@ -624,14 +913,15 @@ class MockProviderDataApi:
         office_id = office_data.get("firmOfficeId")
 
         # Find and update the bank account
-        for i, account in enumerate(self._mock_data["bank_accounts"]):
-            if account.get("vendorSiteId") == office_id:
-                updated_account = bank_account.model_copy(update={"vendor_site_id": office_id})
-                self._mock_data["bank_accounts"][i] = updated_account.to_api_dict()
-                return updated_account
+        for account in self._store.office_bank_accounts(office_id):
+            updated_account = bank_account.model_copy(update={"vendor_site_id": office_id})
+            self._store.replace("bank_accounts", account, updated_account.to_api_dict())
+            identity_map.evict(firm_id=firm_id, office_code=office_code)
+            return updated_account
 
         raise MockPDAError(f"Bank account not found for office {office_code}")
 
+    @identity_map.identity_mapped
     def get_office_contacts(self, firm_id: int, office_code: str) -> List[Contact]:
         """
         Get all contacts for a specific office.
@@ -658,13 +948,12 @@ class MockProviderDataApi:
 
         # Find all contacts for this office
         contacts = []
-        for contact in self._mock_data["contacts"]:
-            if contact.get("vendorSiteId") == office_id:
-                try:
-                    contacts.append(Contact(**contact))
-                except ValidationError as e:
-                    self.logger.error(f"Invalid contact data in mock for office {office_code}: {e}")
-                    raise MockPDAError(f"Invalid contact data: {e}")
+        for contact in self._store.office_contacts(office_id):
+            try:
+                contacts.append(Contact(**contact))
+            except ValidationError as e:
+                self.logger.error(f"Invalid contact data in mock for office {office_code}: {e}")
+                raise MockPDAError(f"Invalid contact data: {e}")
 
         return contacts
 
@@ -694,28 +983,41 @@ class MockProviderDataApi:
 
         office_id = office_data.get("firmOfficeId")
 
-        # Generate a new contact ID
-        existing_ids = [contact_data.get("contactId", 0) for contact_data in self._mock_data["contacts"]]
-        new_contact_id = max(existing_ids, default=0) + 1
-
         # Set the vendor_site_id to the office ID and creation_date to today in ISO format
-        updates = {"vendor_site_id": office_id, "contact_id": new_contact_id}
+        updates = {"vendor_site_id": office_id, "contact_id": self._store.next_id("contacts")}
         if not contact.creation_date:
             updates["creation_date"] = date.today()
 
         updated_contact = contact.model_copy(update=updates)
 
         # Add to mock data
-        self._mock_data["contacts"].append(updated_contact.to_api_dict())
+        self._store.add("contacts", updated_contact.to_api_dict())
+        identity_map.evict(firm_id=firm_id, office_code=office_code)
 
         return updated_contact
 
-    def patch_office(self, firm_id: int, office_code: str, fields_to_update: dict) -> Office:
-        office = self._find_office_data(firm_id, office_code)
-        if office:
-            office.update(fields_to_update)
+    def patch_office(self, firm_id: int, office_code: str, fields_to_update: dict) -> Office | None:
+        office_data = self._find_office_data(firm_id, office_code)
+        if not office_data:
+            return None
+        self._store.update("offices", office_data, fields_to_update)
+        identity_map.evict_office(firm_id, office_code)
+        office = Office(**_clean_data(office_data))
+        identity_map.remember(self.get_provider_office, office, office_code)
         return office
 
+    def patch_offices(
+        self, firm_id: int, fields_by_office: Dict[str, dict]
+    ) -> Dict[str, Office | None | ProviderDataApiError]:
+        """Update many offices of a firm, returning each updated office or the error raised updating it."""
+        results = {}
+        for office_code, fields_to_update in fields_by_office.items():
+            try:
+                results[office_code] = self.patch_office(firm_id, office_code, fields_to_update)
+            except ProviderDataApiError as e:
+                results[office_code] = e
+        return results
+
     def patch_provider_firm(self, firm_id: int, fields_to_update: dict):
         firm = self.get_provider_firm(firm_id)
         if firm:
@@ -727,17 +1029,18 @@ class MockProviderDataApi:
 
     def _update_provider_firm(self, firm: Firm, fields_to_update: dict):
         # Get the raw firm data from storage
-        firm_dict = None
-        for item in self._mock_data["firms"]:
-            if item.get("firmId") == firm.firm_id:
-                firm_dict = item
-                break
+        firm_dict = self._find_firm_data(firm.firm_id)
+        if not firm_dict:
+            return None
 
-        if firm_dict:
-            firm_dict.update(fields_to_update)
+        self._store.update("firms", firm_dict, fields_to_update)
+        identity_map.evict(firm_id=firm.firm_id)
+        self._invalidate_firms_cache()
 
-        # Return updated firm as a Firm instance
-        return self.get_provider_firm(firm.firm_id)
+        # Return updated firm as a Firm instance, which later reads in this request are served
+        updated_firm = Firm(**_clean_data(firm_dict))
+        identity_map.remember(self.get_provider_firm, updated_firm, firm.firm_id)
+        return updated_firm
 
     def update_contact(self, firm_id: int, office_code: str, contact: Contact) -> Contact:
         """
@@ -762,25 +1065,29 @@ class MockProviderDataApi:
             raise ValueError("contact must have contact_id set")
 
         # Find the contact in mock data by contact_id
-        contact_index = None
-        for i, existing_contact in enumerate(self._mock_data["contacts"]):
-            if existing_contact.get("contactId") == contact.contact_id:
-                contact_index = i
-                break
-
-        if contact_index is None:
+        existing_contact = self._store.contact(contact.contact_id)
+        if existing_contact is None:
             raise MockPDAError(f"Contact with contact_id {contact.contact_id} not found")
 
         # Update the contact data
-        self._mock_data["contacts"][contact_index] = contact.to_api_dict()
+        self._store.replace("contacts", existing_contact, contact.to_api_dict())
+        identity_map.evict(firm_id=firm_id, office_code=office_code)
 
         return contact
 
-    def patch_provider(self, firm_id: int, fields_to_update: dict):
-        firm: dict = self._find_firm_data(firm_id)
-        if not firm:
+    def patch_provider(self, firm_id: int, fields_to_update: dict) -> Firm:
+        firm_data: dict = self._find_firm_data(firm_id)
+        if not firm_data:
             raise ProviderDataApiError(f"Provider with firm {firm_id} not found")
-        firm.update(fields_to_update)
+        self._store.update("firms", firm_data, fields_to_update)
+        if "parentFirmId" in fields_to_update:
+            # Moving a firm between parents changes other firms' children
+            identity_map.clear()
+        else:
+            identity_map.evict(firm_id=firm_id)
+        self._invalidate_firms_cache()
+        firm = Firm(**_clean_data(firm_data))
+        identity_map.remember(self.get_provider_firm, firm, firm_id)
         return firm
 
     def assign_bank_account_to_office(self, firm_id: int, office_code: str, bank_account_id: int) -> BankAccount:
@@ -796,11 +1103,11 @@ class MockProviderDataApi:
             BankAccount: The bank account that was assigned to the office
         """
 
-        selected_bank_account = list(
-            filter(lambda account: account["bankAccountId"] == int(bank_account_id), self._mock_data["bank_accounts"])
-        )[0]
+        selected_bank_account = self._store.bank_account(int(bank_account_id))
+        if selected_bank_account is None:
+            raise MockPDAError(f"Bank account {bank_account_id} not found")
         # Copy the selected bank account
-        copy_bank_account_data = selected_bank_account.copy()
+        copy_bank_account_data = dict(selected_bank_account)
         copy_bank_account_data.update(
             {
                 "bankAccountId": int(time.time()),
@@ -815,7 +1122,8 @@ class MockProviderDataApi:
 
     def update_office_contact_details(self, firm_id, firm_office_code, payload):
         office_data = self._find_office_data(firm_id, firm_office_code)
-        office_data.update(payload)
+        self._store.update("offices", office_data, payload)
+        identity_map.evict(firm_id=firm_id, office_code=firm_office_code)
 
     def add_bank_account_to_office(self, firm_id: int, office_code: str, bank_account: BankAccount) -> BankAccount:
         bank_account.bank_account_id = int(time.time())
@@ -824,28 +1132,71 @@ class MockProviderDataApi:
     def get_all_bank_accounts(self) -> List[BankAccount]:
         # Get all bank accounts
         bank_accounts = []
-        for account in self._mock_data["bank_accounts"]:
+        for account in self._store.records("bank_accounts"):
             bank_accounts.append(BankAccount(**account))
         return bank_accounts
 
+    def search_bank_accounts(
+        self, term: str = "", firm_id: Optional[int] = None, cursor: Optional[str] = None, limit: int = 20
+    ) -> Page[BankAccount]:
+        """
+        Search bank accounts by sort code or account number, one page at a time, newest first.
+
+        Args:
+            term: A sort code or account number to match exactly, every bank account matches an empty term
+            firm_id: Only include the bank accounts of this firm's offices
+            cursor: The next_cursor of the previous page, or None for the first page
+            limit: The most bank accounts to return
+
+        Returns:
+            Page of BankAccount model instances, with the number of bank accounts matching across every page
+        """
+        if firm_id is None:
+            bank_accounts = self._store.records("bank_accounts")
+        else:
+            bank_accounts = self._get_firm_bank_details_raw(firm_id).values()
+
+        matches = [
+            account
+            for account in bank_accounts
+            if not term or term in (account.get("accountNumber"), account.get("sortCode"))
+        ]
+        # Newest first, with bank accounts which have no start date last
+        matches.sort(key=lambda account: str(account.get("startDate") or ""), reverse=True)
+
+        page_accounts, total, cursor = _page_of(matches, cursor, limit)
+        try:
+            return Page(decoding.BANK_ACCOUNTS.validate_python(page_accounts), total, cursor)
+        except ValidationError as e:
+            self.logger.error(f"Invalid bank account data in mock: {e}")
+            raise MockPDAError(f"Invalid bank account data: {e}")
+
     def update_provider_firm_name(self, firm_id: int, new_firm_name: str) -> Firm:
         firm_data = self._find_firm_data(firm_id)
-        firm_data.update({"firmName": new_firm_name})
+        self._store.update("firms", firm_data, {"firmName": new_firm_name})
+        identity_map.evict(firm_id=firm_id)
+        self._invalidate_firms_cache()
         return Firm(**firm_data)
 
     def update_legal_service_provider_details(self, firm_id: int, data: dict) -> Firm:
         firm_details = self._find_firm_data(firm_id)
-        firm_details.update(data)
+        self._store.update("firms", firm_details, data)
+        identity_map.evict(firm_id=firm_id)
+        self._invalidate_firms_cache()
         return Firm(**firm_details)
 
     def update_barrister_details(self, firm_id, barrister_details: dict) -> Firm:
         firm_details = self._find_firm_data(firm_id)
-        firm_details.update(barrister_details)
+        self._store.update("firms", firm_details, barrister_details)
+        identity_map.evict(firm_id=firm_id)
+        self._invalidate_firms_cache()
         return Firm(**firm_details)
 
     def update_advocate_details(self, firm_id, advocate_details: dict) -> Firm:
         firm_details = self._find_firm_data(firm_id)
-        firm_details.update(advocate_details)
+        self._store.update("firms", firm_details, advocate_details)
+        identity_map.evict(firm_id=firm_id)
+        self._invalidate_firms_cache()
         return Firm(**firm_details)
 
     def update_office_false_balance(self, firm_id: int, office_code: str, data: dict) -> Office:
@@ -873,7 +1224,8 @@ class MockProviderDataApi:
 
     def update_office_debt_recovery(self, firm_id: int, office_code: str, data: dict) -> Office:
         office_data = self._find_office_data(firm_id, office_code)
-        office_data.update(data)
+        self._store.update("offices", office_data, data)
+        identity_map.evict(firm_id=firm_id, office_code=office_code)
         return Office(**_clean_data(office_data))
 
     def update_office_hold_payments(self, firm_id: int, office_code: str, data: dict) -> Office:
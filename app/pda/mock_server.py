@@ -0,0 +1,244 @@
+"""
+Local stand-in for the Provider Data API, serving the mock PDA's fixtures over HTTP with injected latency and
+faults, so the real ProviderDataApi client can be load tested and profiled without the PDA.
+
+Run from the repository root:
+    python -m app.pda.mock_server --port 8010 --latency lognormal:0.05:0.5 --error-rate 0.02 --payload-scale 100
+
+The mock serves the fixtures in --fixtures-dir, or PDA_MOCK_FIXTURES_DIR, and keeps its data in the SQLite file
+--database, or PDA_MOCK_DATABASE, when they are given, as the app's mock does.
+
+Point the app at it with PDA_URL=http://localhost:8010 and PDA_USE_MOCK_API=False.
+"""
+
+import argparse
+import json
+import logging
+import math
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Sequence, Tuple
+
+from flask import Flask
+
+from app.pda.mock_adapter import MockPDAAdapter
+from app.pda.mock_api import MockProviderDataApi
+
+logger = logging.getLogger(__name__)
+
+
+class Latency:
+    """
+    Distribution of the delay added before each response, parsed from a spec:
+
+    - `none`
+    - `fixed:SECONDS`
+    - `uniform:LOW:HIGH`
+    - `lognormal:MEDIAN:SIGMA`, the long-tailed shape of real API latency
+    """
+
+    DISTRIBUTIONS = {"none": 0, "fixed": 1, "uniform": 2, "lognormal": 2}
+
+    def __init__(self, spec: str = "none"):
+        name, *params = spec.split(":")
+        if name not in self.DISTRIBUTIONS or len(params) != self.DISTRIBUTIONS[name]:
+            raise ValueError(
+                f"Invalid latency {spec!r}, expected none, fixed:SECONDS, uniform:LOW:HIGH or lognormal:MEDIAN:SIGMA"
+            )
+        self.spec = spec
+        self.name = name
+        self.params = [float(param) for param in params]
+
+    def sample(self, rng: random.Random) -> float:
+        """Get a delay in seconds."""
+        if self.name == "fixed":
+            return self.params[0]
+        if self.name == "uniform":
+            return rng.uniform(*self.params)
+        if self.name == "lognormal":
+            median, sigma = self.params
+            return rng.lognormvariate(math.log(median), sigma) if median > 0 else 0
+        return 0
+
+
+class FaultInjector:
+    """
+    Decides the latency and failures injected into responses from the mock PDA server.
+
+    A share `error_rate` of requests fail with one of `error_statuses`, chosen at random. 429 and 503 responses
+    carry a `Retry-After` of `retry_after` seconds when it is set. Given a `seed`, the same sequence of requests
+    gets the same delays and failures.
+    """
+
+    def __init__(
+        self,
+        latency: Optional[Latency] = None,
+        error_rate: float = 0.0,
+        error_statuses: Sequence[int] = (500, 502, 503, 504),
+        retry_after: Optional[int] = None,
+        seed: Optional[int] = None,
+    ):
+        self.latency = latency or Latency()
+        self.error_rate = error_rate
+        self.error_statuses = tuple(error_statuses)
+        self.retry_after = retry_after
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def delay(self) -> float:
+        """Get the delay in seconds to add before the next response."""
+        with self._lock:
+            return max(0.0, self.latency.sample(self._rng))
+
+    def fault(self) -> Optional[int]:
+        """Get the status code to fail the next request with, or None to serve it."""
+        with self._lock:
+            if self.error_rate <= 0 or self._rng.random() >= self.error_rate:
+                return None
+            return self._rng.choice(self.error_statuses)
+
+
+class MockPDARequestHandler(BaseHTTPRequestHandler):
+    # Keep connections alive, as the PDA does, so the client's connection pool is exercised as in production
+    protocol_version = "HTTP/1.1"
+    server: "MockPDAServer"
+
+    def do_GET(self):
+        self._handle()
+
+    def do_PATCH(self):
+        self._handle()
+
+    def _handle(self) -> None:
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+        delay = self.server.faults.delay()
+        if delay:
+            time.sleep(delay)
+
+        if status_code := self.server.faults.fault():
+            headers = {}
+            if status_code in (429, 503) and self.server.faults.retry_after is not None:
+                headers["Retry-After"] = str(self.server.faults.retry_after)
+            content = json.dumps({"error": f"Injected fault {status_code}"}).encode()
+            self._respond(status_code, content, headers)
+            return
+
+        status_code, content, etag = self.server.adapter.dispatch(self.command, self.path, self.headers, body)
+        self._respond(status_code, content, {"ETag": etag} if etag else {})
+
+    def _respond(self, status_code: int, content: bytes, headers: dict) -> None:
+        self.send_response(status_code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        logger.debug(f"{self.address_string()} {format % args}")
+
+
+class MockPDAServer(ThreadingHTTPServer):
+    """
+    HTTP server for the Provider Data API REST surface, backed by a MockProviderDataApi through MockPDAAdapter.
+
+    Each request is handled on its own thread, and the mock locks its data itself, so reads overlap as they would
+    against the PDA.
+
+    Usage:
+        with MockPDAServer(faults=FaultInjector(Latency("fixed:0.05"))) as server:
+            pda.init_app(app, base_url=server.url, api_key="mock-api-key")
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: Tuple[str, int] = ("127.0.0.1", 0),
+        mock_api: Optional[MockProviderDataApi] = None,
+        faults: Optional[FaultInjector] = None,
+        payload_scale: int = 1,
+    ):
+        super().__init__(address, MockPDARequestHandler)
+        self.adapter = MockPDAAdapter(mock_api or MockProviderDataApi(), payload_scale=payload_scale)
+        self.faults = faults or FaultInjector()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockPDAServer":
+        """Serve requests on a background thread."""
+        self._thread = threading.Thread(target=self.serve_forever, name="mock-pda-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving requests and close the socket."""
+        if self._thread is not None:
+            self.shutdown()
+            self._thread.join()
+            self._thread = None
+        self.server_close()
+
+    def __enter__(self) -> "MockPDAServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+def create_mock_api(fixtures_dir: Optional[str] = None, database: Optional[str] = None) -> MockProviderDataApi:
+    """Create the mock PDA to serve, configured through init_app as the app's mock is."""
+    app = Flask(__name__)
+    app.config.update(PDA_MOCK_FIXTURES_DIR=fixtures_dir, PDA_MOCK_DATABASE=database)
+    mock_api = MockProviderDataApi()
+    mock_api.init_app(app)
+    return mock_api
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on")
+    parser.add_argument("--port", type=int, default=8010, help="Port to listen on")
+    parser.add_argument("--latency", type=Latency, default=Latency(), help="Latency added to each response")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests to fail, from 0 to 1")
+    parser.add_argument(
+        "--error-statuses",
+        type=lambda value: [int(status) for status in value.split(",")],
+        default=[500, 502, 503, 504],
+        help="Comma-separated status codes failed requests get",
+    )
+    parser.add_argument("--retry-after", type=int, help="Retry-After seconds sent with 429 and 503 responses")
+    parser.add_argument("--payload-scale", type=int, default=1, help="Number of times to repeat list items")
+    parser.add_argument("--seed", type=int, help="Seed for repeatable latency and faults")
+    parser.add_argument(
+        "--fixtures-dir", default=os.environ.get("PDA_MOCK_FIXTURES_DIR"), help="Directory of fixtures to serve"
+    )
+    parser.add_argument(
+        "--database", default=os.environ.get("PDA_MOCK_DATABASE"), help="SQLite file to keep the mock's data in"
+    )
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    faults = FaultInjector(args.latency, args.error_rate, args.error_statuses, args.retry_after, args.seed)
+    mock_api = create_mock_api(args.fixtures_dir, args.database)
+    server = MockPDAServer((args.host, args.port), mock_api, faults=faults, payload_scale=args.payload_scale)
+    logger.info(f"Mock PDA listening on {server.url} with {args.latency.spec} latency")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
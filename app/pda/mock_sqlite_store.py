@@ -0,0 +1,262 @@
+import json
+import sqlite3
+import threading
+import weakref
+from contextlib import contextmanager
+from typing import Any, Callable, Container, Dict, Hashable, Iterator, List, Tuple
+
+from app.pda.mock_store import INDEXES, SEQUENCES, MockLookups, Record, Snapshot
+
+# Seconds a write waits for another process's write to finish before failing
+BUSY_TIMEOUT = 30
+
+
+class _Row(dict):
+    """A record read from the database, which remembers the row it was read from so it can be written back."""
+
+    __slots__ = ("rowid",)
+
+
+def _columns(name: str) -> List[str]:
+    """The fields of a list which are copied out of the record into columns, to be indexed."""
+    fields = [field for index_fields, _ in INDEXES[name].values() for field in index_fields]
+    if name in SEQUENCES:
+        fields.append(SEQUENCES[name])
+    return list(dict.fromkeys(fields))
+
+
+class _ThreadConnection:
+    """A thread's connection, closed once the thread has finished and this is collected."""
+
+    def __init__(self, connection: sqlite3.Connection):
+        self.connection = connection
+        self.depth = 0
+
+
+def _close(connection: sqlite3.Connection, connections: List[sqlite3.Connection], lock: threading.Lock) -> None:
+    connection.close()
+    with lock:
+        if connection in connections:
+            connections.remove(connection)
+
+
+def _quote(identifier: str) -> str:
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def _dumps(record: Record) -> str:
+    # Dates set by the mock are stored as ISO strings, as they are sent by the PDA
+    return json.dumps(record, default=str)
+
+
+class SQLiteMockStore(MockLookups):
+    """
+    The mock PDA's data kept in a SQLite database, so every worker process serving the app sees the same data and
+    writes survive restarts.
+
+    Each list of records is a table holding the records as JSON, with the fields they are looked up by copied into
+    indexed columns. The database is loaded from the fixtures the first time it is opened, delete it to start again.
+    Records read from the store are copies, so they must be changed through the store for the change to be kept.
+    """
+
+    def __init__(self, path: str, load_data: Callable[[], Dict[str, Any]]):
+        self.path = path
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        with self.transaction():
+            if not self._connection().execute("PRAGMA user_version").fetchone()[0]:
+                self._load(load_data())
+
+    def _thread_connection(self) -> _ThreadConnection:
+        """The calling thread's connection, as connections cannot be shared between threads."""
+        thread_connection = getattr(self._local, "connection", None)
+        if thread_connection is None:
+            # Only this thread uses the connection, but close() or the finalizer may close it from another
+            connection = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT, isolation_level=None, check_same_thread=False)
+            # Readers in other processes do not block writers, or each other
+            connection.execute("PRAGMA journal_mode = WAL")
+            thread_connection = self._local.connection = _ThreadConnection(connection)
+            with self._connections_lock:
+                self._connections.append(connection)
+            # Threads come and go with each fan-out, so close the connection once its thread has finished
+            weakref.finalize(thread_connection, _close, connection, self._connections, self._connections_lock)
+        return thread_connection
+
+    def _connection(self) -> sqlite3.Connection:
+        return self._thread_connection().connection
+
+    def close(self) -> None:
+        with self._connections_lock:
+            for connection in self._connections:
+                connection.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """
+        Make the writes inside the block together, or not at all if it raises. Writes from other processes wait
+        for the block to finish, so reads inside it see no changes but its own. Blocks can be nested.
+        """
+        thread_connection = self._thread_connection()
+        if thread_connection.depth:
+            thread_connection.depth += 1
+            try:
+                yield
+            finally:
+                thread_connection.depth -= 1
+            return
+        connection = thread_connection.connection
+        connection.execute("BEGIN IMMEDIATE")
+        thread_connection.depth = 1
+        try:
+            yield
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        else:
+            connection.execute("COMMIT")
+        finally:
+            thread_connection.depth = 0
+
+    def _load(self, data: Dict[str, Any]) -> None:
+        connection = self._connection()
+        for name, indexes in INDEXES.items():
+            columns = _columns(name)
+            column_definitions = ", ".join(_quote(column) for column in columns)
+            # Columns have no type, so values keep their type and 1 is not equal to "1", as in Python
+            connection.execute(f"CREATE TABLE {_quote(name)} ({column_definitions}, body TEXT NOT NULL)")
+            for index, (fields, _) in indexes.items():
+                connection.execute(
+                    f"CREATE INDEX {_quote(f'{name}_{index}')} ON {_quote(name)} "
+                    f"({', '.join(_quote(field) for field in fields)})"
+                )
+            records = data.get(name, [])
+            connection.executemany(self._insert_sql(name), [self._values(name, record) for record in records])
+        connection.execute("CREATE TABLE sequences (name TEXT PRIMARY KEY, last INTEGER NOT NULL)")
+        for name, field in SEQUENCES.items():
+            last = max((r[field] for r in data.get(name, []) if isinstance(r.get(field), int)), default=0)
+            connection.execute("INSERT INTO sequences (name, last) VALUES (?, ?)", (name, last))
+        connection.execute("PRAGMA user_version = 1")
+
+    def _insert_sql(self, name: str) -> str:
+        columns = _columns(name)
+        placeholders = ", ".join("?" * (len(columns) + 1))
+        column_names = ", ".join(_quote(column) for column in columns)
+        return f"INSERT INTO {_quote(name)} ({column_names}, body) VALUES ({placeholders})"
+
+    def _values(self, name: str, record: Record) -> Tuple[Any, ...]:
+        return (*(record.get(column) for column in _columns(name)), _dumps(record))
+
+    def _rows(self, sql: str, parameters: Tuple[Any, ...] = ()) -> List[Record]:
+        rows = []
+        for rowid, body in self._connection().execute(sql, parameters):
+            row = _Row(json.loads(body))
+            row.rowid = rowid
+            rows.append(row)
+        return rows
+
+    def _lookup(self, name: str, index: str, key: Hashable) -> Any:
+        fields, unique = INDEXES[name][index]
+        values = key if len(fields) > 1 else (key,)
+        where = " AND ".join(f"{_quote(field)} = ?" for field in fields)
+        sql = f"SELECT rowid, body FROM {_quote(name)} WHERE {where} ORDER BY rowid"
+        if unique:
+            rows = self._rows(sql + " LIMIT 1", tuple(values))
+            return rows[0] if rows else None
+        return self._rows(sql, tuple(values))
+
+    @property
+    def data(self) -> Dict[str, List[Record]]:
+        """A copy of every record, for inspecting the data."""
+        return {name: self.records(name) for name in INDEXES}
+
+    def records(self, name: str) -> List[Record]:
+        """Every record in a list, in the order they were added."""
+        return self._rows(f"SELECT rowid, body FROM {_quote(name)} ORDER BY rowid")
+
+    def users(self, firm_id: int) -> List[Record]:
+        # The fixtures have no users
+        return []
+
+    def snapshot(self) -> Snapshot:
+        """Copy every record as it is now, to restore() the database to later."""
+        with self.transaction():
+            return {name: [dict(record) for record in self.records(name)] for name in INDEXES}
+
+    def restore(self, snapshot: Snapshot) -> None:
+        """
+        Replace every record with those in a snapshot. IDs are not allocated again, as other processes may still
+        hold records with the IDs allocated since the snapshot was taken.
+        """
+        connection = self._connection()
+        with self.transaction():
+            for name in INDEXES:
+                records = snapshot.get(name, [])
+                connection.execute(f"DELETE FROM {_quote(name)}")
+                connection.executemany(self._insert_sql(name), [self._values(name, record) for record in records])
+            for name, field in SEQUENCES.items():
+                last = max((r[field] for r in snapshot.get(name, []) if isinstance(r.get(field), int)), default=0)
+                connection.execute("UPDATE sequences SET last = MAX(last, ?) WHERE name = ?", (last, name))
+
+    def _seen(self, name: str, record: Record) -> None:
+        value = record.get(SEQUENCES.get(name, ""))
+        if isinstance(value, int):
+            self._connection().execute("UPDATE sequences SET last = MAX(last, ?) WHERE name = ?", (value, name))
+
+    def add(self, name: str, record: Record) -> Record:
+        """Append a record to a list."""
+        with self.transaction():
+            cursor = self._connection().execute(self._insert_sql(name), self._values(name, record))
+            self._seen(name, record)
+        row = _Row(record)
+        row.rowid = cursor.lastrowid
+        return row
+
+    def update(self, name: str, record: Record, fields: Dict[str, Any]) -> Record:
+        """Update the fields of a record read from the store."""
+        record.update(fields)
+        return self._write(name, record)
+
+    def replace(self, name: str, record: Record, new_record: Record) -> Record:
+        """Replace the fields of a record read from the store, keeping its position in its list."""
+        record.clear()
+        record.update(new_record)
+        return self._write(name, record)
+
+    def _write(self, name: str, record: Record) -> Record:
+        if not isinstance(record, _Row):
+            raise TypeError("Only records read from the store can be written back to it")
+        assignments = ", ".join(f"{_quote(column)} = ?" for column in [*_columns(name), "body"])
+        with self.transaction():
+            self._connection().execute(
+                f"UPDATE {_quote(name)} SET {assignments} WHERE rowid = ?",
+                (*self._values(name, record), record.rowid),
+            )
+            self._seen(name, record)
+        return record
+
+    def next_id(self, name: str) -> int:
+        """Allocate the ID for a new record in a list, one above the highest ID in it so far."""
+        with self.transaction():
+            return (
+                self._connection()
+                .execute("UPDATE sequences SET last = last + 1 WHERE name = ? RETURNING last", (name,))
+                .fetchone()[0]
+            )
+
+    @property
+    def office_codes(self) -> Container[str]:
+        """Every office code in use, to check new codes against without scanning the offices."""
+        return _OfficeCodes(self)
+
+
+class _OfficeCodes:
+    """The office codes in a SQLite store, checked one at a time against its index."""
+
+    def __init__(self, store: SQLiteMockStore):
+        self.store = store
+
+    def __contains__(self, office_code: object) -> bool:
+        return self.store.office(office_code) is not None
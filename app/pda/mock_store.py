@@ -0,0 +1,307 @@
+import abc
+import copy
+import threading
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from typing import Any, Container, ContextManager, Dict, Hashable, Iterator, List, Optional, Tuple
+
+Record = Dict[str, Any]
+# A copy of the mock data taken by MockStore.snapshot(), for MockStore.from_snapshot() to restore
+Snapshot = Dict[str, Any]
+
+
+def copy_data(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Copy the mock data down to its records, which are all the mock changes in place, sharing the values inside
+    the records. This is far cheaper than a deep copy, or loading the fixtures again.
+    """
+    return {
+        name: [dict(record) for record in records] if isinstance(records, list) else copy.deepcopy(records)
+        for name, records in data.items()
+    }
+
+
+def _remove(records: List[Record], record: Record) -> None:
+    """Remove a record from an index list by identity, as records with the same fields are still distinct."""
+    records[:] = [item for item in records if item is not record]
+
+
+class _Index:
+    """Hash index over the records of one list in the mock data, by the value of one or more of their fields."""
+
+    def __init__(self, *fields: str, unique: bool):
+        self.fields = fields
+        self.unique = unique
+        self._records: Dict[Hashable, Any] = {} if unique else defaultdict(list)
+
+    def key(self, record: Record) -> Optional[Hashable]:
+        values = tuple(record.get(field) for field in self.fields)
+        if any(value is None for value in values):
+            return None
+        return values[0] if len(values) == 1 else values
+
+    def add(self, record: Record) -> None:
+        key = self.key(record)
+        if key is None:
+            return
+        if self.unique:
+            # The first record with a key wins, as a scan over the list would find it first
+            self._records.setdefault(key, record)
+        else:
+            self._records[key].append(record)
+
+    def remove(self, record: Record) -> None:
+        key = self.key(record)
+        if key is None:
+            return
+        if self.unique:
+            if self._records.get(key) is record:
+                del self._records[key]
+        elif key in self._records:
+            _remove(self._records[key], record)
+
+    def get(self, key: Hashable) -> Any:
+        if self.unique:
+            return self._records.get(key)
+        return self._records.get(key, [])
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._records
+
+
+class _Sequence:
+    """Allocates increasing IDs for the records of one list, atomically so concurrent writers never share an ID."""
+
+    def __init__(self, field: str):
+        self.field = field
+        self._last = 0
+        self._lock = threading.Lock()
+
+    def seen(self, record: Record) -> None:
+        value = record.get(self.field)
+        if isinstance(value, int):
+            with self._lock:
+                self._last = max(self._last, value)
+
+    def next(self) -> int:
+        with self._lock:
+            self._last += 1
+            return self._last
+
+
+class ReadWriteLock:
+    """
+    Lock which many readers can hold at once, or a single writer.
+
+    Waiting writers are let in before new readers, so a steady stream of reads cannot hold off writes. A thread
+    holding the lock can take it again, so locked methods can call each other, but a reader cannot become a writer
+    as two readers doing so would wait for each other forever.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._readers = 0
+        self._writing = False
+        self._writers_waiting = 0
+        self._held = threading.local()
+
+    @contextmanager
+    def read(self) -> Iterator[None]:
+        if getattr(self._held, "depth", 0):
+            yield from self._reenter()
+            return
+        with self._condition:
+            self._condition.wait_for(lambda: not self._writing and not self._writers_waiting)
+            self._readers += 1
+        try:
+            yield from self._reenter()
+        finally:
+            with self._condition:
+                self._readers -= 1
+                if not self._readers:
+                    self._condition.notify_all()
+
+    @contextmanager
+    def write(self) -> Iterator[None]:
+        if getattr(self._held, "writing", False):
+            yield from self._reenter()
+            return
+        if getattr(self._held, "depth", 0):
+            raise RuntimeError("Cannot take the write lock while holding the read lock")
+        with self._condition:
+            self._writers_waiting += 1
+            try:
+                self._condition.wait_for(lambda: not self._writing and not self._readers)
+            finally:
+                self._writers_waiting -= 1
+            self._writing = True
+        self._held.writing = True
+        try:
+            yield from self._reenter()
+        finally:
+            self._held.writing = False
+            with self._condition:
+                self._writing = False
+                self._condition.notify_all()
+
+    def _reenter(self) -> Iterator[None]:
+        self._held.depth = getattr(self._held, "depth", 0) + 1
+        try:
+            yield
+        finally:
+            self._held.depth -= 1
+
+
+# The lists of records in the mock data, with the fields each is looked up by and whether a lookup finds one record
+INDEXES: Dict[str, Dict[str, Tuple[Tuple[str, ...], bool]]] = {
+    "firms": {
+        "id": (("firmId",), True),
+        "parent": (("parentFirmId",), False),
+    },
+    "offices": {
+        "code": (("firmOfficeCode",), True),
+        "firm_code": (("_firmId", "firmOfficeCode"), True),
+        "firm": (("_firmId",), False),
+    },
+    "contracts": {"office": (("_firmOfficeId",), False)},
+    "schedules": {"office": (("_firmOfficeId",), False)},
+    "bank_accounts": {
+        "id": (("bankAccountId",), True),
+        "site": (("vendorSiteId",), False),
+    },
+    "contacts": {
+        "id": (("contactId",), True),
+        "site": (("vendorSiteId",), False),
+    },
+}
+# The ID field of the lists which new records are given IDs for
+SEQUENCES = {"firms": "firmId", "offices": "firmOfficeId", "contacts": "contactId"}
+
+
+class MockLookups(abc.ABC):
+    """The lookups the mock PDA makes, served by a store's `_lookup` of records by one of the INDEXES."""
+
+    @abc.abstractmethod
+    def _lookup(self, name: str, index: str, key: Hashable) -> Any:
+        """A unique index's record with the key, or None, or a list of every record with it for other indexes."""
+
+    def firm(self, firm_id: int) -> Optional[Record]:
+        return self._lookup("firms", "id", firm_id)
+
+    def child_firms(self, parent_firm_id: int) -> List[Record]:
+        # Firm IDs are allocated in order, so ordering by ID matches the order the firms were added in
+        return sorted(self._lookup("firms", "parent", parent_firm_id), key=lambda firm: firm.get("firmId") or 0)
+
+    def office(self, office_code: str) -> Optional[Record]:
+        return self._lookup("offices", "code", office_code)
+
+    def firm_office(self, firm_id: int, office_code: str) -> Optional[Record]:
+        return self._lookup("offices", "firm_code", (firm_id, office_code))
+
+    def firm_offices(self, firm_id: int) -> List[Record]:
+        return self._lookup("offices", "firm", firm_id)
+
+    def office_contracts(self, office_id: int) -> List[Record]:
+        return self._lookup("contracts", "office", office_id)
+
+    def office_schedules(self, office_id: int) -> List[Record]:
+        return self._lookup("schedules", "office", office_id)
+
+    def bank_account(self, bank_account_id: int) -> Optional[Record]:
+        return self._lookup("bank_accounts", "id", bank_account_id)
+
+    def office_bank_accounts(self, office_id: int) -> List[Record]:
+        return self._lookup("bank_accounts", "site", office_id)
+
+    def contact(self, contact_id: int) -> Optional[Record]:
+        return self._lookup("contacts", "id", contact_id)
+
+    def office_contacts(self, office_id: int) -> List[Record]:
+        return self._lookup("contacts", "site", office_id)
+
+
+class MockStore(MockLookups):
+    """
+    The mock PDA's data, the raw fixture records kept as loaded, with hash indexes over them.
+
+    Lookups by ID, office code, parent firm or office are served from the indexes instead of scanning the lists,
+    so the mock stays fast with production-sized fixtures. Records must be added and their indexed fields changed
+    through the store so the indexes and ID sequences stay consistent, other fields can be changed on the records
+    in place.
+    """
+
+    def __init__(self, data: Dict[str, Any]):
+        self.data = data
+        self.indexes: Dict[str, Dict[str, _Index]] = {
+            name: {index: _Index(*fields, unique=unique) for index, (fields, unique) in indexes.items()}
+            for name, indexes in INDEXES.items()
+        }
+        self.sequences: Dict[str, _Sequence] = {name: _Sequence(field) for name, field in SEQUENCES.items()}
+        for name in self.indexes:
+            for record in data.get(name, []):
+                self._index(name, record)
+
+    @classmethod
+    def from_snapshot(cls, snapshot: Snapshot) -> "MockStore":
+        """A store with a copy of the data in a snapshot, so the snapshot can be restored from again."""
+        return cls(copy_data(snapshot))
+
+    def snapshot(self) -> Snapshot:
+        """Copy the data as it is now, so later changes to the store leave the copy as it was."""
+        return copy_data(self.data)
+
+    def _index(self, name: str, record: Record) -> None:
+        for index in self.indexes[name].values():
+            index.add(record)
+        if name in self.sequences:
+            self.sequences[name].seen(record)
+
+    def _lookup(self, name: str, index: str, key: Hashable) -> Any:
+        return self.indexes[name][index].get(key)
+
+    def records(self, name: str) -> List[Record]:
+        """Every record in a list, in the order they were added."""
+        return self.data.get(name, [])
+
+    def users(self, firm_id: int) -> List[Record]:
+        return self.data.get("users", {}).get(firm_id, [])
+
+    def transaction(self) -> ContextManager[None]:
+        """Group writes to be made together, which the single-process store has no need for."""
+        return nullcontext()
+
+    def add(self, name: str, record: Record) -> Record:
+        """Append a record to a list, indexing it."""
+        self.data[name].append(record)
+        self._index(name, record)
+        return record
+
+    def update(self, name: str, record: Record, fields: Dict[str, Any]) -> Record:
+        """Update the fields of a record in place, re-indexing it under any indexed fields which changed."""
+        changed = [index for index in self.indexes[name].values() if any(field in fields for field in index.fields)]
+        for index in changed:
+            index.remove(record)
+        record.update(fields)
+        for index in changed:
+            index.add(record)
+        if name in self.sequences:
+            self.sequences[name].seen(record)
+        return record
+
+    def replace(self, name: str, record: Record, new_record: Record) -> Record:
+        """Replace the fields of a record in place, keeping its position in its list."""
+        for index in self.indexes[name].values():
+            index.remove(record)
+        record.clear()
+        record.update(new_record)
+        self._index(name, record)
+        return record
+
+    def next_id(self, name: str) -> int:
+        """Allocate the ID for a new record in a list, one above the highest ID in it so far."""
+        return self.sequences[name].next()
+
+    @property
+    def office_codes(self) -> Container[str]:
+        """Every office code in use, to check new codes against without scanning the offices."""
+        return self.indexes["offices"]["code"]
@@ -0,0 +1,59 @@
+import base64
+import binascii
+from typing import Generic, List, NamedTuple, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class Page(NamedTuple, Generic[T]):
+    """One page of a PDA list, with the number of items across every page and the cursor to the next page."""
+
+    items: List[T]
+    total: int
+    next_cursor: Optional[str] = None
+
+
+def encode_cursor(offset: int) -> str:
+    """Get the cursor to the page starting at `offset`."""
+    return base64.urlsafe_b64encode(f"offset:{offset}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> int:
+    """
+    Get the offset a cursor points to, with no cursor pointing to the first page.
+
+    Raises:
+        ValueError: If the cursor is not one returned with a page
+    """
+    if not cursor:
+        return 0
+    try:
+        prefix, _, offset = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode().partition(":")
+        if prefix != "offset" or not offset.isdigit():
+            raise ValueError
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError(f"Invalid cursor {cursor!r}")
+    return int(offset)
+
+
+def page_cursor(page: int, per_page: int) -> Optional[str]:
+    """
+    Get the cursor to a numbered page, starting at 1, for the numbered pagination shown in the UI.
+
+    Cursors encode the offset of the page, so any page can be reached without walking the pages before it. This is
+    the mock PDA's cursor format, a PDA used with PDA_SERVER_SIDE_SEARCH must accept the same cursors.
+    """
+    return encode_cursor(per_page * (page - 1)) if page > 1 else None
+
+
+def page_bounds(cursor: Optional[str], limit: int) -> Tuple[int, int]:
+    """Get the start and end offsets of the page a cursor points to."""
+    if limit <= 0:
+        raise ValueError("limit must be a positive integer")
+    start = decode_cursor(cursor)
+    return start, start + limit
+
+
+def next_cursor(end: int, total: int) -> Optional[str]:
+    """Get the cursor to the page after the one ending at `end`, or None if it was the last page."""
+    return encode_cursor(end) if end < total else None
@@ -0,0 +1,121 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+import requests
+
+
+class CachedResponse:
+    """A decoded PDA response along with the validators needed to revalidate it."""
+
+    def __init__(self, etag: Optional[str], last_modified: Optional[str], payload: Any):
+        self.etag = etag
+        self.last_modified = last_modified
+        self.payload = payload
+        self.models: Any = None
+        # Digest of the body the models were validated from, only kept in trusted mode
+        self.digest: Optional[bytes] = None
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Get the headers to make a request conditional on this response having changed."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """
+    Least-recently-used cache of decoded GET responses, used to make conditional requests to the PDA.
+
+    When the PDA sends an `ETag` or `Last-Modified` header, repeat requests send `If-None-Match`/
+    `If-Modified-Since`, and a 304 Not Modified reuses the decoded payload, or the models validated from it,
+    instead of parsing and validating the body again. Responses without either header are still kept as the
+    last known good response, which is served while the PDA circuit breaker is open.
+
+    The client tags each response with `pda_cache_key` and, for conditional requests, `pda_cached_entry`
+    so a 304 can always be matched to the entry it revalidated, even if that entry has since been evicted.
+
+    In trusted mode a digest of each body is kept with the models validated from it, so a 200 response with an
+    identical body reuses those models without validating it again, for endpoints which send neither header.
+    """
+
+    def __init__(self, max_entries: int = 1000, trusted: bool = False):
+        self.max_entries = max_entries
+        self.trusted = trusted
+        self._entries: OrderedDict[str, CachedResponse] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def lookup(self, cache_key: str) -> Optional[CachedResponse]:
+        """Get the cached response for a URL, if there is one."""
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is not None:
+                self._entries.move_to_end(cache_key)
+        return entry
+
+    def get(self, response: requests.Response) -> Optional[CachedResponse]:
+        """Get the cached entry that a 304 Not Modified response revalidated."""
+        entry = getattr(response, "pda_cached_entry", None)
+        if response.status_code != 304 or not isinstance(entry, CachedResponse):
+            return None
+        return entry
+
+    def digest(self, response: requests.Response) -> Optional[bytes]:
+        """Get a digest of a 200 response's body in trusted mode, or None otherwise."""
+        if not self.trusted:
+            return None
+        return hashlib.blake2b(response.content, digest_size=16).digest()
+
+    def trusted_models(self, response: requests.Response, digest: Optional[bytes]) -> Any:
+        """Get the models already validated from a body with the same digest as this response's, if any."""
+        cache_key = getattr(response, "pda_cache_key", None)
+        if digest is None or not isinstance(cache_key, str):
+            return None
+        entry = self.lookup(cache_key)
+        if entry is None or entry.digest != digest:
+            return None
+        return entry.models
+
+    def store(
+        self, response: requests.Response, payload: Any, models: Any = None, digest: Optional[bytes] = None
+    ) -> None:
+        """Cache the decoded payload of a 200 response, or the models validated from it and the body's digest."""
+        cache_key = getattr(response, "pda_cache_key", None)
+        if not isinstance(cache_key, str):
+            return
+
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        etag = etag if isinstance(etag, str) else None
+        last_modified = last_modified if isinstance(last_modified, str) else None
+
+        with self._lock:
+            entry = self._entries[cache_key] = CachedResponse(etag, last_modified, payload)
+            entry.models = models
+            entry.digest = digest
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def replace(self, cache_key: str, models: Any) -> None:
+        """
+        Replace the models of a cached response in place, with the entity a write responded with.
+
+        The entry keeps its validators, so it is still revalidated with the PDA, which responds with the
+        updated body once the write has changed it. Its payload and digest are dropped as they are out of date.
+        """
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is not None:
+                entry.payload = None
+                entry.models = models
+                entry.digest = None
+
+    def invalidate(self, cache_key: str) -> None:
+        """Drop a cached response, e.g. a list which a write has changed."""
+        with self._lock:
+            self._entries.pop(cache_key, None)
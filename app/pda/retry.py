@@ -0,0 +1,158 @@
+import logging
+import random
+import threading
+import time
+from collections import deque
+from itertools import takewhile
+from typing import Callable, Deque, Optional
+
+from urllib3 import Retry
+from urllib3.exceptions import MaxRetryError, ResponseError
+
+from app.pda import deadline
+
+logger = logging.getLogger(__name__)
+
+
+class RetryBudget:
+    """
+    Process-wide limit on retries to the Provider Data API.
+
+    Every request made in the last `window_seconds` is counted, and retries are only allowed while they make up
+    less than `ratio` of those requests, or fewer than `min_retries` while traffic is low. Under an upstream
+    brown-out this stops every worker retrying every request, which would multiply the load on the PDA.
+    """
+
+    def __init__(
+        self,
+        ratio: float = 0.1,
+        window_seconds: float = 10.0,
+        min_retries: int = 3,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ratio = ratio
+        self.window_seconds = window_seconds
+        self.min_retries = min_retries
+        self.clock = clock
+
+        self._requests: Deque[float] = deque()
+        self._retries: Deque[float] = deque()
+        self._lock = threading.Lock()
+
+    def record_request(self) -> None:
+        """Count a request made to the PDA, which makes room in the budget for retries."""
+        with self._lock:
+            now = self.clock()
+            self._requests.append(now)
+            self._prune(now)
+
+    def try_acquire(self) -> bool:
+        """Claim a retry from the budget, returning False if the budget is used up."""
+        with self._lock:
+            now = self.clock()
+            self._prune(now)
+            if len(self._retries) >= max(self.min_retries, self.ratio * len(self._requests)):
+                return False
+            self._retries.append(now)
+            return True
+
+    def _prune(self, now: float) -> None:
+        for timestamps in (self._requests, self._retries):
+            while timestamps and now - timestamps[0] > self.window_seconds:
+                timestamps.popleft()
+
+
+class AdaptiveRetry(Retry):
+    """
+    Retry policy for the Provider Data API.
+
+    On top of urllib3's retries, which already wait for the `Retry-After` of a 429 or 503 response:
+
+    - backoff uses full jitter, waiting a random time up to the exponential backoff, so workers which failed
+      together do not retry together
+    - a request stops retrying once it has spent `max_retry_seconds` retrying, or would have to wait past that
+      or past its page's PDA time budget for its `Retry-After`
+    - each retry is claimed from a process-wide RetryBudget
+
+    When a retry is refused the last response is returned, or the last error raised, as if retries had run out.
+    """
+
+    def __init__(
+        self,
+        *args,
+        budget: Optional[RetryBudget] = None,
+        max_retry_seconds: Optional[float] = None,
+        retries_started: Optional[float] = None,
+        on_refused: Optional[Callable[[str], None]] = None,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        self.budget = budget
+        self.max_retry_seconds = max_retry_seconds
+        self.retries_started = retries_started
+        self.on_refused = on_refused
+
+    def new(self, **kw) -> "AdaptiveRetry":
+        kw.setdefault("budget", self.budget)
+        kw.setdefault("max_retry_seconds", self.max_retry_seconds)
+        kw.setdefault("retries_started", self.retries_started)
+        kw.setdefault("on_refused", self.on_refused)
+        return super().new(**kw)
+
+    def get_backoff_time(self) -> float:
+        """Get a random backoff of up to `backoff_factor * 2 ** (consecutive errors - 1)` seconds."""
+        consecutive_errors = len(list(takewhile(lambda x: x.redirect_location is None, reversed(self.history))))
+        if consecutive_errors == 0:
+            return 0
+        return random.uniform(0, min(self.backoff_max, self.backoff_factor * (2 ** (consecutive_errors - 1))))
+
+    def increment(self, method=None, url=None, response=None, error=None, _pool=None, _stacktrace=None) -> Retry:
+        new_retry = super().increment(method, url, response, error, _pool, _stacktrace)
+
+        now = time.monotonic()
+        if new_retry.retries_started is None:
+            new_retry.retries_started = now
+
+        refused = None
+        remaining = self._remaining_seconds(new_retry.retries_started, now)
+        retry_after = self.get_retry_after(response) if response is not None else None
+        if remaining is not None and (remaining <= 0 or (retry_after and retry_after > remaining)):
+            refused = "time_limit"
+        elif self.budget is not None and not self.budget.try_acquire():
+            refused = "budget"
+
+        if refused:
+            logger.warning(f"Not retrying {method} {url}, the PDA retry {refused.replace('_', ' ')} was reached")
+            if self.on_refused:
+                self.on_refused(refused)
+            raise MaxRetryError(_pool, url, error or ResponseError(f"PDA retry {refused} reached"))
+
+        return new_retry
+
+    def _remaining_seconds(self, retries_started: float, now: float) -> Optional[float]:
+        """Get the time left to retry in, the shorter of the retry time limit and the page's PDA budget."""
+        limits = []
+        if self.max_retry_seconds is not None:
+            limits.append(self.max_retry_seconds - (now - retries_started))
+        if request_deadline := deadline.get_deadline():
+            limits.append(request_deadline.remaining)
+        return min(limits) if limits else None
+
+
+def init_app(app, on_refused: Optional[Callable[[str], None]] = None) -> AdaptiveRetry:
+    """Create the retry policy, and the retry budget its retries are shared across, using the PDA_RETRY_* config."""
+    budget_defaults = RetryBudget()
+    budget = RetryBudget(
+        ratio=app.config.get("PDA_RETRY_BUDGET_RATIO", budget_defaults.ratio),
+        window_seconds=app.config.get("PDA_RETRY_BUDGET_WINDOW_SECONDS", budget_defaults.window_seconds),
+        min_retries=app.config.get("PDA_RETRY_BUDGET_MIN_RETRIES", budget_defaults.min_retries),
+    )
+    return AdaptiveRetry(
+        total=app.config.get("PDA_RETRY_TOTAL", 3),
+        backoff_factor=app.config.get("PDA_RETRY_BACKOFF_FACTOR", 0.5),
+        status_forcelist=[429, 500, 502, 503, 504],
+        raise_on_status=False,  # We'll handle status codes ourselves
+        budget=budget,
+        max_retry_seconds=app.config.get("PDA_RETRY_MAX_SECONDS", 10.0),
+        on_refused=on_refused,
+    )
@@ -0,0 +1,69 @@
+import logging
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple, Type
+
+logger = logging.getLogger(__name__)
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Coalesces identical concurrent calls, so only one is made and every caller gets its result.
+
+    The first caller for a key makes the call. Callers arriving with the same key while it is in flight wait
+    for it to finish and get the same result, or have the same exception raised. Once the call finishes the
+    key is forgotten, so later callers make a fresh call. Exceptions which only concern the caller who made
+    the call, such as it running out of time, are not shared: the waiting callers make the call again instead.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self.coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any], unshared_errors: Tuple[Type[BaseException], ...] = ()) -> Any:
+        """
+        Call `fn`, or wait for the in-flight call with the same key.
+
+        Args:
+            key: Identifies calls which would return the same result
+            fn: Makes the call
+            unshared_errors: Exceptions which are only raised to the caller who made the call
+
+        Returns:
+            The result of the call
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            logger.debug(f"Waiting for in-flight call {key}")
+            call.done.wait()
+            if isinstance(call.error, unshared_errors):
+                logger.debug(f"In-flight call {key} failed for its own caller with {call.error!r}, calling again")
+                return self.do(key, fn, unshared_errors)
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
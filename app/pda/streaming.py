@@ -0,0 +1,103 @@
+import codecs
+import json
+from typing import Any, Iterable, Iterator
+
+_WHITESPACE = " \t\n\r"
+
+
+class _JsonReader:
+    """Reads JSON values one at a time from a stream of UTF-8 encoded chunks."""
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._text_decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json_decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+
+    def _fill(self) -> bool:
+        """Read the next chunk, dropping the text already consumed. Returns False at the end of the stream."""
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            tail = self._text_decoder.decode(b"", final=True)
+            if not tail:
+                return False
+            text = tail
+        else:
+            text = self._text_decoder.decode(chunk)
+        self.buffer = self.buffer[self.pos :] + text
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Skip whitespace and return the next character without consuming it."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                raise ValueError("Unexpected end of JSON document")
+
+    def expect(self, char: str) -> None:
+        if (found := self.peek()) != char:
+            raise ValueError(f"Expected {char!r} but found {found!r}")
+        self.pos += 1
+
+    def value(self) -> Any:
+        """Decode the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = self._json_decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # A number at the end of the buffer may continue in the next chunk
+            if end == len(self.buffer) and self._fill():
+                continue
+            self.pos = end
+            return value
+
+
+def iter_json_array(chunks: Iterable[bytes], key: str) -> Iterator[Any]:
+    """
+    Incrementally decode the items of an array in a JSON object, such as `{"firms": [...]}`.
+
+    Only the current item is decoded at a time, so the whole document is never held in memory. Other members of
+    the object are decoded and discarded, and anything after the array is not read.
+
+    Args:
+        chunks: The JSON document as UTF-8 encoded chunks, e.g. from `response.iter_content()`
+        key: The member of the top-level object holding the array
+
+    Yields:
+        Each decoded item of the array, nothing if the object has no such member
+
+    Raises:
+        ValueError: If the document is not valid JSON or is not shaped as expected
+    """
+    reader = _JsonReader(chunks)
+    reader.expect("{")
+    if reader.peek() == "}":
+        return
+
+    while True:
+        name = reader.value()
+        reader.expect(":")
+        if name != key:
+            reader.value()
+        else:
+            reader.expect("[")
+            if reader.peek() == "]":
+                return
+            while True:
+                yield reader.value()
+                if reader.peek() == "]":
+                    return
+                reader.expect(",")
+
+        if reader.peek() == "}":
+            return
+        reader.expect(",")
@@ -0,0 +1,112 @@
+"""
+Benchmark for decoding PDA list responses into models, comparing `response.json()` followed by building each
+model with `Model(**item)`, the same with each installed JSON decoder, and validating the body bytes straight into
+models with pydantic.
+
+Payloads cycle through the fixtures in app/pda/fixtures, scaled up to production sizes.
+
+Run from the repository root:
+    python -m tests.benchmarks.pda_json_decode --firms 20000 --offices 40 --bank-accounts 20
+"""
+
+import argparse
+import json
+import os
+import statistics
+import time
+from typing import Callable, List
+
+from pydantic import TypeAdapter
+
+from app.models import BankAccount, Firm, Office
+from app.pda import decoding
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "app", "pda", "fixtures")
+
+
+def load_fixtures(filename: str, key: str) -> List[dict]:
+    with open(os.path.join(FIXTURES_DIR, filename)) as f:
+        items = json.load(f)[key]
+    return [{field: value for field, value in item.items() if not field.startswith("_")} for item in items]
+
+
+def scaled(fixtures: List[dict], count: int, id_fields: dict) -> List[dict]:
+    """Cycle through the fixtures to make `count` items, giving each a unique ID in every field of `id_fields`."""
+    items = []
+    for i in range(count):
+        item = dict(fixtures[i % len(fixtures)])
+        item.update({field: make_id(i + 1) for field, make_id in id_fields.items()})
+        items.append(item)
+    return items
+
+
+def run(name: str, decode: Callable[[], object], repeat: int) -> None:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        decode()
+        times.append(time.perf_counter() - start)
+    print(f"  {name:<28} median {statistics.median(times) * 1000:9.2f} ms  best {min(times) * 1000:9.2f} ms")
+
+
+def benchmark(title: str, body: bytes, model, key: str | None, adapter: TypeAdapter, repeat: int) -> None:
+    print(f"{title}: {len(body) / 1024:.0f} KiB body")
+
+    def unwrap(data):
+        return data[key] if key else data
+
+    for decoder_name, decode in decoding.DECODERS.items():
+        run(f"{decoder_name} + Model(**item)", lambda: [model(**item) for item in unwrap(decode(body))], repeat)
+    run("TypeAdapter.validate_json", lambda: unwrap(adapter.validate_json(body)), repeat)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--firms", type=int, default=20_000, help="Number of firms in /provider-firms")
+    parser.add_argument("--offices", type=int, default=40, help="Number of offices for a single firm")
+    parser.add_argument("--bank-accounts", type=int, default=20, help="Number of bank accounts for a single firm")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of times to decode each payload")
+    args = parser.parse_args()
+
+    firms = scaled(
+        load_fixtures("providers.json", "firms"),
+        args.firms,
+        {"firmId": int, "firmNumber": str, "ccmsFirmId": int, "firmName": lambda i: f"Firm {i}"},
+    )
+    offices = scaled(
+        load_fixtures("offices.json", "offices"),
+        args.offices,
+        {"firmOfficeId": int, "firmOfficeCode": lambda i: f"{i}A001L"},
+    )
+    bank_accounts = scaled(
+        load_fixtures("bank_accounts.json", "bank_accounts"), args.bank_accounts, {"bankAccountId": int}
+    )
+
+    benchmark(
+        "/provider-firms",
+        json.dumps({"firms": firms}).encode(),
+        Firm,
+        "firms",
+        decoding.FIRMS_RESPONSE,
+        args.repeat,
+    )
+    benchmark(
+        "/provider-firms/{id}/provider-offices",
+        json.dumps({"offices": offices}).encode(),
+        Office,
+        "offices",
+        decoding.OFFICES_RESPONSE,
+        args.repeat,
+    )
+    benchmark(
+        "/provider-firms/{id}/bank-account-details",
+        json.dumps(bank_accounts).encode(),
+        BankAccount,
+        None,
+        decoding.BANK_ACCOUNTS_RESPONSE,
+        args.repeat,
+    )
+
+
+if __name__ == "__main__":
+    main()
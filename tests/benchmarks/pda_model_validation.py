@@ -0,0 +1,71 @@
+"""
+Benchmark for validating PDA list payloads into models, comparing building each model with `Model(**item)`,
+validating the whole list with a cached `TypeAdapter`, and trusted mode, which reuses the models already
+validated from an identical response body.
+
+Run from the repository root:
+    python -m tests.benchmarks.pda_model_validation --firms 20000 --offices 40 --bank-accounts 20
+"""
+
+import argparse
+import json
+from unittest.mock import Mock
+
+from pydantic import TypeAdapter
+
+from app.models import BankAccount, Firm, Office
+from app.pda import decoding
+from app.pda.response_cache import ResponseCache
+from tests.benchmarks.pda_json_decode import load_fixtures, run, scaled
+
+
+def trusted(items: list, adapter: TypeAdapter):
+    """Reuse the models validated from an identical body, as ProviderDataApi does in trusted mode."""
+    body = json.dumps(items).encode()
+    response = Mock(status_code=200, content=body, headers={}, pda_cache_key="/benchmark")
+    cache = ResponseCache(trusted=True)
+    digest = cache.digest(response)
+    cache.store(response, None, models=adapter.validate_json(body), digest=digest)
+
+    def reuse():
+        return cache.trusted_models(response, cache.digest(response))
+
+    return reuse
+
+
+def benchmark(title: str, items: list, model, adapter: TypeAdapter, repeat: int) -> None:
+    print(f"{title}: {len(items)} items")
+    run("Model(**item)", lambda: [model(**item) for item in items], repeat)
+    run("TypeAdapter.validate_python", lambda: adapter.validate_python(items), repeat)
+    run("trusted", trusted(items, adapter), repeat)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--firms", type=int, default=20_000, help="Number of firms in /provider-firms")
+    parser.add_argument("--offices", type=int, default=40, help="Number of offices for a single firm")
+    parser.add_argument("--bank-accounts", type=int, default=20, help="Number of bank accounts for a single firm")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of times to validate each payload")
+    args = parser.parse_args()
+
+    firms = scaled(
+        load_fixtures("providers.json", "firms"),
+        args.firms,
+        {"firmId": int, "firmNumber": str, "ccmsFirmId": int, "firmName": lambda i: f"Firm {i}"},
+    )
+    offices = scaled(
+        load_fixtures("offices.json", "offices"),
+        args.offices,
+        {"firmOfficeId": int, "firmOfficeCode": lambda i: f"{i}A001L"},
+    )
+    bank_accounts = scaled(
+        load_fixtures("bank_accounts.json", "bank_accounts"), args.bank_accounts, {"bankAccountId": int}
+    )
+
+    benchmark("Firms", firms, Firm, decoding.FIRMS, args.repeat)
+    benchmark("Offices", offices, Office, decoding.OFFICES, args.repeat)
+    benchmark("Bank accounts", bank_accounts, BankAccount, decoding.BANK_ACCOUNTS, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Memory benchmark for decoding the /provider-firms list, comparing `response.json()` and building every Firm with
+streaming the firms one at a time from the response.
+
+Run from the repository root:
+    python -m tests.benchmarks.provider_firms_memory --firms 100000
+"""
+
+import argparse
+import json
+import os
+import time
+import tracemalloc
+from typing import Callable, Iterator
+
+from app.models import Firm
+from app.pda.streaming import iter_json_array
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "app", "pda", "fixtures")
+CHUNK_SIZE = 64 * 1024
+
+
+def synthetic_firms_payload(count: int) -> bytes:
+    """Build a /provider-firms response body with `count` firms, cycling through the fixture firms."""
+    with open(os.path.join(FIXTURES_DIR, "providers.json")) as f:
+        fixture_firms = json.load(f)["firms"]
+
+    firms = []
+    for i in range(count):
+        firm = {key: value for key, value in fixture_firms[i % len(fixture_firms)].items() if not key.startswith("_")}
+        firm.update({"firmId": i + 1, "firmNumber": str(i + 1), "ccmsFirmId": i + 1, "firmName": f"Firm {i + 1}"})
+        firms.append(firm)
+    return json.dumps({"firms": firms}).encode()
+
+
+def chunks(body: bytes) -> Iterator[bytes]:
+    """Yield the body in the chunk size the client reads from the socket."""
+    for start in range(0, len(body), CHUNK_SIZE):
+        yield body[start : start + CHUNK_SIZE]
+
+
+def eager(body: bytes) -> int:
+    firms = [Firm(**firm_data) for firm_data in json.loads(body)["firms"]]
+    return sum(1 for firm in firms if firm.firm_type == "Chambers")
+
+
+def streaming(body: bytes) -> int:
+    return sum(1 for firm_data in iter_json_array(chunks(body), "firms") if Firm(**firm_data).firm_type == "Chambers")
+
+
+def measure(name: str, decode: Callable[[bytes], int], body: bytes) -> None:
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = decode(body)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:<10} peak {peak / 1024 / 1024:8.1f} MiB  time {elapsed:6.2f}s  (chambers: {result})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--firms", type=int, default=100_000, help="Number of firms in the synthetic payload")
+    args = parser.parse_args()
+
+    body = synthetic_firms_payload(args.firms)
+    print(f"{args.firms} firms, {len(body) / 1024 / 1024:.1f} MiB body (not included in the peaks below)")
+    measure("eager", eager, body)
+    measure("streaming", streaming, body)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 import pytest
+from flask import g, request_finished
 
 from tests.conftest import MockProviderDataApi, TestConfig, create_app
 
@@ -10,3 +11,20 @@ def app(config=TestConfig):
     app = create_app(config, MockProviderDataApi)
     with app.app_context():
         yield app
+
+
+@pytest.fixture
+def pda_calls(app):
+    """
+    The PDA calls made by each request during the test, one list per request.
+
+    Use with tests.unit_tests.utils.assert_max_pda_calls to pin the number of PDA calls a route makes.
+    """
+    calls = []
+
+    def record(sender, response, **extra):
+        calls.append(list(g.get("pda_calls", [])))
+
+    request_finished.connect(record, app)
+    yield calls
+    request_finished.disconnect(record, app)
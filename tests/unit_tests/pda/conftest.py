@@ -0,0 +1,42 @@
+from unittest.mock import Mock
+
+import pytest
+
+from app.pda.api import ProviderDataApi
+from app.pda.mock_adapter import MockPDAAdapter
+from app.pda.mock_api import MockProviderDataApi
+
+BASE_URL = "http://mock-pda.test"
+
+
+@pytest.fixture
+def pda_config():
+    """The config of the app api_client is initialised with, override it to configure the client."""
+    return {}
+
+
+@pytest.fixture
+def pda_app(pda_config):
+    app = Mock()
+    app.extensions = {}
+    app.config = pda_config
+    return app
+
+
+@pytest.fixture
+def mock_api():
+    return MockProviderDataApi()
+
+
+@pytest.fixture
+def adapter(mock_api):
+    return MockPDAAdapter(mock_api)
+
+
+@pytest.fixture
+def api_client(pda_app, adapter):
+    """A real PDA client, whose requests to BASE_URL are served by mock_api without a server."""
+    client = ProviderDataApi()
+    client.init_app(pda_app, base_url=BASE_URL, api_key="test-key")
+    client.session.mount(BASE_URL, adapter)
+    return client
@@ -1,10 +1,12 @@
-from unittest.mock import Mock
+import json
+from unittest.mock import Mock, patch
 
 import pytest
 import requests
 
 from app.models import Firm, Office
 from app.pda.api import PDAConnectionError, PDAError, ProviderDataApi
+from app.pda.errors import ProviderDataApiError
 
 
 class TestProviderDataApi:
@@ -16,6 +18,7 @@ class TestProviderDataApi:
     def mock_app(self):
         app = Mock()
         app.extensions = {}
+        app.config = {}
         return app
 
     @pytest.fixture
@@ -60,6 +63,7 @@ class TestProviderDataApi:
 
     def test_make_request_success(self, initialized_client):
         mock_response = Mock()
+        mock_response.status_code = 200
         initialized_client.session.request = Mock(return_value=mock_response)
 
         result = initialized_client._make_request("GET", "/test")
@@ -75,7 +79,7 @@ class TestProviderDataApi:
     def test_handle_response_200(self, initialized_client):
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {"key": "value"}
+        mock_response.content = b'{"key": "value"}'
 
         result = initialized_client._handle_response(mock_response, {})
 
@@ -106,12 +110,11 @@ class TestProviderDataApi:
             initialized_client._handle_response(mock_response, {})
 
     def test_get_provider_firm_success(self, initialized_client):
-        initialized_client.get = Mock(return_value=Mock(status_code=200))
         mock_firm = {
             "firmId": 123,
             "constitutionalStatus": "Charity",
         }
-        initialized_client._handle_response = Mock(return_value={"firm": mock_firm})
+        initialized_client.get = Mock(return_value=Mock(status_code=200, content=json.dumps({"firm": mock_firm})))
 
         result = initialized_client.get_provider_firm(123)
 
@@ -123,12 +126,11 @@ class TestProviderDataApi:
             initialized_client.get_provider_firm(-1)
 
     def test_get_all_provider_firms(self, initialized_client):
-        initialized_client.get = Mock(return_value=Mock(status_code=200))
         mock_firm = {
             "firmId": 123,
             "constitutionalStatus": "Charity",
         }
-        initialized_client._handle_response = Mock(return_value={"firms": [mock_firm]})
+        initialized_client.get = Mock(return_value=Mock(status_code=200, content=json.dumps({"firms": [mock_firm]})))
 
         result = initialized_client.get_all_provider_firms()
 
@@ -136,8 +138,7 @@ class TestProviderDataApi:
         assert result == [Firm(**mock_firm)]
 
     def test_get_provider_office_success(self, initialized_client):
-        initialized_client.get = Mock(return_value=Mock(status_code=200))
-        initialized_client._handle_response = Mock(return_value={"firm_office_code": "1A234B"})
+        initialized_client.get = Mock(return_value=Mock(status_code=200, content=b'{"firm_office_code": "1A234B"}'))
 
         result = initialized_client.get_provider_office("1A234B")
 
@@ -149,8 +150,9 @@ class TestProviderDataApi:
             initialized_client.get_provider_office("")
 
     def test_get_provider_offices(self, initialized_client):
-        initialized_client.get = Mock(return_value=Mock(status_code=200))
-        initialized_client._handle_response = Mock(return_value={"offices": [{"firm_office_code": "1A234B"}]})
+        initialized_client.get = Mock(
+            return_value=Mock(status_code=200, content=b'{"offices": [{"firm_office_code": "1A234B"}]}')
+        )
 
         result = initialized_client.get_provider_offices(123)
 
@@ -187,8 +189,7 @@ class TestProviderDataApi:
         assert result == {"scheduleId": "456"}
 
     def test_get_office_bank_details(self, initialized_client):
-        initialized_client.get = Mock(return_value=Mock(status_code=200))
-        initialized_client._handle_response = Mock(return_value=[{"accountNumber": "12345678"}])
+        initialized_client.get = Mock(return_value=Mock(status_code=200, content=b'[{"accountNumber": "12345678"}]'))
 
         banks_accounts = initialized_client.get_office_bank_accounts(123, "1A234B")
 
@@ -197,3 +198,120 @@ class TestProviderDataApi:
         )
         assert len(banks_accounts) == 1
         assert banks_accounts[0].account_number == "12345678"
+
+    @pytest.mark.parametrize("content", [b"not json", b'[{"accountNumber": 1, "unknown": "field"}]'])
+    def test_invalid_bank_accounts(self, initialized_client, content):
+        initialized_client.get = Mock(return_value=Mock(status_code=200, content=content))
+
+        with pytest.raises(PDAError, match="Invalid bank account data"):
+            initialized_client.get_office_bank_accounts(123, "1A234B")
+        with pytest.raises(PDAError, match="Invalid bank account data"):
+            initialized_client.get_provider_firm_bank_details(123)
+
+    def test_get_bank_details(self, initialized_client):
+        initialized_client.get = Mock(return_value=Mock(status_code=200, content=b'{"accountNumber": "12345678"}'))
+
+        bank_account = initialized_client.get_bank_details(123, "456")
+
+        initialized_client.get.assert_called_once_with("/provider-firms/123/bank-details/456")
+        assert bank_account.account_number == "12345678"
+
+    def test_get_bank_details_not_found(self, initialized_client):
+        initialized_client.get = Mock(return_value=Mock(status_code=404))
+
+        assert initialized_client.get_bank_details(123, "456") is None
+
+    def test_invalid_bank_details(self, initialized_client):
+        initialized_client.get = Mock(return_value=Mock(status_code=200, content=b"not json"))
+
+        with pytest.raises(PDAError, match="Invalid bank account data"):
+            initialized_client.get_bank_details(123, "456")
+
+
+class TestGetHeadOffices:
+    def test_matches_get_head_office(self, api_client, mock_api):
+        firm_ids = [firm.firm_id for firm in mock_api.get_all_provider_firms()[:10]]
+
+        head_offices = api_client.get_head_offices(firm_ids)
+
+        assert list(head_offices) == firm_ids
+        assert head_offices == {firm_id: mock_api.get_head_office(firm_id) for firm_id in firm_ids}
+
+    def test_firm_without_offices(self, api_client):
+        assert api_client.get_head_offices([999999]) == {999999: None}
+
+    def test_no_firms(self, api_client):
+        assert api_client.get_head_offices([]) == {}
+
+
+class TestPatchOffices:
+    def test_patches_every_office(self, api_client, mock_api):
+        office_codes = [office.firm_office_code for office in mock_api.get_provider_offices(1)]
+
+        results = api_client.patch_offices(1, {code: {"contractManager": "Alice Johnson"} for code in office_codes})
+
+        assert list(results) == office_codes
+        assert all(office.contract_manager == "Alice Johnson" for office in mock_api.get_provider_offices(1))
+
+    def test_failures_do_not_stop_other_offices(self, api_client):
+        error = ProviderDataApiError("HTTP error")
+
+        def patch_office(firm_id, office_code, fields_to_update):
+            if office_code == "1A002L":
+                raise error
+            return {"firmOfficeCode": office_code}
+
+        with patch.object(api_client, "patch_office", side_effect=patch_office):
+            results = api_client.patch_offices(1, {"1A001L": {}, "1A002L": {}, "1A003L": {}})
+
+        assert results == {
+            "1A001L": {"firmOfficeCode": "1A001L"},
+            "1A002L": error,
+            "1A003L": {"firmOfficeCode": "1A003L"},
+        }
+
+    def test_no_offices(self, api_client):
+        assert api_client.patch_offices(1, {}) == {}
+
+
+class TestPatchResponses:
+    @pytest.fixture
+    def patch_body(self, adapter):
+        """Make the PDA respond to PATCHes with another body, after making the change."""
+        send = adapter.send
+
+        def set_patch_body(body: bytes):
+            def sending(request, **kwargs):
+                response = send(request, **kwargs)
+                if request.method == "PATCH":
+                    response._content = body
+                return response
+
+            adapter.send = sending
+
+        return set_patch_body
+
+    @pytest.mark.parametrize("body", [b"{}", b'{"status": "updated"}', b'{"firmOfficeCode": "2B001L"}'])
+    def test_patch_office_reads_the_office_unless_the_pda_responds_with_it(self, api_client, patch_body, body):
+        api_client.get_provider_office("1A001L")
+        patch_body(body)
+
+        office = api_client.patch_office(1, "1A001L", {"contractManager": "Alice Johnson"})
+
+        assert office.firm_office_code == "1A001L"
+        assert office.contract_manager == "Alice Johnson"
+        assert api_client.get_provider_office("1A001L") == office
+
+    @pytest.mark.parametrize("body", [b"{}", b'{"status": "updated"}', b'{"firmId": 2}'])
+    def test_patch_provider_reads_the_firm_unless_the_pda_responds_with_it(self, api_client, patch_body, body):
+        api_client.get_provider_firm(1)
+        patch_body(body)
+
+        firm = api_client.patch_provider(1, {"firmName": "Renamed Firm"})
+
+        assert firm.firm_id == 1
+        assert firm.firm_name == "Renamed Firm"
+        assert api_client.get_provider_firm(1) == firm
+
+    def test_patch_office_not_found(self, api_client):
+        assert api_client.patch_office(1, "9Z999Z", {"contractManager": "Alice Johnson"}) is None
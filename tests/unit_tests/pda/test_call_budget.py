@@ -0,0 +1,143 @@
+from unittest.mock import Mock
+
+import pytest
+from flask import g
+from structlog.testing import capture_logs
+
+from app.pda import call_budget
+from tests.unit_tests.pda.conftest import BASE_URL
+from tests.unit_tests.utils import assert_max_pda_calls
+
+
+class TestMockCallCounting:
+    @pytest.fixture
+    def pda(self, app):
+        return app.extensions["pda"]
+
+    def test_records_public_calls(self, app, pda):
+        with app.test_request_context():
+            pda.get_provider_firm(1)
+            pda.get_provider_offices(1)
+
+            assert [call.target for call in g.pda_calls] == ["get_provider_firm(1)", "get_provider_offices(1)"]
+
+    def test_nested_calls_are_not_recorded(self, app, pda):
+        with app.test_request_context():
+            # Reads the firm's offices itself
+            pda.get_head_office(1)
+
+            assert [call.endpoint for call in g.pda_calls] == ["get_head_office"]
+
+    def test_identity_map_hits_are_not_recorded(self, app, pda):
+        with app.test_request_context():
+            pda.get_head_offices([1, 2])
+            pda.get_head_office(1)
+            pda.get_head_office(2)
+
+            assert [call.endpoint for call in g.pda_calls] == ["get_head_offices"]
+
+    def test_records_call_site(self, app, pda):
+        with app.test_request_context():
+            pda.get_all_provider_firms()
+
+            # Calls from outside the app have no application call site
+            assert g.pda_calls[0].call_site == "unknown"
+
+    def test_not_recorded_outside_a_request(self, pda):
+        assert pda.get_provider_firm(1)
+
+    def test_url_converter_calls_are_recorded(self, client, pda_calls):
+        client.get("/provider/1/office/1A001L")
+
+        assert [call.call_site.split(":")[0] for call in pda_calls[-1]][:2] == ["app/utils/converters.py"] * 2
+
+
+class TestProviderDataApiCallCounting:
+    def test_records_http_requests(self, app, api_client):
+        with app.test_request_context():
+            api_client.get_head_office(1)
+
+            assert [(call.method, call.endpoint, call.target) for call in g.pda_calls] == [
+                ("GET", "/provider-firms/{firmId}/provider-offices", f"{BASE_URL}/provider-firms/1/provider-offices")
+            ]
+
+    def test_fan_out_records_every_request(self, app, api_client):
+        with app.test_request_context():
+            api_client.get_head_offices([1, 2, 3])
+
+            assert len(g.pda_calls) == 3
+
+
+class TestCheckCallBudget:
+    def check(self, app, calls, **config):
+        app.config.update(config)
+        with app.test_request_context("/status"), capture_logs() as logs:
+            g.pda_calls = calls
+            call_budget.check_call_budget(Mock())
+        return logs
+
+    def test_within_budget(self, app):
+        calls = [call_budget.PDACall("GET", "/provider-firms/{firmId}", f"/provider-firms/{i}", "x") for i in range(3)]
+
+        assert self.check(app, calls, PDA_CALL_BUDGET=3) == []
+
+    def test_over_budget(self, app):
+        calls = [call_budget.PDACall("GET", "/provider-firms/{firmId}", f"/provider-firms/{i}", "x") for i in range(4)]
+
+        logs = self.check(app, calls, PDA_CALL_BUDGET=3)
+
+        assert logs[0]["event"] == "PDA call budget exceeded"
+        assert logs[0]["calls"] == 4
+        assert logs[0]["by_endpoint"] == {"GET /provider-firms/{firmId}": 4}
+
+    def test_route_budget_overrides_default(self, app):
+        calls = [call_budget.PDACall("GET", "/provider-firms/{firmId}", f"/provider-firms/{i}", "x") for i in range(2)]
+
+        logs = self.check(app, calls, PDA_CALL_BUDGET=20, PDA_CALL_BUDGETS={"main.status": 1})
+
+        assert logs[0]["event"] == "PDA call budget exceeded"
+
+    def test_repeated_call(self, app):
+        call = call_budget.PDACall("GET", "/provider-firms/{firmId}", "/provider-firms/1", "app/main/views.py:1")
+
+        logs = self.check(app, [call, call], PDA_CALL_BUDGET=20)
+
+        assert logs[0]["event"] == "Repeated PDA call"
+        assert logs[0]["call_sites"] == ["app/main/views.py:1", "app/main/views.py:1"]
+
+
+class TestRouteCallBudgets:
+    def test_view_provider(self, client, pda_calls):
+        response = client.get("/provider/1")
+
+        assert response.status_code == 200
+        # The firm read by the URL converter, the head office, then its contacts
+        assert_max_pda_calls(pda_calls, 3)
+
+    def test_view_provider_offices(self, client, pda_calls):
+        response = client.get("/provider/1/offices")
+
+        assert response.status_code == 200
+        # The firm read by the URL converter, then the head office. The firm's offices, which the head office was
+        # found in, are served from the identity map
+        assert_max_pda_calls(pda_calls, 2)
+
+    def test_view_office(self, client, pda_calls):
+        response = client.get("/provider/1/office/1A001L")
+
+        assert response.status_code == 200
+        # The firm and the office, both read by the URL converters
+        assert_max_pda_calls(pda_calls, 2)
+
+    def test_provider_list_shows_all_providers(self, client, pda_calls):
+        response = client.get("/providers?search=")
+
+        assert response.status_code == 200
+        # The firm list, then the head offices for every row on the page in one call
+        assert_max_pda_calls(pda_calls, 2)
+
+    def test_provider_list_search(self, client, pda_calls):
+        response = client.get("/providers?search=Smith")
+
+        assert response.status_code == 200
+        assert_max_pda_calls(pda_calls, 2)
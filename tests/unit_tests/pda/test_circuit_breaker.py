@@ -0,0 +1,193 @@
+import threading
+from unittest.mock import Mock
+
+import pytest
+import requests
+from flask import g
+
+from app.pda.api import PDACircuitOpenError, PDAError
+from app.pda.circuit_breaker import CircuitBreaker
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestCircuitBreaker:
+    @pytest.fixture
+    def clock(self):
+        return FakeClock()
+
+    @pytest.fixture
+    def breaker(self, clock):
+        return CircuitBreaker(
+            failure_rate_threshold=0.5,
+            slow_call_seconds=1,
+            min_calls=4,
+            window_seconds=60,
+            open_seconds=30,
+            clock=clock,
+        )
+
+    def test_stays_closed_below_min_calls(self, breaker):
+        for _ in range(3):
+            breaker.record_failure()
+
+        assert breaker.state == CircuitBreaker.CLOSED
+        assert breaker.allow_request()
+
+    def test_opens_at_failure_rate(self, breaker):
+        breaker.record_success(0.1)
+        breaker.record_success(0.1)
+        breaker.record_failure()
+        breaker.record_failure()
+
+        assert breaker.state == CircuitBreaker.OPEN
+        assert not breaker.allow_request()
+
+    def test_slow_calls_count_as_failures(self, breaker):
+        for _ in range(4):
+            breaker.record_success(2)
+
+        assert breaker.state == CircuitBreaker.OPEN
+
+    def test_old_outcomes_leave_the_window(self, breaker, clock):
+        breaker.record_failure()
+        breaker.record_failure()
+        clock.now = 61
+        breaker.record_success(0.1)
+        breaker.record_success(0.1)
+
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_half_open_allows_a_single_probe(self, breaker, clock):
+        for _ in range(4):
+            breaker.record_failure()
+        clock.now = 30
+
+        assert breaker.allow_request()
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert not breaker.allow_request()
+
+    def test_successful_probe_closes(self, breaker, clock):
+        for _ in range(4):
+            breaker.record_failure()
+        clock.now = 30
+        breaker.allow_request()
+
+        breaker.record_success(0.1)
+
+        assert breaker.state == CircuitBreaker.CLOSED
+        assert breaker.allow_request()
+
+    def test_failed_probe_reopens(self, breaker, clock):
+        for _ in range(4):
+            breaker.record_failure()
+        clock.now = 30
+        breaker.allow_request()
+
+        breaker.record_failure()
+
+        assert breaker.state == CircuitBreaker.OPEN
+        clock.now = 59
+        assert not breaker.allow_request()
+        clock.now = 60
+        assert breaker.allow_request()
+
+    def test_released_probe_lets_the_next_request_probe(self, breaker, clock):
+        for _ in range(4):
+            breaker.record_failure()
+        clock.now = 30
+        breaker.allow_request()
+
+        breaker.release_probe()
+
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert breaker.allow_request()
+
+    def test_probe_is_only_released_by_its_thread(self, breaker, clock):
+        for _ in range(4):
+            breaker.record_failure()
+        clock.now = 30
+        breaker.allow_request()
+
+        thread = threading.Thread(target=breaker.release_probe)
+        thread.start()
+        thread.join()
+
+        assert not breaker.allow_request()
+
+
+class TestProviderDataApiCircuitBreaker:
+    @pytest.fixture
+    def pda_config(self):
+        return {"PDA_CIRCUIT_MIN_CALLS": 1, "PDA_CIRCUIT_OPEN_SECONDS": 30}
+
+    def break_pda(self, api_client):
+        api_client.session.request = Mock(side_effect=requests.ConnectionError("PDA unavailable"))
+        with pytest.raises(PDAError):
+            api_client.get("/provider-firms/999")
+
+    def test_failures_open_the_circuit(self, api_client):
+        self.break_pda(api_client)
+
+        assert api_client.circuit_breaker.state == CircuitBreaker.OPEN
+
+    def test_server_errors_open_the_circuit(self, api_client):
+        api_client.session.request = Mock(return_value=Mock(status_code=503))
+
+        api_client.get("/provider-firms")
+
+        assert api_client.circuit_breaker.state == CircuitBreaker.OPEN
+
+    def test_reads_served_from_last_known_good_response(self, app, api_client):
+        firm = api_client.get_provider_firm(1)
+        self.break_pda(api_client)
+        g.pop("pda_identity_map")  # A later request
+
+        assert api_client.get_provider_firm(1) == firm
+        assert api_client.session.request.call_count == 1
+        assert g.pda_serving_stale_data
+
+    def test_reads_without_cached_response_fail_fast(self, api_client):
+        self.break_pda(api_client)
+
+        with pytest.raises(PDACircuitOpenError):
+            api_client.get_provider_firm(2)
+        assert api_client.session.request.call_count == 1
+
+    def test_probe_raising_its_own_error_is_released(self, api_client):
+        self.break_pda(api_client)
+        api_client.circuit_breaker.open_seconds = 0
+        api_client.session.request = Mock(side_effect=ValueError("Invalid request"))
+
+        with pytest.raises(ValueError):
+            api_client.get("/provider-firms/1")
+
+        assert api_client.circuit_breaker.state == CircuitBreaker.HALF_OPEN
+        assert api_client.circuit_breaker.allow_request()
+
+    def test_writes_fail_fast(self, api_client):
+        self.break_pda(api_client)
+
+        with pytest.raises(PDACircuitOpenError):
+            api_client.patch("/provider-firms/1", json={"firmName": "Renamed Firm"})
+        assert api_client.session.request.call_count == 1
+
+
+class TestStaleDataBanner:
+    def test_banner_shown_for_stale_data(self, app):
+        g.pda_serving_stale_data = True
+
+        response = app.test_client().get("/")
+
+        assert b"This page shows the last saved data" in response.data
+
+    def test_no_banner_for_live_data(self, app):
+        response = app.test_client().get("/")
+
+        assert b"This page shows the last saved data" not in response.data
@@ -0,0 +1,134 @@
+import asyncio
+import threading
+from functools import partial
+
+import pytest
+from flask import g
+
+from app.pda.concurrency import run_concurrently
+from app.pda.mock_api import MockProviderDataApi
+
+
+class TestRunConcurrently:
+    @pytest.fixture
+    def pda(self):
+        return MockProviderDataApi()
+
+    def test_results_match_sequential_calls(self, pda):
+        results = run_concurrently(
+            {
+                "firm": partial(pda.get_provider_firm, 1),
+                "head_office": partial(pda.get_head_office, 1),
+                "offices": partial(pda.get_provider_offices, 1),
+            }
+        )
+
+        assert results["firm"] == pda.get_provider_firm(1)
+        assert results["head_office"] == pda.get_head_office(1)
+        assert results["offices"] == pda.get_provider_offices(1)
+
+    def test_calls_run_concurrently(self):
+        # Each call waits for the other, so this would time out if they ran one after another
+        barrier = threading.Barrier(2, timeout=5)
+
+        def get_provider_firm(firm_id):
+            barrier.wait()
+            return firm_id
+
+        results = run_concurrently({1: partial(get_provider_firm, 1), 2: partial(get_provider_firm, 2)})
+
+        assert results == {1: 1, 2: 2}
+
+    def test_max_concurrency(self):
+        in_flight = 0
+        most_in_flight = 0
+        lock = threading.Lock()
+
+        def call():
+            nonlocal in_flight, most_in_flight
+            with lock:
+                in_flight += 1
+                most_in_flight = max(most_in_flight, in_flight)
+            threading.Event().wait(0.01)
+            with lock:
+                in_flight -= 1
+
+        run_concurrently({i: call for i in range(8)}, max_concurrency=2)
+
+        assert most_in_flight == 2
+
+    def test_max_concurrency_defaults_to_app_config(self, app):
+        app.config["PDA_MAX_CONCURRENCY"] = 1
+        threads = set()
+
+        def call():
+            threads.add(threading.get_ident())
+
+        run_concurrently({i: call for i in range(4)})
+
+        assert len(threads) == 1
+
+    def test_app_executor_is_shared_by_fan_outs(self, app):
+        app.config["PDA_MAX_CONCURRENCY"] = 2
+        threads = set()
+
+        def call():
+            threads.add(threading.current_thread())
+            threading.Event().wait(0.01)
+
+        for _ in range(10):
+            run_concurrently({i: call for i in range(4)})
+
+        # The same worker threads served every fan-out, and are kept for the next one
+        assert len(threads) <= 2
+        assert all(thread.is_alive() for thread in threads)
+
+    def test_nested_fan_out_runs_on_the_calling_thread(self, app):
+        def inner():
+            return threading.get_ident()
+
+        def outer():
+            return threading.get_ident(), run_concurrently({i: inner for i in range(4)})
+
+        results = run_concurrently({i: outer for i in range(app.extensions["pda_executor"]._max_workers * 2)})
+
+        assert all(set(inner_threads.values()) == {thread} for thread, inner_threads in results.values())
+
+    def test_exceptions_are_raised(self):
+        def get_provider_firm(firm_id):
+            raise ValueError("PDA error")
+
+        with pytest.raises(ValueError, match="PDA error"):
+            run_concurrently({"firm": partial(get_provider_firm, 1)})
+
+    def test_exceptions_can_be_returned(self):
+        error = ValueError("PDA error")
+
+        def get_provider_firm(firm_id):
+            if firm_id == 2:
+                raise error
+            return firm_id
+
+        results = run_concurrently(
+            {1: partial(get_provider_firm, 1), 2: partial(get_provider_firm, 2)}, return_exceptions=True
+        )
+
+        assert results == {1: 1, 2: error}
+
+    def test_calls_share_the_request_identity_map(self, app):
+        pda = app.extensions["pda"]
+
+        results = run_concurrently({"head_office": partial(pda.get_head_office, 1)})
+
+        # get_head_office also fetched the firm's offices, which are now in this request's identity map
+        assert pda.get_provider_offices(1)[0] == results["head_office"]
+        assert g.pda_identity_map.saved_calls == 1
+
+    def test_can_be_called_from_a_running_event_loop(self, pda):
+        async def main():
+            return run_concurrently({"firm": partial(pda.get_provider_firm, 1)})
+
+        assert asyncio.run(main()) == {"firm": pda.get_provider_firm(1)}
+
+    def test_no_calls(self):
+        assert run_concurrently({}) == {}
@@ -0,0 +1,163 @@
+from unittest.mock import Mock, patch
+
+import pytest
+import requests
+
+from app.pda import decoding
+from app.pda.api import ProviderDataApi
+from app.pda.mock_adapter import MockPDAAdapter
+from app.pda.mock_api import MockProviderDataApi
+from tests.unit_tests.pda.conftest import BASE_URL
+
+
+class TestConditionalRequests:
+    @pytest.fixture
+    def responses(self, adapter):
+        """Record every response sent by the adapter."""
+        responses = []
+        send = adapter.send
+
+        def recording_send(request, **kwargs):
+            response = send(request, **kwargs)
+            responses.append(response)
+            return response
+
+        adapter.send = recording_send
+        return responses
+
+    def test_first_request_is_unconditional(self, api_client, responses):
+        api_client.get_all_provider_firms()
+
+        assert "If-None-Match" not in responses[0].request.headers
+        assert responses[0].status_code == 200
+
+    def test_repeat_request_sends_etag(self, api_client, responses):
+        api_client.get_all_provider_firms()
+        api_client.get_all_provider_firms()
+
+        assert responses[1].request.headers["If-None-Match"] == responses[0].headers["ETag"]
+        assert responses[1].status_code == 304
+
+    def test_not_modified_reuses_validated_models(self, api_client):
+        first = api_client.get_all_provider_firms()
+
+        adapter = Mock(
+            validate_json=Mock(side_effect=AssertionError("Firms should not be re-validated")),
+            validate_python=Mock(side_effect=AssertionError("Firms should not be re-validated")),
+        )
+        with patch("app.pda.decoding.FIRMS_RESPONSE", adapter):
+            second = api_client.get_all_provider_firms()
+
+        assert second == first
+
+    def test_not_modified_single_entity(self, api_client):
+        first = api_client.get_provider_firm(1)
+
+        second = api_client.get_provider_firm(1)
+
+        assert second is first
+
+    def test_modified_entity_is_fetched_again(self, api_client, mock_api):
+        api_client.get_provider_firm(1)
+
+        mock_api.update_provider_firm_name(1, "Renamed Firm")
+        firm = api_client.get_provider_firm(1)
+
+        assert firm.firm_name == "Renamed Firm"
+
+    def test_not_found(self, api_client):
+        assert api_client.get_provider_firm(999999) is None
+
+    def test_patch_provider_uses_the_patch_response(self, api_client, responses):
+        api_client.get_provider_firm(1)
+
+        firm = api_client.patch_provider(1, {"firmName": "Renamed Firm"})
+
+        assert firm.firm_name == "Renamed Firm"
+        assert [response.request.method for response in responses] == ["GET", "PATCH"]
+        assert api_client.response_cache.lookup(f"{BASE_URL}/provider-firms/1").models is firm
+
+    def test_patch_office_uses_the_patch_response(self, api_client, responses, mock_api):
+        office_code = mock_api.get_head_office(1).firm_office_code
+        api_client.get_provider_office(office_code)
+
+        office = api_client.patch_office(1, office_code, {"contractManager": "Alice Johnson"})
+
+        assert office.contract_manager == "Alice Johnson"
+        assert [response.request.method for response in responses] == ["GET", "PATCH"]
+        assert api_client.response_cache.lookup(f"{BASE_URL}/provider-offices/{office_code}").models is office
+
+    def test_replaced_entry_is_revalidated(self, api_client, responses):
+        api_client.get_provider_firm(1)
+        api_client.patch_provider(1, {"firmName": "Renamed Firm"})
+
+        firm = api_client.get_provider_firm(1)
+
+        assert firm.firm_name == "Renamed Firm"
+        assert responses[-1].request.headers["If-None-Match"] == responses[0].headers["ETag"]
+
+
+class TestTrustedResponses:
+    body = b'{"firms": [{"firmId": 1, "firmName": "Firm 1"}]}'
+    not_validated = Mock(validate_json=Mock(side_effect=AssertionError("Firms should not be re-validated")))
+
+    @pytest.fixture
+    def pda_config(self):
+        return {"PDA_TRUST_UNCHANGED_RESPONSES": True}
+
+    @staticmethod
+    def response(body: bytes):
+        cache_key = f"{BASE_URL}/provider-firms"
+        return Mock(status_code=200, content=body, headers={}, url=cache_key, pda_cache_key=cache_key)
+
+    def test_identical_body_reuses_models(self, api_client):
+        first = api_client._handle_model_response(self.response(self.body), decoding.FIRMS_RESPONSE, [], "firms")
+
+        second = api_client._handle_model_response(self.response(self.body), self.not_validated, [], "firms")
+
+        assert second == first
+        assert second[0] is first[0]
+
+    def test_changed_body_is_validated(self, api_client):
+        api_client._handle_model_response(self.response(self.body), decoding.FIRMS_RESPONSE, [], "firms")
+
+        changed = self.body.replace(b"Firm 1", b"Renamed Firm")
+        firms = api_client._handle_model_response(self.response(changed), decoding.FIRMS_RESPONSE, [], "firms")
+
+        assert firms[0].firm_name == "Renamed Firm"
+
+    def test_not_trusted_by_default(self):
+        assert ProviderDataApi().response_cache.trusted is False
+
+    def test_validated_again_when_not_trusted(self, api_client):
+        api_client.response_cache.trusted = False
+        api_client._handle_model_response(self.response(self.body), decoding.FIRMS_RESPONSE, [], "firms")
+
+        with pytest.raises(AssertionError, match="should not be re-validated"):
+            api_client._handle_model_response(self.response(self.body), self.not_validated, [], "firms")
+
+
+class TestMockPDAAdapter:
+    @pytest.fixture
+    def session(self):
+        session = requests.Session()
+        session.mount(BASE_URL, MockPDAAdapter(MockProviderDataApi()))
+        return session
+
+    def test_emits_etag(self, session):
+        response = session.get(f"{BASE_URL}/provider-firms/1")
+
+        assert response.status_code == 200
+        assert response.headers["ETag"]
+        assert response.json()["firm"]["firmId"] == 1
+
+    def test_honours_if_none_match(self, session):
+        etag = session.get(f"{BASE_URL}/provider-firms/1").headers["ETag"]
+
+        response = session.get(f"{BASE_URL}/provider-firms/1", headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+        assert response.content == b""
+
+    def test_unknown_path(self, session):
+        assert session.get(f"{BASE_URL}/unknown").status_code == 404
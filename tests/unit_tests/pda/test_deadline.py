@@ -0,0 +1,117 @@
+from unittest.mock import Mock
+
+import pytest
+import requests
+from flask import g
+
+from app.pda.api import PDADeadlineExceededError, PDAError
+from app.pda.deadline import RequestDeadline, get_deadline
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestRequestDeadline:
+    def test_remaining_draws_down(self):
+        clock = FakeClock()
+        request_deadline = RequestDeadline(10, clock=clock)
+
+        clock.now = 4
+
+        assert request_deadline.elapsed == 4
+        assert request_deadline.remaining == 6
+        assert not request_deadline.expired
+
+    def test_expired(self):
+        clock = FakeClock()
+        request_deadline = RequestDeadline(10, clock=clock)
+
+        clock.now = 10
+
+        assert request_deadline.expired
+
+    def test_get_deadline_uses_budget_from_config(self, app):
+        app.config["PDA_REQUEST_BUDGET_SECONDS"] = 7
+        g.pop("pda_deadline", None)
+
+        assert get_deadline().budget == 7
+        assert get_deadline() is g.pda_deadline
+
+    def test_get_deadline_disabled(self, app):
+        app.config["PDA_REQUEST_BUDGET_SECONDS"] = 0
+        g.pop("pda_deadline", None)
+
+        assert get_deadline() is None
+
+
+@pytest.mark.usefixtures("app")
+class TestProviderDataApiTimeouts:
+    @pytest.fixture
+    def pda_config(self):
+        return {"PDA_CONNECT_TIMEOUT": 2, "PDA_READ_TIMEOUT_ENTITY": 4, "PDA_READ_TIMEOUT_LIST": 12}
+
+    @pytest.fixture
+    def api_client(self, api_client):
+        api_client.session.request = Mock(return_value=Mock(status_code=200))
+        return api_client
+
+    @pytest.mark.parametrize(
+        "method, endpoint, timeout",
+        [
+            ("GET", "/provider-firms/1", (2, 4)),
+            ("GET", "/provider-offices/1A001L", (2, 4)),
+            ("GET", "/provider-firms", (2, 12)),
+            ("GET", "/provider-firms/1/provider-offices", (2, 12)),
+            ("PATCH", "/provider-firms/1", (2, 10)),
+        ],
+    )
+    def test_timeout_per_endpoint_class(self, api_client, method, endpoint, timeout):
+        g.pda_deadline = None
+
+        api_client._make_request(method, endpoint)
+
+        assert api_client.session.request.call_args.kwargs["timeout"] == timeout
+
+    def test_timeout_limited_to_remaining_budget(self, api_client):
+        clock = FakeClock()
+        g.pda_deadline = RequestDeadline(10, clock=clock)
+        clock.now = 7
+
+        api_client._make_request("GET", "/provider-firms")
+
+        assert api_client.session.request.call_args.kwargs["timeout"] == (2, 3)
+
+    def test_expired_budget_refuses_request(self, api_client):
+        clock = FakeClock()
+        g.pda_deadline = RequestDeadline(10, clock=clock)
+        clock.now = 10
+
+        with pytest.raises(PDADeadlineExceededError):
+            api_client._make_request("GET", "/provider-firms")
+        api_client.session.request.assert_not_called()
+
+    def test_timeout_cut_short_by_budget_is_deadline_exceeded(self, api_client):
+        clock = FakeClock()
+        g.pda_deadline = RequestDeadline(10, clock=clock)
+
+        def timeout(*args, **kwargs):
+            clock.now = 10
+            raise requests.Timeout("Read timed out")
+
+        api_client.session.request = Mock(side_effect=timeout)
+
+        with pytest.raises(PDADeadlineExceededError):
+            api_client._make_request("GET", "/provider-firms")
+
+    def test_timeout_within_budget_is_a_request_failure(self, api_client):
+        g.pda_deadline = RequestDeadline(10, clock=FakeClock())
+        api_client.session.request = Mock(side_effect=requests.Timeout("Read timed out"))
+
+        with pytest.raises(PDAError) as exc_info:
+            api_client._make_request("GET", "/provider-firms")
+        assert not isinstance(exc_info.value, PDADeadlineExceededError)
@@ -0,0 +1,55 @@
+import json
+
+import pytest
+from pydantic import ValidationError
+
+from app.models import Firm, Office
+from app.pda import decoding
+
+
+class TestGetDecoder:
+    @pytest.mark.parametrize("name", list(decoding.DECODERS))
+    def test_decodes_bytes(self, name):
+        decode = decoding.get_decoder(name)
+
+        assert decode(b'{"firms": [{"firmId": 1, "firmName": "Caf\xc3\xa9"}]}') == {
+            "firms": [{"firmId": 1, "firmName": "Café"}]
+        }
+
+    @pytest.mark.parametrize("name", list(decoding.DECODERS))
+    def test_invalid_json_raises_decode_error(self, name):
+        with pytest.raises(decoding.DECODE_ERRORS):
+            decoding.get_decoder(name)(b'{"firms": [')
+
+    def test_auto_is_fastest_available(self):
+        assert decoding.get_decoder("auto") is next(iter(decoding.DECODERS.values()))
+
+    def test_stdlib_is_always_available(self):
+        assert decoding.get_decoder("json") is json.loads
+
+    def test_unknown_decoder(self):
+        with pytest.raises(ValueError, match="JSON decoder 'simdjson' is not available"):
+            decoding.get_decoder("simdjson")
+
+
+class TestResponseAdapters:
+    def test_firms_response(self):
+        body = json.dumps({"firms": [{"firmId": 1, "firmName": "Firm 1"}, {"firmId": 2, "firmName": "Firm 2"}]})
+
+        response = decoding.FIRMS_RESPONSE.validate_json(body)
+
+        assert response["firms"] == [Firm(firm_id=1, firm_name="Firm 1"), Firm(firm_id=2, firm_name="Firm 2")]
+
+    def test_wrapped_office(self):
+        response = decoding.OFFICE_RESPONSE.validate_json(b'{"office": {"firmOfficeCode": "1A001L"}}')
+
+        assert response == {"office": Office(firm_office_code="1A001L")}
+
+    def test_direct_office(self):
+        response = decoding.OFFICE_RESPONSE.validate_json(b'{"firmOfficeCode": "1A001L"}')
+
+        assert response == Office(firm_office_code="1A001L")
+
+    def test_invalid_json_is_a_validation_error(self):
+        with pytest.raises(ValidationError):
+            decoding.BANK_ACCOUNTS_RESPONSE.validate_json(b"[{")
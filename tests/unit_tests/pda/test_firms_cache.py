@@ -0,0 +1,139 @@
+import json
+from unittest.mock import Mock
+
+import pytest
+import redis
+
+from app.models import Firm
+from app.pda.firms_cache import FirmListCache, init_app
+from app.pda.mock_api import MockProviderDataApi
+
+
+class FakeRedis:
+    """Minimal in-memory stand-in for the redis client methods used by the cache."""
+
+    def __init__(self):
+        self.store = {}
+
+    def get(self, key):
+        return self.store.get(key)
+
+    def set(self, key, value, ex=None):
+        self.store[key] = value
+
+    def delete(self, key):
+        self.store.pop(key, None)
+
+
+class TestFirmListCache:
+    @pytest.fixture
+    def cache(self):
+        return FirmListCache(FakeRedis(), ttl=60, max_bytes=1024 * 1024)
+
+    def test_get_miss(self, cache):
+        assert cache.get() is None
+        assert cache.misses == 1
+        assert cache.hits == 0
+
+    def test_set_then_get_hit(self, cache):
+        firms = [Firm(firm_id=1, firm_name="Test Firm")]
+
+        cache.set(firms)
+
+        assert cache.get() == firms
+        assert cache.hits == 1
+
+    def test_firms_are_stored_as_json(self, cache):
+        cache.set([Firm(firm_id=1, firm_name="Test Firm")])
+
+        assert json.loads(cache.redis.store[FirmListCache.KEY]) == [
+            {"firmId": 1, "ccmsFirmId": 0, "parentFirmId": 0, "firmName": "Test Firm"}
+        ]
+
+    def test_invalid_cached_firms_are_treated_as_miss(self, cache):
+        cache.redis.store[FirmListCache.KEY] = b'[{"firmId": "not a number"}]'
+
+        assert cache.get() is None
+        assert cache.misses == 1
+
+    def test_set_too_large_is_not_cached(self):
+        cache = FirmListCache(FakeRedis(), ttl=60, max_bytes=10)
+
+        cache.set([Firm(firm_id=1, firm_name="Test Firm")])
+
+        assert cache.get() is None
+
+    def test_invalidate(self, cache):
+        cache.set([Firm(firm_id=1, firm_name="Test Firm")])
+
+        cache.invalidate()
+
+        assert cache.get() is None
+
+    def test_redis_error_is_treated_as_miss(self):
+        redis_client = Mock()
+        redis_client.get.side_effect = redis.ConnectionError("Redis unavailable")
+        cache = FirmListCache(redis_client, ttl=60, max_bytes=1024)
+
+        assert cache.get() is None
+        assert cache.misses == 1
+
+
+class TestInitApp:
+    def test_disabled_when_sessions_not_in_redis(self):
+        app = Mock()
+        app.config = {"SESSION_TYPE": "cachelib", "PDA_FIRMS_CACHE_TTL": 60}
+
+        assert init_app(app) is None
+
+    def test_disabled_when_ttl_is_zero(self):
+        app = Mock()
+        app.config = {"SESSION_TYPE": "redis", "PDA_FIRMS_CACHE_TTL": 0}
+
+        assert init_app(app) is None
+
+    def test_uses_session_redis(self):
+        redis_client = FakeRedis()
+        app = Mock()
+        app.config = {
+            "SESSION_TYPE": "redis",
+            "SESSION_REDIS": redis_client,
+            "PDA_FIRMS_CACHE_TTL": 60,
+            "PDA_FIRMS_CACHE_MAX_BYTES": 1024,
+        }
+
+        cache = init_app(app)
+
+        assert cache.redis is redis_client
+        assert cache.ttl == 60
+
+
+class TestMockApiFirmsCache:
+    @pytest.fixture
+    def mock_api(self):
+        api = MockProviderDataApi()
+        api.firms_cache = FirmListCache(FakeRedis(), ttl=60, max_bytes=1024 * 1024)
+        return api
+
+    def test_get_all_provider_firms_uses_cache(self, mock_api):
+        firms = mock_api.get_all_provider_firms()
+
+        mock_api._mock_data["firms"] = []
+
+        assert mock_api.get_all_provider_firms() == firms
+        assert mock_api.firms_cache.hits == 1
+
+    def test_update_provider_firm_name_invalidates_cache(self, mock_api):
+        mock_api.get_all_provider_firms()
+
+        mock_api.update_provider_firm_name(1, "Renamed Firm")
+
+        firms = mock_api.get_all_provider_firms()
+        assert firms[0].firm_name == "Renamed Firm"
+
+    def test_create_provider_firm_invalidates_cache(self, mock_api):
+        count = len(mock_api.get_all_provider_firms())
+
+        mock_api.create_provider_firm(Firm(firm_name="New Firm", firm_type="Legal Services Provider"))
+
+        assert len(mock_api.get_all_provider_firms()) == count + 1
@@ -0,0 +1,81 @@
+import json
+import os
+
+import pytest
+
+from app.pda.commands import pda_cli
+from app.pda.fixture_generator import FIXTURE_FILES, generate_fixtures, write_fixtures
+from app.pda.mock_api import MockProviderDataApi, _load_mock_data
+
+CHECKED_IN_FIXTURES = os.path.join(os.path.dirname(__file__), "..", "..", "..", "app", "pda", "fixtures")
+
+
+@pytest.fixture(scope="module")
+def data():
+    return generate_fixtures(300, seed=1)
+
+
+class TestGenerateFixtures:
+    def test_firm_count(self, data):
+        assert len(data["firms"]) == 300
+
+    def test_same_seed_same_fixtures(self, data):
+        assert generate_fixtures(300, seed=1) == data
+        assert generate_fixtures(300, seed=2) != data
+
+    def test_same_fields_as_checked_in_fixtures(self, data):
+        for name, filename in FIXTURE_FILES.items():
+            with open(os.path.join(CHECKED_IN_FIXTURES, filename)) as f:
+                checked_in = json.load(f)[name]
+            fields = set().union(*checked_in)
+            assert set(data[name][0]) <= fields, name
+
+    def test_chambers_members(self, data):
+        firms = {firm["firmId"]: firm for firm in data["firms"]}
+        members = [firm for firm in data["firms"] if firm["firmType"] in ("Advocate", "Barrister")]
+
+        assert members
+        assert all(firms[member["parentFirmId"]]["firmType"] == "Chambers" for member in members)
+
+    def test_offices(self, data):
+        codes = [office["firmOfficeCode"] for office in data["offices"]]
+        head_offices = {office["_firmId"] for office in data["offices"] if office["headOffice"] == "N/A"}
+
+        assert len(codes) == len(set(codes))
+        assert head_offices == {firm["firmId"] for firm in data["firms"]}
+        assert len(data["offices"]) > len(data["firms"])
+
+    def test_schedule_lines_match_contracts(self, data):
+        schedule = data["schedules"][0]
+        contracts = [c for c in data["contracts"] if c["_firmOfficeId"] == schedule["_firmOfficeId"]]
+
+        assert [line["categoryOfLaw"] for line in schedule["scheduleLines"]] == [c["categoryOfLaw"] for c in contracts]
+
+    def test_invalid_firm_count(self):
+        with pytest.raises(ValueError, match="firm_count must be a positive integer"):
+            generate_fixtures(0)
+
+
+class TestLoadGeneratedFixtures:
+    def test_loaded_by_mock(self, data, tmp_path):
+        write_fixtures(data, str(tmp_path))
+
+        assert _load_mock_data(str(tmp_path)) == data
+
+    def test_loaded_from_config(self, data, tmp_path, app):
+        write_fixtures(data, str(tmp_path))
+        app.config["PDA_MOCK_FIXTURES_DIR"] = str(tmp_path)
+        mock_api = MockProviderDataApi()
+
+        mock_api.init_app(app)
+
+        office = data["offices"][-1]
+        assert mock_api.get_provider_office(office["firmOfficeCode"]).firm_office_id == office["firmOfficeId"]
+
+    def test_cli(self, app, tmp_path):
+        args = ["generate-fixtures", "--firms", "20", "--output-dir", str(tmp_path)]
+
+        result = app.test_cli_runner().invoke(pda_cli, args)
+
+        assert result.exit_code == 0
+        assert len(_load_mock_data(str(tmp_path))["firms"]) == 20
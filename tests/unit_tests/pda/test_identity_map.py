@@ -0,0 +1,128 @@
+from unittest.mock import Mock
+
+from flask import g
+
+from app.pda.identity_map import IdentityMap, get_identity_map, log_saved_calls
+
+
+class TestIdentityMap:
+    def test_get_missing_entry_does_not_count_as_saved(self):
+        identity_map = IdentityMap()
+
+        identity_map.get(("get_provider_firm", 1, None, ()))
+
+        assert identity_map.saved_calls == 0
+
+    def test_get_existing_entry_counts_as_saved(self):
+        identity_map = IdentityMap()
+        identity_map.set(("get_provider_firm", 1, None, ()), "firm")
+
+        assert identity_map.get(("get_provider_firm", 1, None, ())) == "firm"
+        assert identity_map.saved_calls == 1
+
+    def test_evict_by_firm_id(self):
+        identity_map = IdentityMap()
+        identity_map.set(("get_provider_firm", 1, None, ()), "firm 1")
+        identity_map.set(("get_office_contacts", 1, "1A001L", ()), "contacts")
+        identity_map.set(("get_provider_firm", 2, None, ()), "firm 2")
+
+        identity_map.evict(firm_id=1)
+
+        assert identity_map._entries == {("get_provider_firm", 2, None, ()): "firm 2"}
+
+    def test_evict_by_office_code(self):
+        identity_map = IdentityMap()
+        identity_map.set(("get_provider_office", None, "1A001L", ()), "office")
+        identity_map.set(("get_office_contacts", 1, "1A001L", ()), "contacts")
+        identity_map.set(("get_provider_offices", 1, None, ()), "offices")
+
+        identity_map.evict(office_code="1A001L")
+
+        assert identity_map._entries == {("get_provider_offices", 1, None, ()): "offices"}
+
+    def test_evict_office_keeps_the_firm(self):
+        identity_map = IdentityMap()
+        identity_map.set(("get_provider_firm", 1, None, ()), "firm")
+        identity_map.set(("get_provider_office", None, "1A001L", ()), "office")
+        identity_map.set(("get_provider_offices", 1, None, ()), "offices")
+        identity_map.set(("get_head_office", 1, None, ()), "head office")
+        identity_map.set(("get_provider_offices", 2, None, ()), "other offices")
+
+        identity_map.evict_office(1, "1A001L")
+
+        assert identity_map._entries == {
+            ("get_provider_firm", 1, None, ()): "firm",
+            ("get_provider_offices", 2, None, ()): "other offices",
+        }
+
+
+class TestIdentityMappedReads:
+    def test_repeated_reads_are_served_from_identity_map(self, app):
+        pda = app.extensions["pda"]
+        pda.get_provider_offices = Mock(wraps=pda.get_provider_offices)
+
+        with app.test_request_context():
+            first = pda.get_head_office(1)
+            second = pda.get_head_office(1)
+
+            assert first is second
+            assert pda.get_provider_offices.call_count == 1
+            assert g.pda_identity_map.saved_calls == 1
+
+    def test_returned_lists_are_copies(self, app):
+        pda = app.extensions["pda"]
+
+        with app.test_request_context():
+            offices = pda.get_provider_offices(1)
+            offices.clear()
+
+            assert len(pda.get_provider_offices(1)) > 0
+
+    def test_patch_office_evicts_affected_entries(self, app):
+        pda = app.extensions["pda"]
+
+        with app.test_request_context():
+            head_office = pda.get_head_office(1)
+            pda.patch_office(1, head_office.firm_office_code, {"contractManager": "Alice Johnson"})
+
+            assert pda.get_head_office(1).contract_manager == "Alice Johnson"
+            assert pda.get_provider_office(head_office.firm_office_code).contract_manager == "Alice Johnson"
+
+    def test_patch_provider_evicts_affected_entries(self, app):
+        pda = app.extensions["pda"]
+
+        with app.test_request_context():
+            pda.get_provider_firm(1)
+            pda.patch_provider(1, {"firmName": "Renamed Firm"})
+
+            assert pda.get_provider_firm(1).firm_name == "Renamed Firm"
+
+    def test_patched_entities_are_served_from_identity_map(self, app):
+        pda = app.extensions["pda"]
+
+        with app.test_request_context():
+            office_code = pda.get_head_office(1).firm_office_code
+            firm = pda.patch_provider(1, {"firmName": "Renamed Firm"})
+            office = pda.patch_office(1, office_code, {"contractManager": "Alice Johnson"})
+
+            assert pda.get_provider_firm(1) is firm
+            assert pda.get_provider_office(office_code) is office
+
+    def test_identity_map_is_discarded_at_end_of_request(self, app):
+        with app.test_request_context():
+            get_identity_map().set(("get_provider_firm", 1, None, ()), "firm")
+
+            log_saved_calls()
+
+            assert "pda_identity_map" not in g
+
+    def test_get_head_offices_fills_identity_map(self, app):
+        pda = app.extensions["pda"]
+
+        with app.test_request_context():
+            head_offices = pda.get_head_offices([1, 2, 1])
+            pda.get_provider_offices = Mock(side_effect=AssertionError("Head offices should be in the identity map"))
+
+            assert list(head_offices) == [1, 2]
+            assert pda.get_head_office(1) is head_offices[1]
+            assert pda.get_head_office(2) is head_offices[2]
@@ -0,0 +1,64 @@
+from unittest.mock import patch
+
+import pytest
+
+from app.models import Firm
+from app.pda.errors import ProviderDataApiError
+from app.pda.lazy import LazyModels
+
+
+class TestLazyModels:
+    @pytest.fixture
+    def firms(self):
+        rows = [{"firmId": i, "firmName": f"Firm {i}", "firmType": "Chambers"} for i in range(1, 101)]
+        return LazyModels(rows, Firm)
+
+    def test_len_does_not_validate(self, firms):
+        with patch.object(Firm, "model_validate", side_effect=AssertionError("Firm should not be validated")):
+            assert len(firms) == 100
+
+    def test_index(self, firms):
+        assert firms[0] == Firm(firm_id=1, firm_name="Firm 1", firm_type="Chambers")
+        assert firms[-1].firm_id == 100
+
+    def test_index_out_of_range(self, firms):
+        with pytest.raises(IndexError):
+            firms[100]
+
+    def test_models_are_built_once(self, firms):
+        assert firms[5] is firms[5]
+
+    def test_slice_only_validates_the_page(self, firms):
+        with patch.object(Firm, "model_validate", wraps=Firm.model_validate) as model_validate:
+            page = list(firms[20:40])
+
+        assert [firm.firm_id for firm in page] == list(range(21, 41))
+        assert model_validate.call_count == 20
+
+    def test_filter_on_raw_fields(self, firms):
+        filtered = firms.filter(lambda row: row["firmId"] % 10 == 0)
+
+        assert len(filtered) == 10
+        assert [firm.firm_id for firm in filtered] == list(range(10, 101, 10))
+
+    def test_invalid_row(self):
+        firms = LazyModels([{"firmId": -1}], Firm)
+
+        with pytest.raises(ProviderDataApiError, match="Invalid firm data"):
+            firms[0]
+
+
+class TestLazyProviderFirms:
+    def test_matches_eager_list(self, api_client, mock_api):
+        firms = api_client.get_all_provider_firms(lazy=True)
+
+        assert isinstance(firms, LazyModels)
+        assert list(firms) == mock_api.get_all_provider_firms()
+
+    def test_not_modified_after_eager_request(self, api_client):
+        eager = api_client.get_all_provider_firms()
+
+        assert list(api_client.get_all_provider_firms(lazy=True)) == eager
+
+    def test_mock_api(self, mock_api):
+        assert list(mock_api.get_all_provider_firms(lazy=True)) == mock_api.get_all_provider_firms()
@@ -0,0 +1,124 @@
+from unittest.mock import Mock
+
+import pytest
+import requests
+
+from app.pda import metrics
+from app.pda.api import PDAError
+
+
+@pytest.mark.parametrize(
+    "endpoint, template",
+    [
+        ("/provider-firms", "/provider-firms"),
+        ("/provider-firms/123", "/provider-firms/{firmId}"),
+        ("provider-offices/1A001L", "/provider-offices/{officeCode}"),
+        (
+            "/provider-firms/123/provider-offices/1A001L/schedules",
+            "/provider-firms/{firmId}/provider-offices/{officeCode}/schedules",
+        ),
+        ("/provider-firms/123/offices/1A001L", "/provider-firms/{firmId}/offices/{officeCode}"),
+        ("/provider-firms/123/bank-details/45", "/provider-firms/{firmId}/bank-details/{bankAccountId}"),
+        ("/contracts/2024", "/contracts/{id}"),
+    ],
+)
+def test_endpoint_template(endpoint, template):
+    assert metrics.endpoint_template(endpoint) == template
+
+
+class TestPDAMetrics:
+    def test_render(self):
+        pda_metrics = metrics.PDAMetrics()
+        pda_metrics.record_request("GET", "/provider-firms", "200", 0.3, 1024)
+        pda_metrics.record_request("GET", "/provider-firms", "304", 0.02, 0)
+        pda_metrics.record_decode("GET", "/provider-firms", 0.01)
+        pda_metrics.record_validation("GET", "/provider-firms", 0.05)
+
+        lines = pda_metrics.render().splitlines()
+
+        labels = 'method="GET",endpoint="/provider-firms"'
+        assert f'pda_requests_total{{{labels},status="200"}} 1' in lines
+        assert f'pda_requests_total{{{labels},status="304"}} 1' in lines
+        assert f'pda_request_duration_seconds_bucket{{{labels},le="0.025"}} 1' in lines
+        assert f'pda_request_duration_seconds_bucket{{{labels},le="0.25"}} 1' in lines
+        assert f'pda_request_duration_seconds_bucket{{{labels},le="0.5"}} 2' in lines
+        assert f'pda_request_duration_seconds_bucket{{{labels},le="+Inf"}} 2' in lines
+        assert f"pda_request_duration_seconds_count{{{labels}}} 2" in lines
+        assert f"pda_response_bytes_total{{{labels}}} 1024" in lines
+        assert f"pda_json_decode_seconds_count{{{labels}}} 1" in lines
+        assert f"pda_model_validation_seconds_sum{{{labels}}} 0.05" in lines
+
+    def test_render_retries(self):
+        pda_metrics = metrics.PDAMetrics()
+        pda_metrics.record_retries("GET", "/provider-firms", 2)
+        pda_metrics.record_retry_refused("budget")
+
+        lines = pda_metrics.render().splitlines()
+
+        assert 'pda_retries_total{method="GET",endpoint="/provider-firms"} 2' in lines
+        assert 'pda_retries_refused_total{reason="budget"} 1' in lines
+
+    def test_escapes_labels(self):
+        pda_metrics = metrics.PDAMetrics()
+        pda_metrics.record_request("GET", '/a"b', "200", 0.1, 0)
+
+        assert 'endpoint="/a\\"b"' in pda_metrics.render()
+
+
+class TestProviderDataApiMetrics:
+    def test_records_requests_by_endpoint_template(self, api_client):
+        api_client.get_provider_firm(1)
+        api_client.get_provider_firm(2)
+        api_client.get_provider_firm(1)
+
+        rendered = api_client.metrics.render()
+
+        labels = 'method="GET",endpoint="/provider-firms/{firmId}"'
+        assert f'pda_requests_total{{{labels},status="200"}} 2' in rendered
+        assert f'pda_requests_total{{{labels},status="304"}} 1' in rendered
+        assert f"pda_model_validation_seconds_count{{{labels}}} 2" in rendered
+
+    def test_records_decode_time(self, api_client):
+        api_client.get_provider_users(1)
+
+        assert 'pda_json_decode_seconds_count{method="GET",endpoint="/provider-firms/{firmId}/provider-users"} 1' in (
+            api_client.metrics.render()
+        )
+
+    def test_records_failed_requests(self, api_client):
+        api_client.session.request = Mock(side_effect=requests.ConnectionError("Connection refused"))
+
+        with pytest.raises(PDAError):
+            api_client.get_provider_firm(1)
+
+        assert 'pda_requests_total{method="GET",endpoint="/provider-firms/{firmId}",status="error"} 1' in (
+            api_client.metrics.render()
+        )
+
+    def test_shared_with_the_app(self, api_client):
+        assert api_client.app.extensions["pda_metrics"] is api_client.metrics
+
+
+class TestMetricsEndpoint:
+    @pytest.fixture
+    def client(self, app):
+        app.config["METRICS_TOKEN"] = "scrape-token"
+        app.extensions["pda_metrics"] = metrics.PDAMetrics()
+        app.extensions["pda_metrics"].record_request("GET", "/provider-firms", "200", 0.1, 10)
+        return app.test_client()
+
+    def test_serves_metrics_with_token(self, client):
+        response = client.get("/metrics", headers={"Authorization": "Bearer scrape-token"})
+
+        assert response.status_code == 200
+        assert response.content_type.startswith("text/plain; version=0.0.4")
+        assert b'pda_requests_total{method="GET",endpoint="/provider-firms",status="200"} 1' in response.data
+
+    @pytest.mark.parametrize("headers", [{}, {"Authorization": "Bearer wrong-token"}])
+    def test_refuses_without_token(self, client, headers):
+        assert client.get("/metrics", headers=headers).status_code == 401
+
+    def test_not_served_without_configured_token(self, client, app):
+        app.config["METRICS_TOKEN"] = None
+
+        assert client.get("/metrics", headers={"Authorization": "Bearer None"}).status_code == 404
@@ -1,14 +1,20 @@
 import datetime
+import os
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import Mock, patch
 
 import pytest
 
 from app.models import BankAccount, Contact, Firm, Office
+from app.pda import mock_api as mock_api_module
+from app.pda.fixture_generator import FIXTURE_FILES, generate_fixtures, write_fixtures
 from app.pda.mock_api import (
     MockPDAError,
     MockProviderDataApi,
     _clean_data,
+    _fixtures_snapshot,
     _generate_unique_office_code,
+    _load_cached_mock_data,
     _load_fixture,
     _load_mock_data,
 )
@@ -97,6 +103,34 @@ class TestDataLoadFunctions:
             with pytest.raises(MockPDAError):
                 _generate_unique_office_code(existing_codes, max_attempts=5)
 
+    @pytest.fixture
+    def cache_dir(self, tmp_path, monkeypatch):
+        cache_dir = tmp_path / "cache"
+        monkeypatch.setattr("app.pda.mock_api._FIXTURE_CACHE_DIR", str(cache_dir))
+        return cache_dir
+
+    def test_load_cached_mock_data(self, tmp_path, cache_dir):
+        fixtures_dir = tmp_path / "fixtures"
+        write_fixtures(generate_fixtures(5), str(fixtures_dir))
+        data = _load_cached_mock_data(str(fixtures_dir))
+
+        with patch("app.pda.mock_api._load_fixture") as mock_load_fixture:
+            assert _load_cached_mock_data(str(fixtures_dir)) == data
+
+        mock_load_fixture.assert_not_called()
+        # The cache is kept out of the fixtures directory
+        assert sorted(path.name for path in fixtures_dir.iterdir()) == sorted(FIXTURE_FILES.values())
+        assert len(list(cache_dir.iterdir())) == 1
+
+    def test_cached_mock_data_rebuilt_when_fixtures_change(self, tmp_path, cache_dir):
+        write_fixtures(generate_fixtures(5), str(tmp_path))
+        _load_cached_mock_data(str(tmp_path))
+
+        data = generate_fixtures(6)
+        write_fixtures(data, str(tmp_path))
+
+        assert _load_cached_mock_data(str(tmp_path)) == data
+
 
 class TestMockProviderDataApi:
     @pytest.fixture
@@ -107,6 +141,7 @@ class TestMockProviderDataApi:
     def mock_app(self):
         app = Mock()
         app.extensions = {}
+        app.config = {}
         return app
 
     def test_init_sets_up_mock_data(self, mock_api):
@@ -129,6 +164,24 @@ class TestMockProviderDataApi:
         assert mock_api.base_url is None
         assert mock_api._initialized is True
 
+    def test_init_app_keeps_data_without_mock_config(self, mock_api, mock_app):
+        mock_api._mock_data = {"firms": [{"firmId": 1, "firmName": "Test Firm"}]}
+
+        mock_api.init_app(mock_app)
+
+        assert mock_api._mock_data == {"firms": [{"firmId": 1, "firmName": "Test Firm"}]}
+
+    def test_init_app_only_loads_configured_fixtures(self, mock_app):
+        fixtures_dir = os.path.join(os.path.dirname(mock_api_module.__file__), "fixtures")
+        mock_app.config = {"PDA_MOCK_FIXTURES_DIR": fixtures_dir}
+
+        with patch("app.pda.mock_api._fixtures_snapshot", wraps=_fixtures_snapshot) as fixtures_snapshot:
+            mock_api = MockProviderDataApi()
+            mock_api.init_app(mock_app)
+            mock_api.get_provider_firm(1)
+
+        fixtures_snapshot.assert_called_once_with(fixtures_dir)
+
     def test_find_office_data_success(self, mock_api):
         mock_api._mock_data = {
             "offices": [
@@ -229,6 +282,96 @@ class TestMockProviderDataApi:
         with pytest.raises(ValueError, match="firm_id must be a positive integer"):
             mock_api.get_provider_offices(0)
 
+    def test_search_provider_firms(self, mock_api):
+        page = mock_api.search_provider_firms("legal chambers")
+
+        assert [firm.firm_name for firm in page.items] == ["Northern Legal Chambers"]
+        assert page.total == 1
+        assert page.next_cursor is None
+
+    def test_search_provider_firms_by_type_and_page(self, mock_api):
+        first = mock_api.search_provider_firms("", firm_type="Chambers", limit=2)
+        second = mock_api.search_provider_firms("", firm_type="Chambers", cursor=first.next_cursor, limit=2)
+
+        assert [firm.firm_id for firm in first.items] == [2, 5]
+        assert [firm.firm_id for firm in second.items] == [8]
+        assert first.total == second.total == 3
+        assert second.next_cursor is None
+
+    def test_get_provider_offices_page(self, mock_api):
+        mock_api._mock_data = {
+            "offices": [
+                {"_firmId": 1, "firmOfficeCode": "1A001L"},
+                {"_firmId": 2, "firmOfficeCode": "2R006L"},
+                {"_firmId": 1, "firmOfficeCode": "1A002L"},
+            ],
+        }
+
+        page = mock_api.get_provider_offices_page(1, limit=1)
+
+        assert page.items == [Office(**{"firmOfficeCode": "1A001L"})]
+        assert page.total == 2
+        assert mock_api.get_provider_offices_page(1, cursor=page.next_cursor, limit=1).items == [
+            Office(**{"firmOfficeCode": "1A002L"})
+        ]
+
+    def test_search_bank_accounts_newest_first(self, mock_api):
+        page = mock_api.search_bank_accounts("", firm_id=1)
+
+        assert [account.bank_account_id for account in page.items] == [1, 902, 901, 2]
+        assert page.total == 4
+
+    def test_search_bank_accounts_by_sort_code(self, mock_api):
+        page = mock_api.search_bank_accounts("404516")
+
+        assert [account.bank_account_id for account in page.items] == [9, 2]
+
+    def test_search_bank_accounts_invalid_cursor(self, mock_api):
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            mock_api.search_bank_accounts("", cursor="not-a-cursor")
+
+    def test_get_head_offices(self, mock_api):
+        mock_api._mock_data = {
+            "firms": [{"firmId": 1, "firmName": "Test Firm"}],
+            "offices": [
+                {"_firmId": 1, "firmOfficeCode": "1A002L", "headOffice": "1A001L"},
+                {"_firmId": 1, "firmOfficeCode": "1A001L", "headOffice": "N/A"},
+                {"_firmId": 2, "firmOfficeCode": "2R006L", "headOffice": "N/A"},
+                {"_firmId": 3, "firmOfficeCode": "3B001L", "headOffice": "N/A"},
+            ],
+        }
+
+        result = mock_api.get_head_offices([1, 2, 4])
+
+        assert result == {
+            1: Office(**{"firmOfficeCode": "1A001L", "headOffice": "N/A"}),
+            2: Office(**{"firmOfficeCode": "2R006L", "headOffice": "N/A"}),
+            4: None,
+        }
+
+    def test_patch_offices(self, mock_api):
+        mock_api._mock_data = {
+            "offices": [
+                {"_firmId": 1, "firmOfficeCode": "1A001L", "headOffice": "N/A"},
+                {"_firmId": 1, "firmOfficeCode": "1A002L", "headOffice": "1A001L"},
+            ],
+        }
+
+        result = mock_api.patch_offices(
+            1, {"1A001L": {"contractManager": "Alice"}, "1A002L": {"contractManager": "Bob"}}
+        )
+
+        assert list(result) == ["1A001L", "1A002L"]
+        assert mock_api._mock_data["offices"][0]["contractManager"] == "Alice"
+        assert mock_api._mock_data["offices"][1]["contractManager"] == "Bob"
+
+    def test_patch_offices_returns_errors(self, mock_api):
+        error = MockPDAError("Update failed")
+        with patch.object(mock_api, "patch_office", side_effect=[{"firmOfficeCode": "1A001L"}, error]):
+            result = mock_api.patch_offices(1, {"1A001L": {}, "1A002L": {}})
+
+        assert result == {"1A001L": {"firmOfficeCode": "1A001L"}, "1A002L": error}
+
     def test_get_office_contract_details_success(self, mock_api):
         mock_api._mock_data = {
             "firms": [{"firmId": 1, "firmName": "Test Firm"}],
@@ -291,8 +434,8 @@ class TestMockProviderDataApi:
         with pytest.raises(ValueError, match="firm_id must be a positive integer"):
             mock_api.get_provider_users(-1)
 
-    @patch("app.pda.mock_api._load_mock_data")
-    def test_load_mock_data_called_on_init(self, mock_load_data):
+    @patch("app.pda.mock_api._load_cached_mock_data")
+    def test_load_mock_data_called_once_per_process(self, mock_load_data):
         mock_load_data.return_value = {
             "firms": [],
             "offices": [],
@@ -301,10 +444,34 @@ class TestMockProviderDataApi:
             "bank_accounts": [],
         }
 
-        MockProviderDataApi()
+        with patch.dict("app.pda.mock_api._fixture_snapshots", clear=True):
+            MockProviderDataApi().get_all_provider_firms()
+            MockProviderDataApi().get_all_provider_firms()
 
         mock_load_data.assert_called_once()
 
+    def test_mocks_do_not_share_data(self):
+        first, second = MockProviderDataApi(), MockProviderDataApi()
+
+        first.patch_office(1, "1A001L", {"contractManager": "Alice Johnson"})
+
+        assert second.get_provider_office("1A001L").contract_manager != "Alice Johnson"
+
+    def test_snapshot_and_restore(self, mock_api):
+        snapshot = mock_api.snapshot()
+        mock_api.patch_office(1, "1A001L", {"contractManager": "Alice Johnson"})
+        mock_api.create_provider_firm(Firm(firm_name="NEW FIRM", firm_type="Legal Services Provider"))
+
+        mock_api.restore(snapshot)
+
+        assert mock_api.get_provider_office("1A001L").contract_manager != "Alice Johnson"
+        assert "NEW FIRM" not in [firm.firm_name for firm in mock_api.get_all_provider_firms()]
+
+        # The snapshot is unchanged by writes after restoring it, so it can be restored again
+        mock_api.patch_office(1, "1A001L", {"contractManager": "Alice Johnson"})
+        mock_api.restore(snapshot)
+        assert mock_api.get_provider_office("1A001L").contract_manager != "Alice Johnson"
+
     def test_create_provider_firm_basic(self, mock_api):
         """Test creating a basic provider firm."""
         # Create a Firm instance
@@ -630,6 +797,27 @@ class TestMockProviderDataApi:
         actual = mock_api.get_provider_children(50)
         assert actual == expected
 
+    def test_get_provider_children_after_changing_parent(self, mock_api):
+        mock_api._mock_data = {
+            "firms": [
+                {"firmId": 1, "firmName": "Chambers 1", "firmType": "Chambers"},
+                {"firmId": 2, "firmName": "Chambers 2", "firmType": "Chambers"},
+                {"firmId": 3, "firmName": "Barrister 3", "parentFirmId": 1, "firmType": "Barrister"},
+            ],
+        }
+
+        mock_api.patch_provider(3, {"parentFirmId": 2})
+
+        assert mock_api.get_provider_children(1) == []
+        assert [firm.firm_id for firm in mock_api.get_provider_children(2)] == [3]
+
+    def test_patched_office_code_is_looked_up(self, mock_api):
+        mock_api.patch_office(1, "1A001L", {"firmOfficeCode": "1A999L"})
+
+        assert mock_api.get_provider_office("1A001L") is None
+        assert mock_api.get_provider_office("1A999L").firm_office_code == "1A999L"
+        assert mock_api._find_office_data(1, "1A999L") is not None
+
     def test_get_office_contacts_success(self, mock_api):
         """Test getting contacts for an office."""
         mock_api._mock_data = {
@@ -757,6 +945,20 @@ class TestMockProviderDataApi:
         assert result.primary == "N"
         assert len(mock_api._mock_data["contacts"]) == 2
 
+    def test_create_office_contacts_concurrently(self, mock_api):
+        """Test contacts created from many threads at once all get their own ID."""
+        mock_api._mock_data = {
+            "offices": [{"_firmId": 1, "firmOfficeCode": "1A001L", "firmOfficeId": 101}],
+            "contacts": [{"contactId": 7, "vendorSiteId": 101}],
+        }
+        contact = Contact(first_name="Jane", last_name="Doe", email_address="jane.doe@example.com")
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            created = list(executor.map(lambda _: mock_api.create_office_contact(1, "1A001L", contact), range(50)))
+
+        assert sorted(c.contact_id for c in created) == list(range(8, 58))
+        assert len(mock_api.get_office_contacts(1, "1A001L")) == 51
+
     def test_create_office_contact_office_not_found(self, mock_api):
         """Test creating contact when office doesn't exist."""
         mock_api._mock_data = {"offices": [], "contacts": []}
@@ -0,0 +1,121 @@
+import random
+
+import pytest
+import requests
+
+from app.pda.api import ProviderDataApi
+from app.pda.fixture_generator import generate_fixtures, write_fixtures
+from app.pda.mock_adapter import SCALED_ID_OFFSET
+from app.pda.mock_server import FaultInjector, Latency, MockPDAServer, create_mock_api
+from app.pda.mock_sqlite_store import SQLiteMockStore
+
+
+@pytest.fixture
+def server():
+    with MockPDAServer() as server:
+        yield server
+
+
+class TestLatency:
+    def test_fixed(self):
+        assert Latency("fixed:0.25").sample(random.Random()) == 0.25
+
+    def test_none(self):
+        assert Latency().sample(random.Random()) == 0
+
+    def test_seeded_samples_repeat(self):
+        latency = Latency("lognormal:0.05:0.5")
+
+        first = [latency.sample(random.Random(1)) for _ in range(3)]
+
+        assert first == [latency.sample(random.Random(1)) for _ in range(3)]
+        assert all(sample > 0 for sample in first)
+
+    @pytest.mark.parametrize("spec", ["gaussian:1", "fixed", "uniform:1"])
+    def test_invalid_spec(self, spec):
+        with pytest.raises(ValueError):
+            Latency(spec)
+
+
+class TestFaultInjector:
+    def test_no_faults_by_default(self):
+        assert FaultInjector().fault() is None
+
+    def test_error_rate(self):
+        faults = FaultInjector(error_rate=0.5, error_statuses=[503], seed=1)
+
+        statuses = [faults.fault() for _ in range(1000)]
+
+        assert 400 < statuses.count(503) < 600
+        assert set(statuses) == {None, 503}
+
+
+class TestMockPDAServer:
+    def test_serves_real_client(self, server, pda_app):
+        client = ProviderDataApi()
+        client.init_app(pda_app, base_url=server.url, api_key="test-key")
+
+        assert client.get_provider_firm(1).firm_id == 1
+        assert client.get_provider_office("1A001L").firm_office_code == "1A001L"
+
+    def test_honours_if_none_match(self, server):
+        etag = requests.get(f"{server.url}/provider-firms/1").headers["ETag"]
+
+        response = requests.get(f"{server.url}/provider-firms/1", headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+
+    def test_patch(self, server):
+        url = f"{server.url}/provider-firms/1/offices/1A001L"
+
+        response = requests.patch(url, json={"contractManager": "Alice Johnson"})
+
+        assert response.status_code == 200
+        assert response.json()["firmOfficeCode"] == "1A001L"
+
+    def test_unknown_path(self, server):
+        assert requests.get(f"{server.url}/unknown").status_code == 404
+
+    def test_injected_faults(self):
+        faults = FaultInjector(error_rate=1, error_statuses=[503], retry_after=2)
+
+        with MockPDAServer(faults=faults) as server:
+            response = requests.get(f"{server.url}/provider-firms/1")
+
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "2"
+
+    def test_payload_scale(self):
+        with MockPDAServer(payload_scale=3) as server:
+            firms = requests.get(f"{server.url}/provider-firms").json()["firms"]
+            firm = requests.get(f"{server.url}/provider-firms/1").json()["firm"]
+
+        firm_ids = [firm["firmId"] for firm in firms]
+        assert len(firm_ids) == len(set(firm_ids))
+        assert 1 + 2 * SCALED_ID_OFFSET in firm_ids
+        assert len(firms) % 3 == 0
+        assert firm["firmId"] == 1
+
+
+class TestCreateMockApi:
+    @pytest.fixture
+    def fixtures_dir(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("app.pda.mock_api._FIXTURE_CACHE_DIR", str(tmp_path / "cache"))
+        fixtures_dir = str(tmp_path / "fixtures")
+        write_fixtures(generate_fixtures(5), fixtures_dir)
+        return fixtures_dir
+
+    def test_default_fixtures(self):
+        assert create_mock_api().get_provider_firm(1).firm_id == 1
+
+    def test_fixtures_dir(self, fixtures_dir):
+        mock_api = create_mock_api(fixtures_dir=fixtures_dir)
+
+        assert len(mock_api.get_all_provider_firms()) == 5
+
+    def test_database(self, fixtures_dir, tmp_path):
+        mock_api = create_mock_api(fixtures_dir=fixtures_dir, database=str(tmp_path / "mock-pda.sqlite3"))
+
+        assert isinstance(mock_api._store, SQLiteMockStore)
+        assert len(mock_api.get_all_provider_firms()) == 5
+        mock_api._store.close()
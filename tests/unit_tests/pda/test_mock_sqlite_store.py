@@ -0,0 +1,188 @@
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+import pytest
+
+from app.models import Contact
+from app.pda.concurrency import run_concurrently
+from app.pda.mock_api import MockProviderDataApi
+from app.pda.mock_sqlite_store import SQLiteMockStore
+from app.pda.mock_store import MockStore
+
+
+def data():
+    return {
+        "firms": [
+            {"firmId": 1, "parentFirmId": 0},
+            {"firmId": 3, "parentFirmId": 1},
+            {"firmId": 2, "parentFirmId": 1},
+        ],
+        "offices": [
+            {"_firmId": 1, "firmOfficeId": 101, "firmOfficeCode": "1A001L"},
+            {"_firmId": 1, "firmOfficeId": 102, "firmOfficeCode": "1A002L"},
+            {"_firmId": 2, "firmOfficeId": 201, "firmOfficeCode": "2B001L"},
+        ],
+        "schedules": [{"_firmOfficeId": 101, "scheduleLines": [{"categoryOfLaw": "MAT"}]}],
+        "bank_accounts": [
+            {"bankAccountId": 1, "vendorSiteId": 101},
+            {"bankAccountId": 2, "vendorSiteId": 102},
+        ],
+        "contacts": [{"contactId": 1, "vendorSiteId": 101}],
+    }
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "mock-pda.sqlite3")
+
+
+@pytest.fixture
+def store(path):
+    store = SQLiteMockStore(path, data)
+    yield store
+    store.close()
+
+
+class TestSQLiteMockStore:
+    def test_lookups_match_the_in_memory_store(self, store):
+        memory = MockStore(data())
+
+        for lookup, key in [
+            ("firm", 2),
+            ("child_firms", 1),
+            ("office", "2B001L"),
+            ("firm_offices", 1),
+            ("office_schedules", 101),
+            ("bank_account", 2),
+            ("office_bank_accounts", 102),
+            ("contact", 1),
+            ("office_contacts", 101),
+        ]:
+            assert getattr(store, lookup)(key) == getattr(memory, lookup)(key), lookup
+        assert store.firm_office(1, "1A002L") == memory.firm_office(1, "1A002L")
+        assert store.firm_office(2, "1A002L") is None
+        assert store.records("firms") == data()["firms"]
+
+    def test_ids_are_not_equal_to_strings(self, store):
+        assert store.firm("2") is None
+
+    def test_writes_are_shared_and_kept(self, store, path):
+        office = store.office("1A001L")
+        store.update("offices", office, {"firmOfficeCode": "1A009L", "officeName": "Moved"})
+        store.add("contacts", {"contactId": store.next_id("contacts"), "vendorSiteId": 102})
+
+        reopened = SQLiteMockStore(path, lambda: pytest.fail("fixtures loaded again"))
+
+        assert reopened.office("1A001L") is None
+        assert reopened.firm_office(1, "1A009L")["officeName"] == "Moved"
+        assert reopened.office_contacts(102) == [{"contactId": 2, "vendorSiteId": 102}]
+        assert reopened.next_id("contacts") == 3
+        reopened.close()
+
+    def test_replace_keeps_position(self, store):
+        store.replace("bank_accounts", store.bank_account(1), {"bankAccountId": 5, "vendorSiteId": 102})
+
+        assert [account["bankAccountId"] for account in store.records("bank_accounts")] == [5, 2]
+        assert store.bank_account(1) is None
+        assert [account["bankAccountId"] for account in store.office_bank_accounts(102)] == [5, 2]
+
+    def test_only_records_read_from_the_store_can_be_written(self, store):
+        with pytest.raises(TypeError):
+            store.update("firms", {"firmId": 1}, {"firmName": "Unknown"})
+
+    def test_transaction_rolls_back(self, store):
+        with pytest.raises(RuntimeError):
+            with store.transaction():
+                store.update("firms", store.firm(1), {"firmName": "Renamed"})
+                raise RuntimeError
+
+        assert "firmName" not in store.firm(1)
+
+    def test_next_id_is_unique_across_connections(self, store, path):
+        other = SQLiteMockStore(path, data)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            ids = list(executor.map(lambda n: (store if n % 2 else other).next_id("firms"), range(200)))
+
+        assert sorted(ids) == list(range(4, 204))
+        other.close()
+
+    def test_connections_of_finished_threads_are_closed(self, store):
+        connections = []
+        for _ in range(5):
+            run_concurrently({n: partial(store.office, "1A001L") for n in range(10)})
+            connections.append(len(store._connections))
+
+        # Only the connection of the thread which opened the store is left
+        assert connections == [1] * 5
+
+    def test_snapshot_and_restore(self, store):
+        snapshot = store.snapshot()
+        store.update("offices", store.office("1A001L"), {"contractManager": "Alice Johnson"})
+        firm_id = store.next_id("firms")
+        store.add("firms", {"firmId": firm_id, "parentFirmId": 0})
+
+        store.restore(snapshot)
+
+        assert store.data == snapshot
+        # IDs allocated since the snapshot are not allocated again
+        assert store.next_id("firms") == firm_id + 1
+
+    def test_office_codes(self, store):
+        assert "1A001L" in store.office_codes
+        assert "9Z999Z" not in store.office_codes
+
+    def test_indexed(self, store, path):
+        connection = sqlite3.connect(path)
+        plan = connection.execute(
+            'EXPLAIN QUERY PLAN SELECT body FROM offices WHERE "_firmId" = ? AND "firmOfficeCode" = ?', (1, "1A001L")
+        ).fetchall()
+        connection.close()
+
+        assert "USING INDEX" in str(plan)
+
+
+class TestMockProviderDataApiWithSQLite:
+    @pytest.fixture
+    def mock_apis(self, app, path):
+        app.config["PDA_MOCK_DATABASE"] = path
+        mock_apis = [MockProviderDataApi(), MockProviderDataApi()]
+        for mock_api in mock_apis:
+            mock_api.init_app(app)
+        yield mock_apis
+        for mock_api in mock_apis:
+            mock_api._store.close()
+
+    def test_loaded_from_fixtures(self, mock_apis):
+        assert mock_apis[0].get_provider_firm(1).firm_id == 1
+
+    def test_writes_are_seen_by_every_worker(self, mock_apis):
+        first, second = mock_apis
+
+        first.patch_office(1, "1A001L", {"contractManager": "Alice Johnson"})
+        contact = first.create_office_contact(
+            1, "1A001L", Contact(first_name="Jane", last_name="Doe", email_address="jane.doe@example.com")
+        )
+
+        assert second.get_provider_office("1A001L").contract_manager == "Alice Johnson"
+        assert contact.contact_id in [c.contact_id for c in second.get_office_contacts(1, "1A001L")]
+
+    def test_restore_is_seen_by_every_worker(self, mock_apis):
+        first, second = mock_apis
+        snapshot = first.snapshot()
+        first.patch_office(1, "1A001L", {"contractManager": "Alice Johnson"})
+
+        first.restore(snapshot)
+
+        assert second.get_provider_office("1A001L").contract_manager != "Alice Johnson"
+
+    def test_new_bank_account_replaces_the_primary(self, mock_apis):
+        first, second = mock_apis
+        account = first.get_office_bank_accounts(1, "1A001L")[0]
+
+        first.assign_bank_account_to_office(1, "1A002L", account.bank_account_id)
+
+        primary_flags = [a.primary_flag for a in second.get_office_bank_accounts(1, "1A002L")]
+        assert primary_flags[-1] == "Y"
+        assert set(primary_flags[:-1]) <= {"N"}
@@ -0,0 +1,180 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.pda.mock_store import MockLookups, MockStore, ReadWriteLock
+
+
+@pytest.fixture
+def store():
+    return MockStore(
+        {
+            "firms": [
+                {"firmId": 1, "parentFirmId": 0},
+                {"firmId": 3, "parentFirmId": 1},
+                {"firmId": 2, "parentFirmId": 1},
+            ],
+            "offices": [
+                {"_firmId": 1, "firmOfficeId": 101, "firmOfficeCode": "1A001L"},
+                {"_firmId": 1, "firmOfficeId": 102, "firmOfficeCode": "1A002L"},
+                {"_firmId": 2, "firmOfficeId": 201, "firmOfficeCode": "2B001L"},
+            ],
+            "bank_accounts": [
+                {"bankAccountId": 1, "vendorSiteId": 101},
+                {"bankAccountId": 2, "vendorSiteId": 102},
+            ],
+            "contacts": [{"contactId": 1, "vendorSiteId": 101}],
+        }
+    )
+
+
+class TestMockStore:
+    def test_lookups_must_be_implemented(self):
+        with pytest.raises(TypeError):
+            MockLookups()
+
+    def test_lookups(self, store):
+        assert store.firm(2) == {"firmId": 2, "parentFirmId": 1}
+        assert store.office("2B001L")["firmOfficeId"] == 201
+        assert store.firm_office(1, "1A002L")["firmOfficeId"] == 102
+        assert store.firm_office(2, "1A002L") is None
+        assert [office["firmOfficeCode"] for office in store.firm_offices(1)] == ["1A001L", "1A002L"]
+        assert store.office_bank_accounts(102) == [{"bankAccountId": 2, "vendorSiteId": 102}]
+        assert store.contact(1)["vendorSiteId"] == 101
+
+    def test_missing_lists(self):
+        store = MockStore({"firms": []})
+
+        assert store.office_contacts(101) == []
+        assert store.office_schedules(101) == []
+
+    def test_child_firms_in_id_order(self, store):
+        assert [firm["firmId"] for firm in store.child_firms(1)] == [2, 3]
+
+    def test_first_record_with_a_key_wins(self):
+        store = MockStore({"offices": [{"firmOfficeCode": "1A001L", "n": 1}, {"firmOfficeCode": "1A001L", "n": 2}]})
+
+        assert store.office("1A001L")["n"] == 1
+
+    def test_add(self, store):
+        office = store.add("offices", {"_firmId": 2, "firmOfficeId": 202, "firmOfficeCode": "2B002L"})
+
+        assert store.data["offices"][-1] is office
+        assert store.office("2B002L") is office
+        assert store.firm_offices(2)[-1] is office
+
+    def test_update_reindexes_changed_fields(self, store):
+        firm = store.firm(3)
+
+        store.update("firms", firm, {"parentFirmId": 2, "firmName": "Moved"})
+
+        assert [child["firmId"] for child in store.child_firms(1)] == [2]
+        assert store.child_firms(2) == [firm]
+        assert store.firm(3)["firmName"] == "Moved"
+
+    def test_update_office_code(self, store):
+        office = store.office("1A001L")
+
+        store.update("offices", office, {"firmOfficeCode": "1A009L"})
+
+        assert store.office("1A001L") is None
+        assert store.firm_office(1, "1A009L") is office
+        assert store.firm_offices(1)[0] is office
+
+    def test_replace_keeps_position(self, store):
+        account = store.data["bank_accounts"][0]
+
+        store.replace("bank_accounts", account, {"bankAccountId": 5, "vendorSiteId": 102})
+
+        assert store.data["bank_accounts"][0] == {"bankAccountId": 5, "vendorSiteId": 102}
+        assert store.bank_account(1) is None
+        assert store.bank_account(5) is account
+        assert store.office_bank_accounts(101) == []
+        assert [account["bankAccountId"] for account in store.office_bank_accounts(102)] == [2, 5]
+
+    def test_next_id(self, store):
+        assert store.next_id("firms") == 4
+        assert store.next_id("firms") == 5
+        assert store.next_id("contacts") == 2
+
+    def test_next_id_after_adding_with_an_id(self, store):
+        store.add("offices", {"_firmId": 2, "firmOfficeId": 900, "firmOfficeCode": "2B009L"})
+
+        assert store.next_id("offices") == 901
+
+    def test_next_id_is_unique_across_threads(self, store):
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            ids = list(executor.map(lambda _: store.next_id("contacts"), range(1000)))
+
+        assert sorted(ids) == list(range(2, 1002))
+
+    def test_office_codes(self, store):
+        store.update("offices", store.office("1A001L"), {"firmOfficeCode": "1A009L"})
+
+        assert "1A009L" in store.office_codes
+        assert "1A001L" not in store.office_codes
+
+
+class TestReadWriteLock:
+    def test_readers_share_the_lock(self):
+        lock = ReadWriteLock()
+        both_reading = threading.Barrier(2, timeout=5)
+
+        def read():
+            with lock.read():
+                both_reading.wait()
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            list(executor.map(lambda _: read(), range(2)))
+
+    def test_writer_excludes_readers(self):
+        lock = ReadWriteLock()
+        events = []
+
+        def write():
+            with lock.write():
+                events.append("write start")
+                time.sleep(0.05)
+                events.append("write end")
+
+        def read():
+            with lock.read():
+                events.append("read")
+
+        with lock.read():
+            writer = threading.Thread(target=write)
+            writer.start()
+            time.sleep(0.02)
+            # A waiting writer goes before new readers
+            reader = threading.Thread(target=read)
+            reader.start()
+            time.sleep(0.02)
+            assert events == []
+        writer.join(5)
+        reader.join(5)
+
+        assert events == ["write start", "write end", "read"]
+
+    def test_reentrant(self):
+        lock = ReadWriteLock()
+
+        with lock.write():
+            with lock.read():
+                with lock.write():
+                    pass
+        with lock.read():
+            with lock.read():
+                pass
+
+        with lock.write():
+            pass
+
+    def test_cannot_upgrade(self):
+        lock = ReadWriteLock()
+
+        with lock.read():
+            with pytest.raises(RuntimeError, match="Cannot take the write lock"):
+                with lock.write():
+                    pass
@@ -0,0 +1,107 @@
+from unittest.mock import Mock
+
+import pytest
+
+from app.main.forms import ProviderListForm
+from app.main.modify_provider.forms import AssignChambersForm
+from app.pda.pagination import decode_cursor, encode_cursor, page_bounds, page_cursor
+
+
+class TestCursors:
+    def test_round_trip(self):
+        assert decode_cursor(encode_cursor(40)) == 40
+
+    def test_no_cursor_is_the_first_page(self):
+        assert decode_cursor(None) == 0
+
+    @pytest.mark.parametrize("cursor", ["not-a-cursor", "%%", encode_cursor(-1)])
+    def test_invalid_cursor(self, cursor):
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            decode_cursor(cursor)
+
+    def test_page_cursor(self):
+        assert page_cursor(1, 20) is None
+        assert decode_cursor(page_cursor(3, 20)) == 40
+
+    def test_page_bounds(self):
+        assert page_bounds(encode_cursor(20), 10) == (20, 30)
+
+        with pytest.raises(ValueError, match="limit must be a positive integer"):
+            page_bounds(None, 0)
+
+
+class TestClientPagination:
+    def test_search_provider_firms(self, api_client):
+        first = api_client.search_provider_firms("", firm_type="Chambers", limit=2)
+        second = api_client.search_provider_firms("", firm_type="Chambers", cursor=first.next_cursor, limit=2)
+
+        assert [firm.firm_id for firm in first.items + second.items] == [2, 5, 8]
+        assert first.total == 3
+        assert second.next_cursor is None
+
+    def test_search_sends_the_search_to_the_pda(self, api_client, adapter):
+        adapter.send = Mock(wraps=adapter.send)
+
+        api_client.search_provider_firms("smith", limit=5)
+
+        url = adapter.send.call_args.args[0].url
+        assert "search=smith" in url
+        assert "limit=5" in url
+
+    def test_get_provider_offices_page(self, api_client):
+        page = api_client.get_provider_offices_page(1, limit=1)
+
+        assert len(page.items) == 1
+        assert page.total == 2
+        assert page.next_cursor is not None
+
+    def test_search_bank_accounts(self, api_client):
+        page = api_client.search_bank_accounts("203045", firm_id=1)
+
+        assert [account.bank_account_id for account in page.items] == [1]
+        assert page.total == 1
+
+    def test_search_all_bank_accounts_is_not_supported(self, api_client):
+        with pytest.raises(NotImplementedError):
+            api_client.search_bank_accounts("203045")
+
+    def test_invalid_limit(self, api_client):
+        with pytest.raises(ValueError, match="limit must be a positive integer"):
+            api_client.search_provider_firms("", limit=0)
+
+
+class TestServerSideSearchForms:
+    """The forms list the same results whether the app or the PDA searches and pages them."""
+
+    def search_both_ways(self, app, make_form, results):
+        pda = app.extensions["pda"]
+        by_setting = {}
+        for server_side_search in (False, True):
+            pda.server_side_search = server_side_search
+            with app.test_request_context():
+                by_setting[server_side_search] = results(make_form(pda))
+        return by_setting
+
+    @pytest.mark.parametrize("search", ["", "legal", "does not exist"])
+    def test_provider_list(self, app, search):
+        by_setting = self.search_both_ways(
+            app,
+            lambda pda: ProviderListForm(search=search),
+            # Forms with no results have no table
+            lambda form: (form.num_results, [row["firm_id"] for row in form.table.data] if form.num_results else []),
+        )
+
+        assert by_setting[False] == by_setting[True]
+
+    @pytest.mark.parametrize("search", ["", "legal"])
+    def test_assign_chambers(self, app, search):
+        by_setting = self.search_both_ways(
+            app,
+            lambda pda: AssignChambersForm(pda.get_provider_firm(4), search_term=search),
+            lambda form: (form.num_results, form.provider.choices),
+        )
+
+        assert by_setting[False] == by_setting[True]
+
+    def test_in_app_search_by_default(self, app):
+        assert app.extensions["pda"].server_side_search is False
@@ -0,0 +1,135 @@
+from unittest.mock import Mock, patch
+
+import pytest
+from urllib3 import HTTPResponse
+from urllib3.exceptions import MaxRetryError
+from urllib3.util.retry import RequestHistory
+
+from app.pda.api import ProviderDataApi
+from app.pda.retry import AdaptiveRetry, RetryBudget
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def response(status: int = 503, retry_after: str | None = None) -> HTTPResponse:
+    return HTTPResponse(status=status, headers={"Retry-After": retry_after} if retry_after else {})
+
+
+class TestRetryBudget:
+    def test_retries_limited_to_share_of_requests(self):
+        budget = RetryBudget(ratio=0.1, min_retries=1, clock=FakeClock())
+        for _ in range(20):
+            budget.record_request()
+
+        assert [budget.try_acquire() for _ in range(3)] == [True, True, False]
+
+    def test_minimum_retries_while_traffic_is_low(self):
+        budget = RetryBudget(ratio=0.1, min_retries=3, clock=FakeClock())
+        budget.record_request()
+
+        assert [budget.try_acquire() for _ in range(4)] == [True, True, True, False]
+
+    def test_window_slides(self):
+        clock = FakeClock()
+        budget = RetryBudget(ratio=0.1, window_seconds=10, min_retries=1, clock=clock)
+        budget.try_acquire()
+        assert budget.try_acquire() is False
+
+        clock.now = 11
+
+        assert budget.try_acquire() is True
+
+
+class TestAdaptiveRetry:
+    def test_backoff_has_full_jitter(self):
+        retry = AdaptiveRetry(total=5, backoff_factor=0.5, history=(RequestHistory("GET", "/", None, 503, None),) * 3)
+
+        with patch("app.pda.retry.random.uniform", side_effect=lambda low, high: (low, high)):
+            assert retry.get_backoff_time() == (0, 2.0)
+
+    def test_first_retry_is_jittered(self):
+        retry = AdaptiveRetry(total=5, backoff_factor=0.5, history=(RequestHistory("GET", "/", None, 503, None),))
+
+        with patch("app.pda.retry.random.uniform", side_effect=lambda low, high: (low, high)):
+            assert retry.get_backoff_time() == (0, 0.5)
+
+    def test_no_backoff_before_first_error(self):
+        assert AdaptiveRetry(total=5, backoff_factor=0.5).get_backoff_time() == 0
+
+    def test_settings_are_kept_between_retries(self):
+        budget = RetryBudget()
+        retry = AdaptiveRetry(total=3, status_forcelist=[503], budget=budget, max_retry_seconds=10)
+
+        new_retry = retry.increment("GET", "/provider-firms", response=response())
+
+        assert new_retry.budget is budget
+        assert new_retry.max_retry_seconds == 10
+        assert new_retry.retries_started is not None
+        assert new_retry.total == 2
+
+    def test_honours_retry_after_within_time_limit(self):
+        retry = AdaptiveRetry(total=3, status_forcelist=[503], max_retry_seconds=10)
+
+        new_retry = retry.increment("GET", "/provider-firms", response=response(retry_after="2"))
+
+        assert new_retry.get_retry_after(response(retry_after="2")) == 2
+
+    def test_gives_up_when_retry_after_exceeds_time_limit(self):
+        on_refused = Mock()
+        retry = AdaptiveRetry(total=3, status_forcelist=[503], max_retry_seconds=10, on_refused=on_refused)
+
+        with pytest.raises(MaxRetryError):
+            retry.increment("GET", "/provider-firms", response=response(retry_after="30"))
+
+        on_refused.assert_called_once_with("time_limit")
+
+    def test_gives_up_after_time_limit(self):
+        retry = AdaptiveRetry(total=3, status_forcelist=[503], max_retry_seconds=10, retries_started=0)
+
+        with patch("app.pda.retry.time.monotonic", return_value=11), pytest.raises(MaxRetryError):
+            retry.increment("GET", "/provider-firms", response=response())
+
+    def test_gives_up_when_budget_is_used_up(self):
+        on_refused = Mock()
+        budget = RetryBudget(min_retries=0)
+        retry = AdaptiveRetry(total=3, status_forcelist=[503], budget=budget, on_refused=on_refused)
+
+        with pytest.raises(MaxRetryError):
+            retry.increment("GET", "/provider-firms", response=response())
+
+        on_refused.assert_called_once_with("budget")
+
+
+class TestClientRetries:
+    @pytest.fixture
+    def pda_config(self):
+        return {"PDA_RETRY_TOTAL": 2, "PDA_RETRY_MAX_SECONDS": 5, "PDA_RETRY_BUDGET_RATIO": 0.2}
+
+    def test_configured_from_app(self, api_client):
+        assert isinstance(api_client.retry, AdaptiveRetry)
+        assert api_client.retry.total == 2
+        assert api_client.retry.max_retry_seconds == 5
+        assert api_client.retry.budget.ratio == 0.2
+        assert api_client.session.get_adapter("https://pda.test").max_retries is api_client.retry
+
+    def test_retry_count(self):
+        history = (RequestHistory("GET", "/", None, 503, None),) * 2
+        response = Mock(raw=Mock(retries=AdaptiveRetry(total=3, history=history)))
+
+        assert ProviderDataApi._retry_count(response) == 2
+
+    def test_retries_are_recorded(self, api_client):
+        history = (RequestHistory("GET", "/", None, 503, None),)
+        api_client.session.request = Mock(
+            return_value=Mock(status_code=200, content=b"{}", headers={}, raw=Mock(retries=Mock(history=history)))
+        )
+
+        api_client.get("/provider-firms")
+
+        assert 'pda_retries_total{method="GET",endpoint="/provider-firms"} 1' in api_client.metrics.render()
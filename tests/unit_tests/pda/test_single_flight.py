@@ -0,0 +1,159 @@
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import requests
+
+from app.pda.api import PDADeadlineExceededError
+from app.pda.deadline import RequestDeadline
+from app.pda.single_flight import SingleFlight
+
+
+def wait_for(condition, timeout=5):
+    end = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > end:
+            raise TimeoutError("Condition not met")
+        time.sleep(0.001)
+
+
+def run_in_threads(count, target):
+    results = [None] * count
+
+    def run(index):
+        try:
+            results[index] = target()
+        except Exception as e:
+            results[index] = e
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads, results
+
+
+class TestSingleFlight:
+    def test_concurrent_calls_are_coalesced(self):
+        single_flight = SingleFlight()
+        release = threading.Event()
+        fn = Mock(side_effect=lambda: release.wait(5) and "result")
+
+        threads, results = run_in_threads(5, lambda: single_flight.do("key", fn))
+        wait_for(lambda: single_flight.coalesced == 4)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert results == ["result"] * 5
+        assert fn.call_count == 1
+
+    def test_exception_is_raised_for_every_caller(self):
+        single_flight = SingleFlight()
+        release = threading.Event()
+
+        def fn():
+            release.wait(5)
+            raise ValueError("PDA error")
+
+        threads, results = run_in_threads(3, lambda: single_flight.do("key", fn))
+        wait_for(lambda: single_flight.coalesced == 2)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert all(isinstance(result, ValueError) for result in results)
+
+    def test_unshared_exception_is_only_raised_for_its_caller(self):
+        single_flight = SingleFlight()
+        release = threading.Event()
+        calls = []
+
+        def fn():
+            calls.append(threading.current_thread().name)
+            if len(calls) == 1:
+                release.wait(5)
+                raise TimeoutError("Out of time")
+            return "result"
+
+        threads, results = run_in_threads(3, lambda: single_flight.do("key", fn, unshared_errors=(TimeoutError,)))
+        wait_for(lambda: single_flight.coalesced == 2)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert sum(isinstance(result, TimeoutError) for result in results) == 1
+        assert results.count("result") == 2
+        assert len(calls) >= 2
+
+    def test_sequential_calls_are_not_coalesced(self):
+        single_flight = SingleFlight()
+        fn = Mock(return_value="result")
+
+        single_flight.do("key", fn)
+        single_flight.do("key", fn)
+
+        assert fn.call_count == 2
+        assert single_flight.coalesced == 0
+
+    def test_different_keys_are_not_coalesced(self):
+        single_flight = SingleFlight()
+        barrier = threading.Barrier(2, timeout=5)
+
+        def fn():
+            barrier.wait()
+            return "result"
+
+        threads, results = run_in_threads(2, lambda: single_flight.do(threading.current_thread().name, fn))
+        for thread in threads:
+            thread.join()
+
+        assert results == ["result", "result"]
+
+
+class TestProviderDataApiSingleFlight:
+    def test_identical_gets_share_a_request(self, api_client):
+        release = threading.Event()
+        response = Mock(status_code=200)
+        api_client.session.request = Mock(side_effect=lambda *args, **kwargs: release.wait(5) and response)
+
+        threads, results = run_in_threads(3, lambda: api_client.get("/provider-firms", params={"page": 1}))
+        wait_for(lambda: api_client.single_flight.coalesced == 2)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert results == [response] * 3
+        assert api_client.session.request.call_count == 1
+
+    def test_gets_with_different_params_are_not_shared(self, api_client):
+        api_client.session.request = Mock(return_value=Mock(status_code=200))
+
+        api_client.get("/provider-firms", params={"page": 1})
+        api_client.get("/provider-firms", params={"page": 2})
+
+        assert api_client.session.request.call_count == 2
+
+    def test_deadline_of_the_leading_get_is_not_shared(self, api_client):
+        clock = Mock(return_value=0)
+        release = threading.Event()
+        response = Mock(status_code=200)
+
+        def request(*args, **kwargs):
+            if api_client.session.request.call_count == 1:
+                release.wait(5)
+                clock.return_value = 10
+                raise requests.Timeout("Read timed out")
+            return response
+
+        api_client.session.request = Mock(side_effect=request)
+        # Only the thread leading the first request has a budget, which its request runs out of
+        deadlines = iter([RequestDeadline(10, clock=clock)])
+        with patch("app.pda.deadline.get_deadline", side_effect=lambda: next(deadlines, None)):
+            threads, results = run_in_threads(3, lambda: api_client.get("/provider-firms"))
+            wait_for(lambda: api_client.single_flight.coalesced == 2)
+            release.set()
+            for thread in threads:
+                thread.join()
+
+        assert sum(isinstance(result, PDADeadlineExceededError) for result in results) == 1
+        assert results.count(response) == 2
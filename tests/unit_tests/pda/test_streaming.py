@@ -0,0 +1,73 @@
+import json
+from unittest.mock import MagicMock, Mock
+
+import pytest
+
+from app.pda.api import PDAError
+from app.pda.streaming import iter_json_array
+
+
+def in_chunks(document: str, size: int):
+    body = document.encode()
+    return [body[i : i + size] for i in range(0, len(body), size)]
+
+
+class TestIterJsonArray:
+    document = json.dumps(
+        {"count": 3, "meta": {"firms": ["nested"]}, "firms": [{"firmId": 1}, {"firmId": 22, "firmName": "Café"}, 333]}
+    )
+
+    @pytest.mark.parametrize("chunk_size", [1, 2, 7, 1024])
+    def test_items_across_chunk_boundaries(self, chunk_size):
+        items = list(iter_json_array(in_chunks(self.document, chunk_size), "firms"))
+
+        assert items == [{"firmId": 1}, {"firmId": 22, "firmName": "Café"}, 333]
+
+    def test_is_lazy(self):
+        items = iter_json_array(in_chunks(self.document, 1), "firms")
+
+        assert next(items) == {"firmId": 1}
+
+    def test_empty_array(self):
+        assert list(iter_json_array([b'{"firms": [ ]}'], "firms")) == []
+
+    def test_missing_key(self):
+        assert list(iter_json_array([b'{"offices": [1, 2]}'], "firms")) == []
+
+    @pytest.mark.parametrize("document", ['{"firms": [{"firmId": 1}', '["firms"]', '{"firms": [1 2]}'])
+    def test_invalid_json(self, document):
+        with pytest.raises(ValueError):
+            list(iter_json_array(in_chunks(document, 3), "firms"))
+
+
+class TestIterProviderFirms:
+    @pytest.fixture
+    def pda_config(self):
+        return {"PDA_STREAM_PROVIDER_FIRMS": True}
+
+    def test_streams_all_firms(self, api_client, mock_api):
+        assert list(api_client.iter_provider_firms()) == mock_api.get_all_provider_firms()
+
+    def test_not_modified_uses_cached_firms(self, api_client):
+        api_client.stream_provider_firms = False
+        firms = api_client.get_all_provider_firms()
+        api_client.stream_provider_firms = True
+
+        assert list(api_client.iter_provider_firms()) == firms
+
+    def test_without_streaming_uses_get_all_provider_firms(self, api_client):
+        api_client.stream_provider_firms = False
+        api_client.get_all_provider_firms = Mock(return_value=["firm"])
+
+        assert list(api_client.iter_provider_firms()) == ["firm"]
+
+    def test_invalid_json(self, api_client):
+        response = MagicMock(status_code=200, iter_content=lambda chunk_size: [b"{"])
+        response.__enter__.return_value = response
+        api_client.session.request = Mock(return_value=response)
+
+        with pytest.raises(PDAError, match="Invalid JSON response"):
+            list(api_client.iter_provider_firms())
+
+    def test_mock_api(self, mock_api):
+        assert list(mock_api.iter_provider_firms()) == mock_api.get_all_provider_firms()
@@ -1,3 +1,4 @@
+import threading
 from datetime import date
 from unittest.mock import MagicMock, Mock, patch
 
@@ -6,7 +7,7 @@ from flask import Blueprint
 from flask_wtf import FlaskForm
 from wtforms import StringField
 
-from app.main.utils import change_liaison_manager, reassign_head_office
+from app.main.utils import change_liaison_manager, paginate, reassign_head_office
 from app.models import Contact
 from app.pda.mock_api import MockPDAError, MockProviderDataApi
 from app.utils import register_form_view
@@ -334,6 +335,42 @@ class TestChangeLiaisonManager:
             expected_date = date.today().isoformat()
             assert result.creation_date == expected_date
 
+    def test_offices_are_changed_concurrently(self, app):
+        """Test that each office's contacts are read and created concurrently."""
+        with app.test_request_context():
+            mock_api = app.extensions["pda"]
+            mock_api._mock_data = {
+                "firms": [{"firmId": 1, "firmName": "Test Firm"}],
+                "offices": [
+                    {"_firmId": 1, "firmOfficeCode": "1A001L", "firmOfficeId": 101, "headOffice": "N/A"},
+                    {"_firmId": 1, "firmOfficeCode": "1A002L", "firmOfficeId": 102, "headOffice": "101"},
+                ],
+                "contacts": [],
+            }
+
+            # Each office's call waits for the other, so this would time out if they ran one after another
+            barrier = threading.Barrier(2, timeout=5)
+            original_get_contacts = mock_api.get_office_contacts
+            original_create = mock_api.create_office_contact
+
+            def get_office_contacts(firm_id, office_code):
+                barrier.wait()
+                return original_get_contacts(firm_id, office_code)
+
+            def create_office_contact(firm_id, office_code, contact):
+                barrier.wait()
+                return original_create(firm_id, office_code, contact)
+
+            mock_api.get_office_contacts = MagicMock(side_effect=get_office_contacts)
+            mock_api.create_office_contact = MagicMock(side_effect=create_office_contact)
+
+            new_contact = Contact(first_name="Jane", last_name="Doe", email_address="jane.doe@example.com")
+            result = change_liaison_manager(new_contact, 1)
+
+            assert result.vendor_site_id == 101
+            contact_ids = [contact["contactId"] for contact in mock_api._mock_data["contacts"]]
+            assert sorted(contact_ids) == [1, 2]
+
     @patch("app.main.utils.logger")
     def test_update_contact_error_handling(self, mock_logger, app):
         """Test error handling when updating existing liaison manager fails."""
@@ -376,6 +413,32 @@ class TestChangeLiaisonManager:
                 mock_logger.error.assert_called_once_with("Failed to update Liaison manager for office 1A001L")
                 mock_flash.assert_any_call("Failed to update Liaison manager for office 1A001L", "error")
 
+    def test_every_liaison_manager_without_an_id_is_demoted(self, app):
+        with app.test_request_context():
+            mock_api = app.extensions["pda"]
+            liaison_manager = {
+                "vendorSiteId": 101,
+                "lastName": "Smith",
+                "emailAddress": "smith@example.com",
+                "jobTitle": "Liaison manager",
+                "primary": "Y",
+            }
+            mock_api._mock_data = {
+                "firms": [{"firmId": 1, "firmName": "Test Firm"}],
+                "offices": [{"_firmId": 1, "firmOfficeCode": "1A001L", "firmOfficeId": 101, "headOffice": "N/A"}],
+                "contacts": [
+                    {**liaison_manager, "firstName": "John"},
+                    {**liaison_manager, "firstName": "Joan"},
+                ],
+            }
+            mock_api.update_contact = MagicMock(side_effect=lambda firm_id, office_code, contact: contact)
+
+            change_liaison_manager(Contact(first_name="Jane", last_name="Doe", email_address="jane@example.com"), 1)
+
+            demoted = [c.args[2] for c in mock_api.update_contact.call_args_list]
+            assert sorted(contact.first_name for contact in demoted) == ["Joan", "John"]
+            assert {contact.primary for contact in demoted} == {"N"}
+
     @patch("app.main.utils.logger")
     def test_create_contact_error_handling(self, mock_logger, app):
         """Test error handling when creating new liaison manager fails."""
@@ -508,7 +571,56 @@ class TestReassignHeadOffice:
             old_head_office = mock_api.get_provider_office("HEAD01")
             assert old_head_office.head_office == "BRANCH01"
 
+    def test_head_office_is_not_read_again(self, app):
+        with app.test_request_context():
+            mock_api = app.extensions["pda"]
+            mock_api.get_provider_offices = Mock(wraps=mock_api.get_provider_offices)
+
+            new_head = reassign_head_office(firm=1, new_head_office="BRANCH01")
+
+            assert new_head.firm_office_code == "BRANCH01"
+            assert mock_api.get_head_office(1) is new_head
+            assert mock_api.get_provider_offices.call_count == 1
+
     def test_existing_head_office(self, app):
         with app.test_request_context():
             with pytest.raises(ValueError, match="HEAD01 is already the head office"):
                 reassign_head_office(firm=1, new_head_office="HEAD01")
+
+    def test_failed_offices_are_reported(self, app):
+        with app.test_request_context():
+            mock_api = app.extensions["pda"]
+            patch_offices = mock_api.patch_offices
+            error = MockPDAError("Update failed")
+
+            def failing_patch_offices(firm_id, fields_by_office):
+                fields_by_office = {code: fields for code, fields in fields_by_office.items() if code != "BRANCH02"}
+                return {**patch_offices(firm_id, fields_by_office), "BRANCH02": error}
+
+            with (
+                patch.object(mock_api, "patch_offices", side_effect=failing_patch_offices),
+                patch("app.main.utils.flash") as mock_flash,
+            ):
+                new_head = reassign_head_office(firm=1, new_head_office="BRANCH01")
+
+            assert new_head.firm_office_code == "BRANCH01"
+            assert mock_api.get_provider_office("HEAD01").head_office == "BRANCH01"
+            assert mock_api.get_provider_office("BRANCH02").head_office == "HEAD01"
+            mock_flash.assert_called_once_with("Failed to update office BRANCH02", category="error")
+
+
+class TestPaginate:
+    def test_first_page(self):
+        assert paginate(iter(range(25)), page=1, per_page=10) == (list(range(10)), 25)
+
+    def test_last_partial_page(self):
+        assert paginate(iter(range(25)), page=3, per_page=10) == ([20, 21, 22, 23, 24], 25)
+
+    def test_page_past_the_end(self):
+        assert paginate(iter(range(5)), page=2, per_page=10) == ([], 5)
+
+    def test_sequence_is_sliced(self):
+        assert paginate(range(25), page=3, per_page=10) == ([20, 21, 22, 23, 24], 25)
+
+    def test_sequence_page_before_the_start(self):
+        assert paginate(range(25), page=0, per_page=10) == ([], 25)
@@ -134,3 +134,11 @@ class TestSearchBankAccountForm:
             assert len(form.bank_accounts_table.data) == BankAccountSearchForm.ITEMS_PER_PAGE
         else:
             assert len(form.bank_accounts_table.data) == len(self.all_bank_accounts)
+
+
+class TestSearchBankAccountFormServerSideSearch(TestSearchBankAccountForm):
+    """The same searches, with the bank accounts searched and paged by the PDA."""
+
+    @pytest.fixture(autouse=True)
+    def server_side_search(self, app):
+        app.extensions["pda"].server_side_search = True
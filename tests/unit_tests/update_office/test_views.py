@@ -1,11 +1,32 @@
 import datetime
+from unittest.mock import Mock, patch
 
 from flask import url_for
 
 from app.constants import DEFAULT_CONTRACT_MANAGER_NAME, STATUS_CONTRACT_MANAGER_INACTIVE
 from app.main.update_office.forms import BankAccountSearchForm
-from app.main.update_office.views import SearchBankAccountFormView
+from app.main.update_office.views import SearchBankAccountFormView, patch_selected_offices
 from app.models import Firm, Office
+from app.pda.errors import ProviderDataApiError
+
+
+class TestPatchSelectedOffices:
+    def test_only_updated_offices_are_returned(self, app):
+        pda = Mock()
+        pda.patch_offices.return_value = {
+            "1A001L": Office(firmOfficeCode="1A001L"),
+            "1A002L": None,
+            "1A003L": ProviderDataApiError("HTTP error"),
+        }
+
+        with app.test_request_context(), patch("app.main.update_office.views.flash") as mock_flash:
+            updated = patch_selected_offices(pda, Firm(firmId=1), ["1A001L", "1A002L", "1A003L"], {})
+
+        assert updated == ["1A001L"]
+        assert [c.args for c in mock_flash.call_args_list] == [
+            ("<b>Failed to update office 1A002L</b>", "error"),
+            ("<b>Failed to update office 1A003L</b>", "error"),
+        ]
 
 
 class TestUpdateVATRegistrationNumberFormView:
@@ -13,3 +13,11 @@ def get_firm_by_name(app, firm_name: str) -> Firm | None:
 def get_firm_office_by_office_code(app, office_code: str) -> Office:
     pda = app.extensions["pda"]
     return pda.get_provider_office(office_code)
+
+
+def assert_max_pda_calls(pda_calls: list, max_calls: int) -> None:
+    """Assert the last request made at most `max_calls` PDA calls, listing the calls it made if it made more."""
+    assert pda_calls, "No requests have been made"
+    calls = pda_calls[-1]
+    listing = "\n".join(f"  {call.target} from {call.call_site}" for call in calls)
+    assert len(calls) <= max_calls, f"{len(calls)} PDA calls made, expected at most {max_calls}:\n{listing}"